@@ -1,114 +1,369 @@
 import asyncio
+import heapq
 import signal
-import pandas as pd
-from trading_system.core.config import Config
-from trading_system.core.telemetry import setup_logging, logger
+import time
+from trading_system.core.config import Config, TradingMode
+from trading_system.core.telemetry import setup_logging, logger, latency
+from trading_system.core.trading_engine import TradingEngine
+from trading_system.core import snapshot
+from trading_system.core.strategy_workers import StrategyWorkerPool, parse_cpus
 from trading_system.market.binance_ws import BinanceWebSocketManager
-from trading_system.market.correlation import CorrelationEngine
-from trading_system.strategies.mean_reversion import MeanReversionStrategy
+from trading_system.market.decoder import Trade
+from trading_system.market.archive import TickRecorder, TickArchive
+from trading_system.market.backfill import RestBackfill, replay
+from trading_system.market.order_book import OrderBookManager
 from trading_system.execution.binance_executor import BinanceExecutor
-from trading_system.risk.risk_manager import RiskManager
-from trading_system.api.server import app, update_dashboard_state
-import uvicorn
+from trading_system.execution.async_executor import AsyncOrderExecutor
+from trading_system.execution.rate_limiter import RequestScheduler
+from trading_system.execution.exchange_sim import SimExchange, LatencyModel
+from trading_system.execution.user_stream import PositionLedger, UserDataStream
+from trading_system.api.state import update_dashboard_state, dashboard_state, register_metrics_provider
 
-class ArbitronixEngine:
+class ArbitronixEngine(TradingEngine):
     def __init__(self):
         setup_logging(Config.LOG_LEVEL)
+        latency.enabled = Config.TELEMETRY_ENABLED
+
+        # With strategy workers the engine process only keeps market state and runs risk/execution
+        self.strategy_pool = None
+        if Config.STRATEGY_WORKERS > 0:
+            self.strategy_pool = StrategyWorkerPool(
+                Config.SYMBOLS,
+                workers=Config.STRATEGY_WORKERS,
+                cpus=parse_cpus(Config.STRATEGY_WORKER_CPUS),
+                ring_size=Config.STRATEGY_RING_SIZE
+            )
+        super().__init__(Config.SYMBOLS, strategies=[] if self.strategy_pool else None)
         self.config = Config
         self.running = False
+        self.dashboard = None  # uvicorn.Server once started
         
-        # Initialize Components
-        self.market_data = {} # Latest data per symbol
-        self.price_history = {s: [] for s in Config.SYMBOLS}
-        
-        self.corr_engine = CorrelationEngine(Config.SYMBOLS)
-        self.risk_manager = RiskManager()
-        self.executor = BinanceExecutor()
-        
-        # Strategies
-        self.strategies = [
-            MeanReversionStrategy()
-        ]
+        # Paper trading runs against a local matching simulator fed by the live trade stream
+        self.exchange_sim = None
+        if Config.TRADING_MODE == TradingMode.PAPER and Config.PAPER_SIMULATOR:
+            self.exchange_sim = SimExchange(
+                initial_balance=Config.PAPER_BALANCE,
+                maker_fee=Config.SIM_MAKER_FEE,
+                taker_fee=Config.SIM_TAKER_FEE,
+                latency=LatencyModel(Config.SIM_NETWORK_MS, Config.SIM_EXCHANGE_MS, Config.SIM_JITTER_MS),
+                book_levels=Config.SIM_DEPTH_LEVELS,
+                spread_bps=Config.SIM_SPREAD_BPS,
+                level_notional=Config.SIM_LEVEL_NOTIONAL
+            )
+            self.exchange_sim.on_fill(self.on_order_complete)
+            self.risk_manager.reset_equity(Config.PAPER_BALANCE)
+        self.executor = BinanceExecutor(simulator=self.exchange_sim)
+        self.order_executor = AsyncOrderExecutor(
+            self.executor,
+            max_in_flight=Config.ORDER_QUEUE_SIZE,
+            workers=Config.ORDER_WORKERS,
+            batch_size=Config.ORDER_BATCH_SIZE
+        )
+        self.order_executor.on_complete(self.on_order_complete)
+
+        # Live accounts push fills, positions and balances over the user-data stream
+        self.user_stream = None
+        self.start_equity = None
+        if Config.TRADING_MODE != TradingMode.PAPER and Config.USER_STREAM_ENABLED and self.executor.client:
+            self.ledger = PositionLedger()
+            rest_url, ws_url = Config.user_stream_urls()
+            self.user_stream = UserDataStream(
+                Config.get_api_key(),
+                self.ledger,
+                rest_url,
+                ws_url,
+                resync=self._account_snapshot,
+                keepalive_interval=Config.USER_STREAM_KEEPALIVE
+            )
+            self.ledger.on_order(self.on_order_complete)
+            self.ledger.on_position(self.risk_manager.set_position)
+            self.ledger.on_balance(self._on_balance)
         
-        self.ws_manager = BinanceWebSocketManager(Config.SYMBOLS, self.handle_market_data)
+        # Local L2 books; strategies can declare needs=("book",), the paper exchange matches against them
+        self.order_books = None
+        channels = ["trade"]
+        if Config.ORDER_BOOK_ENABLED:
+            self.order_books = OrderBookManager(
+                Config.SYMBOLS,
+                capacity=Config.ORDER_BOOK_LEVELS,
+                snapshot_limit=Config.ORDER_BOOK_SNAPSHOT_LIMIT,
+                max_buffer=Config.ORDER_BOOK_BUFFER,
+                rest_url=Config.market_data_rest_url(),
+                scheduler=RequestScheduler(weight_limit=Config.MARKET_DATA_WEIGHT_1M, order_reserve=0.0)
+            )
+            channels.append(Config.ORDER_BOOK_STREAM)
+            self.inputs['book'] = self.order_books.book
+            if self.exchange_sim:
+                self.order_books.on_update(
+                    lambda symbol, book: self.exchange_sim.set_levels(symbol, *book.top(Config.SIM_DEPTH_LEVELS))
+                )
+            register_metrics_provider("order_books", self.order_books.metrics)
+            register_metrics_provider("rest_market_data", self.order_books.scheduler.metrics)
 
-    async def handle_market_data(self, data: dict):
+        self.ws_manager = BinanceWebSocketManager(
+            Config.SYMBOLS,
+            self.handle_market_data,
+            consumers=Config.WS_CONSUMERS,
+            queue_size=Config.WS_QUEUE_SIZE,
+            conflate=Config.WS_CONFLATE,
+            max_streams_per_connection=Config.WS_MAX_STREAMS_PER_CONNECTION,
+            redundant=Config.WS_REDUNDANT,
+            base_url=Config.WS_BASE_URL or None,
+            json_backend=Config.JSON_BACKEND,
+            channels=channels,
+            on_depth=self.order_books.on_depth if self.order_books else None
+        )
+
+        register_metrics_provider("market_data", self.ws_manager.metrics)
+        register_metrics_provider("orders", self.order_executor.metrics)
+        register_metrics_provider("order_netting", self.order_manager.metrics)
+        register_metrics_provider("rest", self.executor.scheduler.metrics)
+        if self.user_stream:
+            register_metrics_provider("user_stream", self.user_stream.metrics)
+        register_metrics_provider("risk", self.risk_manager.metrics)
+        if self.strategy_pool:
+            register_metrics_provider("strategy_workers", self.strategy_pool.metrics)
+        if self.exchange_sim:
+            register_metrics_provider("paper_exchange", self.exchange_sim.metrics)
+
+        # Persist every trade and closed bar for backtests and research
+        self.recorder = None
+        if Config.ARCHIVE_ENABLED:
+            self.recorder = TickRecorder(
+                Config.ARCHIVE_DIR,
+                flush_rows=Config.ARCHIVE_FLUSH_ROWS,
+                flush_seconds=Config.ARCHIVE_FLUSH_SECONDS
+            )
+            for interval in self.bars.intervals:
+                self.bars.subscribe(interval, self.recorder.record_bar)
+            register_metrics_provider("archive", self.recorder.metrics)
+
+    async def handle_market_data(self, trade: Trade, recv_ns: int = None):
         """Callback for WebSocket data"""
-        symbol = data.get('s')
-        price = float(data.get('p'))
-        
-        if symbol not in self.price_history:
-            self.price_history[symbol] = []
-
-        self.price_history[symbol].append(price)
-        if len(self.price_history[symbol]) > 500:
-            self.price_history[symbol].pop(0)
-            
-        self.corr_engine.update_price(symbol, price)
-        
-        # Analyze and potentially execute
-        await self.process_strategies(symbol)
+        if type(trade) is not Trade:
+            return  # Non-trade events are not consumed here
+
+        if self.exchange_sim:
+            self.exchange_sim.on_trade(trade.symbol, trade.price, trade.qty, trade.timestamp)
+        await super().handle_market_data(trade, recv_ns)
+        if self.strategy_pool:
+            self.strategy_pool.publish(trade, recv_ns)
+        if self.recorder:
+            self.recorder.record_trade(trade)
         
         # Calculate dummy metrics for dashboard polish
-        prices = pd.Series(self.price_history[symbol])
+        symbol = trade.symbol
+        history = self.price_history[symbol]
         change = 0
-        if len(prices) > 1:
-            change = (prices.iloc[-1] - prices.iloc[0]) / prices.iloc[0] * 100
+        if len(history) > 1:
+            change = (history.last_price - history.first_price) / history.first_price * 100
 
         # Update Dashboard
         update_dashboard_state("symbol_update", {
-            **data,
+            "s": symbol,
+            "p": trade.price,
+            "q": trade.qty,
+            "T": trade.trade_time,
             "z": self.get_current_z(symbol),
-            "hurst": 0.45 + (hash(symbol) % 100) / 1000, # Simulated hurst for visual consistency
+            "hurst": self.hurst.value(symbol),
             "change": change,
-            "holding": 0 # Placeholder for position tracking
+            "holding": self.risk_manager.position(symbol),
+            **self._book_fields(symbol)
         })
 
+    def _book_fields(self, symbol) -> dict:
+        book = self.order_books.book(symbol) if self.order_books else None
+        if book is None:
+            return {}
+        return {"bid": book.best_bid, "ask": book.best_ask, "spread_bps": book.spread_bps, "imbalance": book.imbalance()}
 
-    def get_current_z(self, symbol):
-        # Helper to get z-score for dashboard
-        hist = self.price_history.get(symbol, [])
-        if len(hist) < 20: return 0
-        s = pd.Series(hist)
-        return ((s - s.rolling(20).mean()) / s.rolling(20).std()).iloc[-1]
+    def next_client_order_id(self) -> str:
+        return self.order_executor.next_client_order_id()
 
-    async def process_strategies(self, symbol):
-        prices = pd.Series(self.price_history[symbol])
-        
-        for strategy in self.strategies:
-            signal = strategy.analyze(symbol, prices)
-            
-            if signal.get('action') in ['buy', 'sell']:
-                if self.risk_manager.check_trade(signal):
-                    # Calculate size
-                    amount = self.risk_manager.calculate_position_size(symbol, signal['price'])
-                    
-                    order = {
-                        'symbol': symbol,
-                        'side': signal['side'],
-                        'amount': amount,
-                        'type': 'market'
-                    }
-                    
-                    logger.warning(f"🎯 SIGNAL DETECTED: {strategy.name} -> {signal['action']} {symbol}")
-                    result = self.executor.execute_order(order)
-                    # Log result, update state...
+    async def submit_order(self, order):
+        # Fire and forget, the fill comes back through on_order_complete
+        future = self.order_executor.submit(order)
+        future.add_done_callback(lambda f: self._settle_failed(order, f.result()))
+
+    async def submit_batch(self, orders):
+        future = self.order_executor.submit_batch(orders)
+        future.add_done_callback(lambda f: [self._settle_failed(o, r) for o, r in zip(orders, f.result())])
+
+    def _settle_failed(self, order, result):
+        # Orders rejected before reaching the executor (queue full) never get a completion callback
+        if result.get('status') == 'failed':
+            self.order_manager.settle(order, result)
+
+    async def submit_orders(self, orders):
+        # Legs go out together; the executor unwinds filled legs if any leg fails
+        future = self.order_executor.submit_group(orders)
+        future.add_done_callback(lambda f: self.on_group_complete(orders, f.result()))
+
+    def on_pair_position(self, strategy_name, key, position):
+        super().on_pair_position(strategy_name, key, position)
+        if self.strategy_pool:
+            self.strategy_pool.send_pair_position(strategy_name, key, position)
+
+    def on_order_complete(self, order, result):
+        if self.user_stream is None:
+            if not super().on_order_complete(order, result):
+                return
+        elif not self._stream_order_update(order, result):
+            return
+
+        trades = dashboard_state['recent_trades']
+        trades.append({
+            'symbol': order['symbol'],
+            'side': order['side'],
+            'amount': result.get('filled') or order['amount'],
+            'price': result.get('average') or result.get('price') or order.get('price'),
+            'id': result.get('id'),
+            'client_order_id': order['client_order_id']
+        })
+        del trades[:-50]
+        update_dashboard_state("recent_trades", trades)
+
+    def _stream_order_update(self, order, result) -> bool:
+        """
+        With the user-data stream, positions come from its account updates;
+        order results only settle in-flight orders. REST acknowledgements are
+        left for the stream's execution reports.
+        """
+        if result.get('status') == 'failed':
+            return super().on_order_complete(order, result)
+        if result.get('source') != 'stream':
+            return False
+        self.order_manager.settle(order, result)
+        return bool(result.get('filled'))
+
+    def _on_balance(self, asset, wallet):
+        if asset != 'USDT':
+            return
+        equity = wallet + self.risk_manager.unrealized
+        if self.start_equity is None:
+            # First real balance: drawdown is measured from the account, not RISK_INITIAL_EQUITY
+            self.start_equity = equity
+            self.risk_manager.reset_equity(equity)
+        else:
+            self.risk_manager.update_pnl(equity)
+        update_dashboard_state("equity", equity)
+        update_dashboard_state("pnl", equity - self.start_equity)
+
+    async def _account_snapshot(self):
+        # Fresh read (no cache) so a reconnect resyncs to the exchange's current state
+        balance = await asyncio.to_thread(self.executor.fetch_balance, 0.0)
+        info = balance.get('info', {})
+        return info.get('positions', []), info.get('assets', [])
+
+    async def warm_start(self):
+        """Rehydrate market state: local snapshot, then archived ticks, then a REST backfill for the rest of the gap."""
+        started = time.perf_counter()
+        snapshot.restore_snapshot(self, Config.SNAPSHOT_PATH, max_age=Config.SNAPSHOT_MAX_AGE)
+
+        floor_ms = int((time.time() - Config.BACKFILL_SECONDS) * 1000)
+        if self.recorder:
+            self.recorder.flush(wait=True)
+            archive = TickArchive(Config.ARCHIVE_DIR)
+            streams = []
+            for symbol in self.symbols:
+                history = self.price_history[symbol]
+                start_ms = int(history.timestamps[-1] * 1000) + 1 if len(history) else floor_ms
+                streams.append(archive.trades(symbol, start=start_ms))
+            applied = replay(self, heapq.merge(*streams, key=lambda tr: tr.trade_time))
+            if applied:
+                logger.info(f"Replayed {applied} archived trades")
+
+        if Config.BACKFILL_ENABLED:
+            since = {s: float(buf.timestamps[-1]) for s, buf in self.price_history.buffers.items() if len(buf)}
+            backfill = RestBackfill(
+                max_trades=Config.BACKFILL_TRADES,
+                lookback_seconds=Config.BACKFILL_SECONDS,
+                bar_limit=Config.BAR_HISTORY_SIZE
+            )
+            try:
+                await backfill.run(self, since)
+            except Exception as e:
+                logger.warning(f"REST backfill failed, starting from local state: {e}")
+
+        logger.info(f"Warm start finished in {time.perf_counter() - started:.3f}s")
+
+    async def _order_flush_loop(self):
+        # Ticks close netting windows as they arrive; this covers windows left open on a quiet market
+        window = max(self.order_manager.window, 0.01)
+        while self.running:
+            await asyncio.sleep(window)
+            if self.order_manager.due(time.time()):
+                await self.flush_orders(time.time())
+
+    async def _bar_flush_loop(self):
+        # Bars otherwise close on the next trade, which a quiet symbol may not see for a long time
+        period = min(min(self.bars.intervals), 1.0)
+        while self.running:
+            await asyncio.sleep(period)
+            try:
+                await self.flush_bars(time.time() - Config.BAR_CLOSE_DELAY)
+            except Exception as e:
+                logger.error(f"Bar flush failed: {e}")
+
+    async def _snapshot_loop(self):
+        while self.running:
+            await asyncio.sleep(Config.SNAPSHOT_INTERVAL)
+            try:
+                # Copy on the loop, write in a thread
+                arrays = snapshot.capture(self)
+                await asyncio.to_thread(snapshot.write, arrays, Config.SNAPSHOT_PATH)
+            except Exception as e:
+                logger.error(f"Snapshot failed: {e}")
 
     async def start(self):
         self.running = True
         logger.success("🚀 ARBITRONIX CORE ENGINE DEPLOYED")
+
+        await self.warm_start()
+        if Config.SNAPSHOT_INTERVAL > 0:
+            asyncio.create_task(self._snapshot_loop())
+        
+        if Config.DASHBOARD_ENABLED:
+            # Start API in background
+            import uvicorn
+            from trading_system.api.server import app
+            config = uvicorn.Config(app, host="0.0.0.0", port=Config.DASHBOARD_PORT, log_level="error")
+            self.dashboard = uvicorn.Server(config)
+            self._dashboard_task = asyncio.create_task(self.dashboard.serve())
         
-        # Start API in background
-        config = uvicorn.Config(app, host="0.0.0.0", port=8000, log_level="error")
-        server = uvicorn.Server(config)
-        asyncio.create_task(server.serve())
+        self.order_executor.start()
+        if self.order_manager.window > 0:
+            asyncio.create_task(self._order_flush_loop())
+        if self.bars.intervals:
+            asyncio.create_task(self._bar_flush_loop())
+        if self.strategy_pool:
+            # Hand the warmed-up state to the workers
+            snapshot.save_snapshot(self, Config.SNAPSHOT_PATH)
+            self.strategy_pool.start(self.handle_signal, Config.SNAPSHOT_PATH)
         
+        if self.user_stream:
+            asyncio.create_task(self.user_stream.run())
+
         # Start WebSocket
         await self.ws_manager.start()
 
     async def stop(self):
         self.running = False
         await self.ws_manager.stop()
+        if self.user_stream:
+            await self.user_stream.stop()
+        if self.order_books:
+            await self.order_books.close()
+        if self.strategy_pool:
+            await self.strategy_pool.stop()
+        await self.order_executor.stop()
+        if self.dashboard:
+            self.dashboard.should_exit = True
+            await self._dashboard_task
+        if self.recorder:
+            self.recorder.close()
+        if Config.SNAPSHOT_INTERVAL > 0:
+            snapshot.save_snapshot(self, Config.SNAPSHOT_PATH)
         logger.info("Engine shutdown complete.")
 
 async def main():
@@ -0,0 +1,204 @@
+"""
+Cold-start benchmark for the engine.
+
+1. Import-time breakdown of `import main` (python -X importtime), grouped by
+   top-level package.
+2. Time from spawning a fresh interpreter to the first subscribed tick being
+   processed, against a local WebSocket stand-in for Binance (WS_BASE_URL).
+   The engine runs its default PAPER configuration (dashboard, archive,
+   snapshots and order books on; REST backfill is off by default in PAPER),
+   with the dashboard on a free local port. Trade and depth streams both get
+   data, and depth snapshots come from a local REST stand-in
+   (ORDER_BOOK_REST_URL), so the first tick is measured while the books
+   sync; the time to the first synced book and whether ccxt was imported
+   are reported too. `--minimal` also switches off the dashboard, archive,
+   order books and snapshots (MINIMAL_ENV) to show what they cost.
+
+    python scripts/startup_benchmark.py --runs 5 [--minimal]
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from urllib.parse import parse_qs, urlparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r'''
+import sys
+import time
+t0 = time.perf_counter()
+import asyncio
+import main
+t_import = time.perf_counter()
+engine = main.ArbitronixEngine()
+t_init = time.perf_counter()
+
+first = asyncio.Event()
+handle = engine.handle_market_data
+async def handle_market_data(trade, recv_ns=None):
+    await handle(trade, recv_ns)
+    first.set()
+engine.ws_manager.callback = handle_market_data
+
+synced = asyncio.Event()
+if engine.order_books:
+    engine.order_books.on_update(lambda symbol, book: synced.set())
+else:
+    synced.set()
+
+async def run():
+    task = asyncio.create_task(engine.start())
+    await first.wait()
+    t_tick = time.perf_counter()
+    await asyncio.wait_for(synced.wait(), timeout=10)
+    t_book = time.perf_counter()
+    print(f"FIRST_TICK {t_import - t0:.4f} {t_init - t_import:.4f} {t_tick - t_init:.4f} "
+          f"{t_book - t_init:.4f} {int('ccxt' in sys.modules)}", flush=True)
+    await engine.stop()
+    task.cancel()
+
+asyncio.run(run())
+'''
+
+BENCH_ENV = {
+    "TRADING_MODE": "PAPER",
+    "LOG_LEVEL": "WARNING"
+}
+
+MINIMAL_ENV = {
+    "DASHBOARD_ENABLED": "false",
+    "ARCHIVE_ENABLED": "false",
+    "ORDER_BOOK_ENABLED": "false",
+    "SNAPSHOT_INTERVAL": "0",
+    "SNAPSHOT_MAX_AGE": "0"
+}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def import_breakdown(top: int):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                          cwd=ROOT, env=env, capture_output=True, text=True)
+    by_package = defaultdict(int)
+    total = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        self_us = int(self_us)
+        by_package[name.strip().split(".")[0]] += self_us
+        total += self_us
+    print(f"import main: {total / 1000:.1f} ms total (self time by top-level package)")
+    for name, us in sorted(by_package.items(), key=lambda kv: -kv[1])[:top]:
+        print(f"  {name:<28} {us / 1000:8.1f} ms")
+
+
+async def serve_streams(ws):
+    # Combined-stream endpoint: one trade or depth diff per subscribed stream
+    query = parse_qs(urlparse(ws.request.path).query)
+    now = int(time.time() * 1000)
+    for stream in query.get("streams", [""])[0].split("/"):
+        symbol, _, channel = stream.partition("@")
+        symbol = symbol.upper()
+        if channel == "trade":
+            data = {"e": "trade", "E": now, "s": symbol, "t": 1, "p": "100.0", "q": "1.0", "T": now, "m": False}
+        elif channel.startswith("depth"):
+            # Straddles the snapshot's lastUpdateId 1 below
+            data = {"e": "depthUpdate", "E": now, "s": symbol, "U": 1, "u": 2,
+                    "b": [["99.9", "2.0"]], "a": [["100.1", "2.0"]]}
+        else:
+            continue
+        await ws.send(json.dumps({"stream": stream, "data": data}))
+    await ws.wait_closed()
+
+
+DEPTH_SNAPSHOT = json.dumps({"lastUpdateId": 1, "bids": [["99.9", "1.0"], ["99.8", "1.0"]],
+                             "asks": [["100.1", "1.0"], ["100.2", "1.0"]]}).encode()
+
+
+async def serve_depth_snapshot(reader, writer):
+    # Minimal keep-alive HTTP/1.1 server answering every request with the same /api/v3/depth body
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            if not head:
+                break
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                         b"X-MBX-USED-WEIGHT-1M: 50\r\n"
+                         b"Content-Length: " + str(len(DEPTH_SNAPSHOT)).encode() + b"\r\n\r\n" + DEPTH_SNAPSHOT)
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def first_tick(runs: int, minimal: bool):
+    import websockets
+    rest = await asyncio.start_server(serve_depth_snapshot, "127.0.0.1", 0)
+    async with rest, websockets.serve(serve_streams, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        rest_port = rest.sockets[0].getsockname()[1]
+        env = dict(os.environ, PYTHONPATH=ROOT, WS_BASE_URL=f"ws://127.0.0.1:{port}",
+                   ORDER_BOOK_REST_URL=f"http://127.0.0.1:{rest_port}", **BENCH_ENV)
+        if minimal:
+            env.update(MINIMAL_ENV)
+        totals, phases = [], []
+        with tempfile.TemporaryDirectory() as cwd:  # Logs and data land here, not in the repo
+            env["DATA_DIR"] = os.path.join(cwd, "data")
+            for _ in range(runs):
+                env["DASHBOARD_PORT"] = str(free_port())
+                started = time.perf_counter()
+                proc = await asyncio.create_subprocess_exec(sys.executable, "-c", CHILD, cwd=cwd, env=env,
+                                                            stdout=asyncio.subprocess.PIPE)
+                while True:
+                    line = await asyncio.wait_for(proc.stdout.readline(), timeout=30)
+                    if not line:
+                        raise RuntimeError("engine exited before the first tick")
+                    if line.startswith(b"FIRST_TICK"):
+                        totals.append(time.perf_counter() - started)
+                        phases.append([float(x) for x in line.split()[1:]])
+                        break
+                await proc.wait()
+
+    median = statistics.median(totals)
+    imp, init, start, book = (statistics.median(p[k] for p in phases) for k in range(4))
+    print(f"cold start to first tick ({'minimal' if minimal else 'default'} config): "
+          f"median {median * 1000:.0f} ms over {runs} runs "
+          f"(min {min(totals) * 1000:.0f}, max {max(totals) * 1000:.0f})")
+    print(f"  interpreter + import main  {(median - init - start) * 1000:8.1f} ms  (import alone {imp * 1000:.1f})")
+    print(f"  ArbitronixEngine()         {init * 1000:8.1f} ms")
+    print(f"  start() -> first tick      {start * 1000:8.1f} ms")
+    if not minimal:
+        print(f"  start() -> first book sync {book * 1000:8.1f} ms")
+    print("  ccxt imported:", "yes" if any(p[4] for p in phases) else "no")
+    print("  target < 1000 ms:", "OK" if median < 1.0 else "MISSED")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure engine import time and cold start to first tick")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="packages shown in the import breakdown")
+    parser.add_argument("--minimal", action="store_true",
+                        help="also disable dashboard, archive, order books and snapshots")
+    args = parser.parse_args()
+
+    import_breakdown(args.top)
+    asyncio.run(first_tick(args.runs, args.minimal))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import json
+import numpy as np
+from trading_system.api.broadcast import BroadcastHub, _Client
+
+
+def _hub_with_client():
+    hub = BroadcastHub({'symbols': {}, 'equity': 0.0})
+    client = _Client(websocket=None)  # Only the queue side is exercised
+    hub.clients.append(client)
+    return hub, client
+
+
+def test_flush_serializes_numpy_scalars():
+    hub, client = _hub_with_client()
+    hub.update_symbol("BTCUSDT", {"price": np.float64(101.5), "zscore": np.float32(-1.25),
+                                  "trades": np.int64(42), "trending": np.bool_(True)})
+    hub.set("equity", np.float64(10_000.0))
+
+    hub.flush()
+    snapshot = json.loads(client.queue.popleft())
+    assert snapshot["type"] == "snapshot"
+    assert snapshot["equity"] == 10_000.0
+    assert snapshot["symbols"]["BTCUSDT"] == {"price": 101.5, "zscore": -1.25, "trades": 42, "trending": True}
+
+    hub.update_symbol("BTCUSDT", {"price": np.float64(102.0)})
+    hub.flush()
+    delta = json.loads(client.queue.popleft())
+    assert delta["type"] == "delta"
+    assert delta["symbols"]["BTCUSDT"]["price"] == 102.0
+
+
+def test_fallback_serializer_handles_numpy_scalars(monkeypatch):
+    import builtins
+    real_import = builtins.__import__
+
+    def no_orjson(name, *args, **kwargs):
+        if name == "orjson":
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", no_orjson)
+    hub, client = _hub_with_client()
+    hub.update_symbol("ETHUSDT", {"price": np.float64(2500.25), "trades": np.int64(7)})
+    hub.flush()
+    assert json.loads(client.queue.popleft())["symbols"]["ETHUSDT"] == {"price": 2500.25, "trades": 7}
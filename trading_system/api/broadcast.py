@@ -0,0 +1,184 @@
+import asyncio
+import json
+from collections import deque
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional
+from trading_system.core.telemetry import logger
+
+def _json_default(obj):
+    # NumPy scalars from the indicator stores (numpy.float64, int64, bool_)
+    if hasattr(obj, "item"):
+        return obj.item()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _json_dumps():
+    try:
+        import orjson
+        return lambda obj: orjson.dumps(obj, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    except ImportError:
+        return lambda obj: json.dumps(obj, separators=(",", ":"), default=_json_default)
+
+
+class _Client:
+    __slots__ = ("websocket", "symbols", "queue", "wakeup", "resync", "dropped", "sent")
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+        self.symbols: Optional[FrozenSet[str]] = None  # None = all symbols
+        self.queue: deque = deque()
+        self.wakeup = asyncio.Event()
+        self.resync = True  # Next message is a full snapshot
+        self.dropped = 0
+        self.sent = 0
+
+
+class BroadcastHub:
+    """
+    Fan-out of dashboard state to WebSocket viewers.
+
+    Writers only mark what changed. Every `interval` seconds the hub builds one
+    delta (changed symbols + changed top-level fields), serializes it once per
+    distinct symbol subscription and queues the same string on every matching
+    client. A client whose queue reaches `max_queue` has its backlog discarded
+    and is sent a fresh snapshot instead, so slow viewers skip to the latest
+    state without holding up the others.
+
+    Client -> server: {"subscribe": ["BTCUSDT", ...]} (or null for all symbols).
+    Server -> client: {"type": "snapshot" | "delta", "symbols": {...}, <fields>...}
+    """
+
+    def __init__(self, state: Dict[str, Any], interval: float = 0.5, max_queue: int = 8):
+        self.state = state
+        self.interval = interval
+        self.max_queue = max_queue
+        self.clients: List[_Client] = []
+        self._dirty_symbols = set()
+        self._dirty_fields = set()
+        self._dumps = _json_dumps()
+        self._task: Optional[asyncio.Task] = None
+        self.broadcasts = 0
+        self.serializations = 0
+
+    # Writers (engine side)
+
+    def update_symbol(self, symbol: str, data: Dict[str, Any]):
+        self.state['symbols'][symbol] = data
+        self._dirty_symbols.add(symbol)
+
+    def set(self, key: str, value: Any):
+        self.state[key] = value
+        self._dirty_fields.add(key)
+
+    # Broadcast loop
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Dashboard broadcast failed: {e}")
+
+    def _message(self, kind: str, symbols: Iterable[str], fields: Iterable[str]) -> str:
+        all_symbols = self.state['symbols']
+        msg = {key: self.state[key] for key in fields if key != 'symbols'}
+        msg['type'] = kind
+        msg['symbols'] = {s: all_symbols[s] for s in symbols if s in all_symbols}
+        self.serializations += 1
+        return self._dumps(msg)
+
+    def flush(self):
+        """Build and queue one round of deltas (and snapshots for clients that need one)."""
+        dirty_symbols, dirty_fields = self._dirty_symbols, self._dirty_fields
+        self._dirty_symbols, self._dirty_fields = set(), set()
+        if not self.clients:
+            return
+
+        deltas: Dict[Optional[FrozenSet[str]], Optional[str]] = {}
+        snapshots: Dict[Optional[FrozenSet[str]], str] = {}
+        for client in self.clients:
+            key = client.symbols
+            if client.resync:
+                if key not in snapshots:
+                    symbols = self.state['symbols'] if key is None else key
+                    snapshots[key] = self._message("snapshot", symbols, self.state)
+                client.queue.clear()
+                client.queue.append(snapshots[key])
+                client.resync = False
+            else:
+                if not dirty_symbols and not dirty_fields:
+                    continue
+                if key not in deltas:
+                    changed = dirty_symbols if key is None else dirty_symbols & key
+                    deltas[key] = self._message("delta", changed, dirty_fields) if changed or dirty_fields else None
+                if deltas[key] is None:
+                    continue
+                if len(client.queue) >= self.max_queue:
+                    # Too far behind: drop the backlog, send current state next round
+                    client.dropped += len(client.queue)
+                    client.queue.clear()
+                    client.resync = True
+                    continue
+                client.queue.append(deltas[key])
+            client.wakeup.set()
+        self.broadcasts += 1
+
+    # Per-connection tasks
+
+    async def serve(self, websocket):
+        """Run one accepted WebSocket until it disconnects."""
+        self.start()
+        client = _Client(websocket)
+        self.clients.append(client)
+        sender = asyncio.create_task(self._send(client))
+        receiver = asyncio.create_task(self._receive(client))
+        try:
+            await asyncio.wait([sender, receiver], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            sender.cancel()
+            receiver.cancel()
+            self.clients.remove(client)
+
+    async def _send(self, client: _Client):
+        try:
+            while True:
+                await client.wakeup.wait()
+                client.wakeup.clear()
+                while client.queue:
+                    await client.websocket.send_text(client.queue.popleft())
+                    client.sent += 1
+        except Exception as e:
+            logger.warning(f"Dashboard WS disconnected: {e}")
+
+    async def _receive(self, client: _Client):
+        while True:
+            try:
+                text = await client.websocket.receive_text()
+            except Exception:
+                return  # Disconnected
+            try:
+                msg = json.loads(text)
+                if 'subscribe' in msg:
+                    symbols = msg['subscribe']
+                    client.symbols = None if symbols is None else frozenset(symbols)
+                    client.resync = True
+            except (ValueError, TypeError) as e:
+                logger.debug(f"Ignoring dashboard client message {text[:100]!r}: {e}")
+
+    def metrics(self) -> Dict:
+        return {
+            "clients": len(self.clients),
+            "broadcasts": self.broadcasts,
+            "serializations": self.serializations,
+            "queued": sum(len(c.queue) for c in self.clients),
+            "dropped": sum(c.dropped for c in self.clients)
+        }
@@ -1,20 +1,20 @@
 from fastapi import FastAPI, WebSocket
 from fastapi.responses import HTMLResponse
-import json
-import asyncio
-from typing import List, Dict
-from trading_system.core.telemetry import logger
+from trading_system.core.telemetry import latency
+from trading_system.api.state import dashboard_state, hub, metrics_providers, register_metrics_provider, update_dashboard_state
 
 app = FastAPI(title="Arbitronix Core Dashboard")
 
-# Shared state (in real system, use Redis)
-dashboard_state = {
-    "engine_status": "Starting...",
-    "symbols": {},
-    "recent_trades": [],
-    "equity": 10000.0,
-    "pnl": 0.0
-}
+@app.get("/metrics")
+async def metrics():
+    components = {}
+    for name, provider in metrics_providers.items():
+        try:
+            components[name] = provider()
+        except Exception as e:
+            components[name] = {"error": str(e)}
+    components["dashboard"] = hub.metrics()
+    return {"latency": latency.snapshot(), "components": components}
 
 @app.get("/")
 async def get():
@@ -24,20 +24,7 @@ async def get():
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
-    try:
-        while True:
-            # Send state updates every second
-            await websocket.send_json(dashboard_state)
-            await asyncio.sleep(1)
-    except Exception as e:
-        logger.warning(f"Dashboard WS disconnected: {e}")
-
-def update_dashboard_state(key: str, value: any):
-    if key in dashboard_state:
-        dashboard_state[key] = value
-    elif key == "symbol_update":
-        symbol = value['s']
-        dashboard_state['symbols'][symbol] = value
+    await hub.serve(websocket)
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,34 @@
+from typing import Callable, Dict
+from trading_system.core.config import Config
+from trading_system.api.broadcast import BroadcastHub
+
+# Dashboard state and metrics registry, importable without FastAPI (the server module
+# is only loaded when the dashboard is enabled)
+
+# Shared state (in real system, use Redis)
+dashboard_state = {
+    "engine_status": "Starting...",
+    "symbols": {},
+    "recent_trades": [],
+    "equity": 10000.0,
+    "pnl": 0.0
+}
+
+hub = BroadcastHub(
+    dashboard_state,
+    interval=Config.DASHBOARD_INTERVAL,
+    max_queue=Config.DASHBOARD_CLIENT_QUEUE
+)
+
+# Component metrics providers, name -> zero-arg callable returning a dict
+metrics_providers: Dict[str, Callable[[], Dict]] = {}
+
+def register_metrics_provider(name: str, provider: Callable[[], Dict]):
+    metrics_providers[name] = provider
+
+def update_dashboard_state(key: str, value: any):
+    # Only marks the change; the hub serializes and sends on its own cadence
+    if key == "symbol_update":
+        hub.update_symbol(value['s'], value)
+    elif key in dashboard_state:
+        hub.set(key, value)
@@ -0,0 +1,252 @@
+import argparse
+import asyncio
+import heapq
+import time
+import pandas as pd
+from typing import Dict, Iterable, Iterator, List, Optional
+from trading_system.core.config import Config
+from trading_system.core.telemetry import setup_logging, logger, latency
+from trading_system.core.trading_engine import TradingEngine
+from trading_system.market.decoder import Trade
+from trading_system.market.archive import TickArchive
+from trading_system.execution.paper_broker import PaperBroker, PaperExecutor, FixedBpsSlippage, PercentFee
+from trading_system.execution.exchange_sim import SimExchange, LatencyModel
+
+def _to_ms(t: pd.Series) -> pd.Series:
+    # Binance dumps switched from ms to us timestamps; normalise to ms
+    t = t.astype('int64')
+    if len(t) and t.iloc[0] > 10**14:
+        t = t // 1000
+    return t
+
+
+def load_trades(path: str, symbol: str) -> Iterator[Trade]:
+    """
+    Stream trades from a CSV file.
+    Accepts Binance trade dumps (id, price, qty, quote_qty, time, is_buyer_maker; no header)
+    or a headered file with price, qty and time columns.
+    """
+    df = pd.read_csv(path)
+    if 'price' not in df.columns:
+        df = pd.read_csv(path, header=None, names=['id', 'price', 'qty', 'quote_qty', 'time', 'is_buyer_maker', 'is_best_match'][:len(df.columns)])
+    ids = df['id'] if 'id' in df.columns else pd.Series(range(len(df)))
+    times = _to_ms(df['time'])
+    for tid, p, q, t in zip(ids.to_numpy(), df['price'].to_numpy(float), df['qty'].to_numpy(float), times.to_numpy()):
+        yield Trade(symbol, float(p), float(q), int(tid), int(t), int(t))
+
+
+def load_bars(path: str, symbol: str, interval_ms: Optional[int] = None) -> Iterator[Trade]:
+    """
+    Stream klines from a CSV as synthetic trades: open, high/low (in the order the
+    close direction implies) and close, each with a quarter of the bar volume.
+    Accepts Binance kline dumps (no header) or a headered file with open_time/open/high/low/close/volume.
+    """
+    df = pd.read_csv(path)
+    if 'open' not in df.columns:
+        df = pd.read_csv(path, header=None).iloc[:, :6]
+        df.columns = ['open_time', 'open', 'high', 'low', 'close', 'volume']
+    times = _to_ms(df['open_time']).to_numpy()
+    if interval_ms is None:
+        interval_ms = int(times[1] - times[0]) if len(times) > 1 else 60_000
+    step = interval_ms // 4
+
+    tid = 0
+    for t, o, h, l, c, v in zip(times, df['open'].to_numpy(float), df['high'].to_numpy(float),
+                                df['low'].to_numpy(float), df['close'].to_numpy(float), df['volume'].to_numpy(float)):
+        path_prices = (o, l, h, c) if c >= o else (o, h, l, c)
+        for k, p in enumerate(path_prices):
+            tid += 1
+            ts = int(t) + k * step
+            yield Trade(symbol, float(p), float(v) / 4, tid, ts, ts)
+
+
+def load_archive(root: str, symbol: str, start: Optional[int] = None, end: Optional[int] = None) -> Iterator[Trade]:
+    """Stream trades recorded by the live engine's TickRecorder (start/end in epoch ms)."""
+    return TickArchive(root).trades(symbol, start, end)
+
+
+def merge_trades(streams: Iterable[Iterable[Trade]]) -> Iterator[Trade]:
+    """Merge per-symbol streams into one time-ordered stream."""
+    return heapq.merge(*streams, key=lambda tr: tr.trade_time)
+
+
+class BacktestEngine(TradingEngine):
+    """
+    Replays recorded trades through the live TradingEngine pipeline on a simulated clock.
+
+    Orders are filled synchronously by a PaperExecutor (slippage and fee models
+    are configurable) at the simulated time of the tick that triggered them.
+    With `simulator=True` they go to a SimExchange instead: futures long/short,
+    fills walk a synthetic book whose touch is `slippage_bps` from the last
+    trade, and with `latency_ms` orders reach the book only after that much
+    simulated time.
+    Equity is marked every `equity_interval` seconds of simulated time and fed
+    to the RiskManager so drawdown circuit breakers behave as they would live.
+    """
+
+    def __init__(self, symbols: List[str], initial_balance: float = 10000.0, slippage_bps: float = 1.0,
+                 fee_rate: float = 0.001, strategies: Optional[list] = None, equity_interval: float = 60.0,
+                 simulator: bool = False, latency_ms: float = 0.0):
+        super().__init__(symbols, strategies=strategies)
+        self.log_signals = False
+        self.initial_balance = initial_balance
+        self.risk_manager.reset_equity(initial_balance)
+        self.now = 0.0  # Simulated clock (seconds)
+        self.broker = None
+        self.exchange = None
+        if simulator:
+            self.exchange = SimExchange(
+                initial_balance=initial_balance,
+                maker_fee=fee_rate,
+                taker_fee=fee_rate,
+                latency=LatencyModel(latency_ms, 0.0, 0.0) if latency_ms > 0 else None,
+                clock=lambda: self.now,
+                spread_bps=2 * slippage_bps
+            )
+            self.exchange.on_fill(self._on_fill)
+            self.executor = self.exchange
+        else:
+            self.broker = PaperBroker(initial_balance=initial_balance)
+            self.executor = PaperExecutor(
+                self.broker,
+                slippage=FixedBpsSlippage(slippage_bps),
+                fees=PercentFee(fee_rate),
+                clock=lambda: self.now
+            )
+        self.equity_interval = equity_interval
+        self.equity_curve: List[tuple] = []
+        self._next_mark = 0.0
+        self._next_bar_flush = 0.0
+        self.fees_paid = 0.0
+        self.rejected = 0
+
+    async def handle_market_data(self, trade: Trade, recv_ns: int = None):
+        if self.exchange is not None:
+            # The exchange sees the tick first: due orders and resting limits fill before strategies react
+            self.exchange.on_trade(trade.symbol, trade.price, trade.qty, trade.timestamp)
+        await super().handle_market_data(trade, recv_ns)
+
+    async def submit_order(self, order):
+        result = self.executor.execute_order(order)
+        self.order_manager.settle(order, result)
+        if result.get('status') == 'failed':
+            self.rejected += 1
+        elif result.get('filled'):
+            self.fees_paid += result['fee']
+            self.on_order_complete(order, result)
+        return result
+
+    def _on_fill(self, order, result):
+        self.fees_paid += result['fee']
+        self.on_order_complete(order, result)
+
+    async def submit_orders(self, orders):
+        # Legs fill in order at the same simulated instant; stop at the first rejection and unwind the rest
+        results = []
+        for order in orders:
+            result = await self.submit_order(order)
+            results.append(result)
+            if result.get('status') == 'failed':
+                break
+        if results[-1].get('status') == 'failed':
+            for order, result in zip(orders, results):
+                if result.get('filled'):
+                    await self.submit_order({**order, 'side': 'sell' if order['side'] == 'buy' else 'buy',
+                                             'amount': result['filled']})
+            results += [{"status": "failed", "reason": "group aborted"}] * (len(orders) - len(results))
+        self.on_group_complete(orders, results)
+
+    def equity(self) -> float:
+        if self.exchange is not None:
+            return self.exchange.equity()
+        value = self.broker.balance['USDT']
+        for symbol, pos in self.broker.positions.items():
+            value += pos['amount'] * self.price_history[symbol].last_price
+        return value
+
+    def mark(self):
+        equity = self.equity()
+        self.equity_curve.append((self.now, equity))
+        self.risk_manager.update_pnl(equity)
+
+    async def run(self, trades: Iterable[Trade]) -> Dict:
+        ticks = 0
+        started = time.perf_counter()
+        for trade in trades:
+            self.now = trade.timestamp
+            await self.handle_market_data(trade)
+            ticks += 1
+            if self.now >= self._next_bar_flush:
+                # Quiet symbols close their bars on the simulated clock, as the live flush loop does
+                await self.flush_bars(self.now)
+                self._next_bar_flush = self.now + 1.0
+            if self.now >= self._next_mark:
+                self.mark()
+                self._next_mark = self.now + self.equity_interval
+        if self.bars.intervals:
+            await self.flush_bars(self.now + max(self.bars.intervals))
+        self.mark()
+        elapsed = time.perf_counter() - started
+        return self.report(ticks, elapsed)
+
+    def report(self, ticks: int, elapsed: float) -> Dict:
+        equity = [e for _, e in self.equity_curve]
+        peak, max_dd = 0.0, 0.0
+        for e in equity:
+            peak = max(peak, e)
+            if peak > 0:
+                max_dd = max(max_dd, (peak - e) / peak)
+        final = equity[-1] if equity else self.initial_balance
+        return {
+            'ticks': ticks,
+            'elapsed_s': elapsed,
+            'ticks_per_sec': ticks / elapsed if elapsed > 0 else 0.0,
+            'trades': self.exchange.fills if self.exchange is not None else len(self.broker.orders),
+            'rejected_orders': self.rejected,
+            'fees': self.fees_paid,
+            'final_equity': final,
+            'return_pct': (final / self.initial_balance - 1) * 100,
+            'max_drawdown_pct': max_dd * 100
+        }
+
+
+def run_backtest(trades: Iterable[Trade], symbols: List[str], **kwargs) -> Dict:
+    engine = BacktestEngine(symbols, **kwargs)
+    return asyncio.run(engine.run(trades))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded ticks through the strategy stack")
+    parser.add_argument("--trades", nargs="*", default=[], metavar="SYMBOL=PATH", help="trade CSV per symbol")
+    parser.add_argument("--bars", nargs="*", default=[], metavar="SYMBOL=PATH", help="kline CSV per symbol")
+    parser.add_argument("--archive", nargs="*", default=[], metavar="SYMBOL", help="symbols to replay from the tick archive")
+    parser.add_argument("--archive-dir", default=str(Config.ARCHIVE_DIR))
+    parser.add_argument("--start", type=int, default=None, help="archive start, epoch ms")
+    parser.add_argument("--end", type=int, default=None, help="archive end, epoch ms")
+    parser.add_argument("--balance", type=float, default=10000.0)
+    parser.add_argument("--slippage-bps", type=float, default=1.0)
+    parser.add_argument("--fee-rate", type=float, default=0.001)
+    parser.add_argument("--simulator", action="store_true", help="fill through the SimExchange (futures, book walking)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated order latency with --simulator")
+    args = parser.parse_args()
+
+    setup_logging(Config.LOG_LEVEL)
+    latency.enabled = False
+
+    streams, symbols = [], []
+    for spec, loader in [(s, load_trades) for s in args.trades] + [(s, load_bars) for s in args.bars]:
+        symbol, path = spec.split("=", 1)
+        symbols.append(symbol)
+        streams.append(loader(path, symbol))
+    for symbol in args.archive:
+        symbols.append(symbol)
+        streams.append(load_archive(args.archive_dir, symbol, args.start, args.end))
+
+    report = run_backtest(merge_trades(streams), symbols, initial_balance=args.balance,
+                          slippage_bps=args.slippage_bps, fee_rate=args.fee_rate,
+                          simulator=args.simulator, latency_ms=args.latency_ms)
+    for key, value in report.items():
+        logger.info(f"{key}: {value:,.4f}" if isinstance(value, float) else f"{key}: {value}")
+
+if __name__ == "__main__":
+    main()
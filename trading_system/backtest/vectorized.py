@@ -0,0 +1,253 @@
+import argparse
+import itertools
+import os
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict, List, Optional, Tuple
+from trading_system.core.config import Config
+from trading_system.core.telemetry import setup_logging, logger
+
+# Research mode: whole-array equivalents of the strategies' analyze() methods,
+# evaluated with a simple target-position PnL model. Not a replacement for the
+# event-driven BacktestEngine, which replays the exact live order flow.
+
+def rolling_zscore(prices: np.ndarray, window: int, chunk: int = 200_000) -> np.ndarray:
+    """(p - rolling mean) / rolling std (ddof=1), NaN until `window` prices exist."""
+    z = np.full(len(prices), np.nan)
+    if len(prices) < window:
+        return z
+    windows = sliding_window_view(prices, window)
+    # Chunked so the (n, window) temporaries stay bounded
+    for start in range(0, len(windows), chunk):
+        w = windows[start:start + chunk]
+        mean = w.mean(axis=1)
+        std = w.std(axis=1, ddof=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            z[start + window - 1:start + window - 1 + len(w)] = np.where(std > 0, (w[:, -1] - mean) / std, 0.0)
+    return z
+
+
+def rolling_hurst(prices: np.ndarray, window: int = 100, max_lag: int = 20) -> np.ndarray:
+    """
+    Hurst exponent over the trailing `window` prices at every index, same estimator
+    as MeanReversionStrategy.calculate_hurst. NaN until the window is full.
+    """
+    n = len(prices)
+    hurst = np.full(n, np.nan)
+    if n < window:
+        return hurst
+
+    lags = np.arange(2, max_lag)
+    x = np.log(lags) - np.log(lags).mean()
+    t = np.arange(window - 1, n)
+    logvar = np.empty((len(lags), len(t)))
+    for k, lag in enumerate(lags):
+        d = prices[lag:] - prices[:-lag]
+        c1 = np.concatenate(([0.0], np.cumsum(d)))
+        c2 = np.concatenate(([0.0], np.cumsum(d * d)))
+        # Differences d[j] with t-window+1 <= j <= t-lag
+        lo, hi = t - window + 1, t - lag + 1
+        m = window - lag
+        mean = (c1[hi] - c1[lo]) / m
+        var = (c2[hi] - c2[lo]) / m - mean * mean
+        with np.errstate(divide='ignore', invalid='ignore'):
+            logvar[k] = np.log(np.where(var > 0, var, np.nan))
+
+    y = 0.25 * logvar
+    slope = (x[:, None] * (y - y.mean(axis=0))).sum(axis=0) / (x * x).sum()
+    hurst[window - 1:] = slope * 2.0
+    return hurst
+
+
+def mean_reversion_signals(prices: np.ndarray, zscore_entry: float = 2.0, min_periods: int = 20,
+                           hurst_max: float = 0.6, hurst: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns (signal, zscore): +1 buy / -1 sell / 0 hold per index, as MeanReversionStrategy.analyze."""
+    z = rolling_zscore(prices, min_periods)
+    if hurst is None:
+        hurst = rolling_hurst(prices)
+    # Before the Hurst window fills the live strategy trades unfiltered
+    tradable = ~(hurst > hurst_max)
+    signal = np.zeros(len(prices), dtype=np.int8)
+    signal[tradable & (z < -zscore_entry)] = 1
+    signal[tradable & (z > zscore_entry)] = -1
+    return signal, z
+
+
+def liquidity_sweep_signals(high: np.ndarray, low: np.ndarray, close: np.ndarray, lookback_period: int = 50) -> np.ndarray:
+    """+1 / -1 / 0 per bar, as LiquiditySweepStrategy.analyze_bars."""
+    n = len(close)
+    signal = np.zeros(n, dtype=np.int8)
+    if n <= lookback_period:
+        return signal
+    # Prior range excludes the current bar
+    range_high = sliding_window_view(high[:-1], lookback_period).max(axis=1)
+    range_low = sliding_window_view(low[:-1], lookback_period).min(axis=1)
+    h, l, c = high[lookback_period:], low[lookback_period:], close[lookback_period:]
+    sell = (h > range_high) & (c < range_high)
+    buy = ~sell & (l < range_low) & (c > range_low)
+    signal[lookback_period:][sell] = -1
+    signal[lookback_period:][buy] = 1
+    return signal
+
+
+def positions_from_events(events: np.ndarray) -> np.ndarray:
+    """Forward-fill target positions; NaN means 'keep the previous position'."""
+    idx = np.where(~np.isnan(events), np.arange(len(events)), -1)
+    np.maximum.accumulate(idx, out=idx)
+    return np.where(idx >= 0, events[idx], 0.0)
+
+
+def evaluate(prices: np.ndarray, positions: np.ndarray, fee_rate: float = 0.001) -> Dict[str, float]:
+    returns = np.zeros(len(prices))
+    returns[1:] = prices[1:] / prices[:-1] - 1.0
+    held = np.zeros(len(prices))
+    held[1:] = positions[:-1]
+    turnover = np.abs(np.diff(positions, prepend=0.0))
+    pnl = held * returns - turnover * fee_rate
+
+    # A wiped-out account stays at zero
+    equity = np.cumprod(np.maximum(1.0 + pnl, 0.0))
+    peak = np.maximum.accumulate(equity)
+    std = pnl.std()
+    return {
+        'return_pct': float(equity[-1] - 1.0) * 100 if len(equity) else 0.0,
+        'sharpe': float(pnl.mean() / std * np.sqrt(len(pnl))) if std > 0 else 0.0,
+        'max_drawdown_pct': float((1.0 - equity / peak).max() * 100) if len(equity) else 0.0,
+        'trades': int((turnover > 0).sum()),
+        'exposure_pct': float((positions != 0).mean() * 100)
+    }
+
+
+def run_mean_reversion(arrays: Dict[str, np.ndarray], zscore_entry: float = 2.0, zscore_exit: float = 0.5,
+                       min_periods: int = 20, hurst_max: float = 0.6, fee_rate: float = 0.001) -> Dict[str, float]:
+    prices = arrays['close']
+    signal, z = mean_reversion_signals(prices, zscore_entry, min_periods, hurst_max, arrays.get('hurst'))
+    # Enter on signal, flatten once |z| is back inside the exit band
+    events = np.full(len(prices), np.nan)
+    events[np.abs(z) < zscore_exit] = 0.0
+    events[signal != 0] = signal[signal != 0]
+    return evaluate(prices, positions_from_events(events), fee_rate)
+
+
+def run_liquidity_sweep(arrays: Dict[str, np.ndarray], lookback_period: int = 50, fee_rate: float = 0.001) -> Dict[str, float]:
+    signal = liquidity_sweep_signals(arrays['high'], arrays['low'], arrays['close'], lookback_period)
+    # Hold until the opposite sweep
+    events = np.where(signal != 0, signal, np.nan).astype(float)
+    return evaluate(arrays['close'], positions_from_events(events), fee_rate)
+
+
+STRATEGIES = {
+    'mean_reversion': run_mean_reversion,
+    'liquidity_sweep': run_liquidity_sweep
+}
+
+# Worker-side views onto the parent's shared-memory arrays
+_shared: Dict[str, np.ndarray] = {}
+_handles: List[shared_memory.SharedMemory] = []
+
+
+def _attach(specs: Dict[str, Tuple[str, tuple, str]]):
+    for key, (name, shape, dtype) in specs.items():
+        shm = shared_memory.SharedMemory(name=name)
+        _handles.append(shm)
+        _shared[key] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _evaluate_params(strategy: str, params: Dict) -> Dict:
+    result = STRATEGIES[strategy](_shared, **params)
+    return {**params, **result}
+
+
+def expand_grid(grid: Dict[str, list]) -> List[Dict]:
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def run_sweep(strategy: str, arrays: Dict[str, np.ndarray], grid: Dict[str, list], workers: Optional[int] = None,
+              rank_by: str = 'sharpe') -> pd.DataFrame:
+    """
+    Evaluate every parameter combination in `grid` across a process pool.
+    Price arrays are placed in shared memory once and mapped by every worker.
+    Returns the results ranked by `rank_by`, best first.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy '{strategy}' (have {list(STRATEGIES)})")
+
+    arrays = dict(arrays)
+    if strategy == 'mean_reversion' and 'hurst' not in arrays:
+        # Parameter independent, compute once and share
+        arrays['hurst'] = rolling_hurst(np.asarray(arrays['close'], dtype=np.float64))
+
+    blocks, specs = [], {}
+    try:
+        for key, arr in arrays.items():
+            arr = np.ascontiguousarray(arr, dtype=np.float64)
+            shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+            blocks.append(shm)
+            np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[:] = arr
+            specs[key] = (shm.name, arr.shape, arr.dtype.str)
+
+        combos = expand_grid(grid)
+        workers = workers or os.cpu_count() or 1
+        logger.info(f"Sweeping {len(combos)} {strategy} parameter sets on {workers} workers")
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=(specs,)) as pool:
+            chunksize = max(1, len(combos) // (workers * 4))
+            rows = list(pool.map(_evaluate_params, itertools.repeat(strategy), combos, chunksize=chunksize))
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+
+    return pd.DataFrame(rows).sort_values(rank_by, ascending=False).reset_index(drop=True)
+
+
+def load_arrays(path: str) -> Dict[str, np.ndarray]:
+    """Close (and high/low when present) from a trade or kline CSV, same formats as the tick backtester."""
+    df = pd.read_csv(path)
+    if 'price' not in df.columns and 'close' not in df.columns:
+        df = pd.read_csv(path, header=None)
+        # Binance trade dumps have a boolean 6th column, kline dumps a close time
+        if df.shape[1] <= 7:
+            df = df.iloc[:, :2].set_axis(['id', 'price'], axis=1)
+        else:
+            df = df.iloc[:, :5].set_axis(['open_time', 'open', 'high', 'low', 'close'], axis=1)
+    if 'close' in df.columns:
+        return {k: df[k].to_numpy(float) for k in ('high', 'low', 'close')}
+    close = df['price'].to_numpy(float)
+    return {'high': close, 'low': close, 'close': close}
+
+
+def _parse_grid(specs: List[str]) -> Dict[str, list]:
+    grid = {}
+    for spec in specs:
+        key, values = spec.split("=", 1)
+        grid[key] = [int(v) if v.lstrip('-').isdigit() else float(v) for v in values.split(",")]
+    return grid
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized parameter sweep over one price series")
+    parser.add_argument("strategy", choices=list(STRATEGIES))
+    parser.add_argument("path", help="trade or kline CSV")
+    parser.add_argument("--grid", nargs="+", required=True, metavar="PARAM=V1,V2,...")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--fee-rate", type=float, default=0.001)
+    parser.add_argument("--rank-by", default="sharpe")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_logging(Config.LOG_LEVEL)
+    grid = _parse_grid(args.grid)
+    grid.setdefault('fee_rate', [args.fee_rate])
+
+    started = time.perf_counter()
+    results = run_sweep(args.strategy, load_arrays(args.path), grid, workers=args.workers, rank_by=args.rank_by)
+    logger.info(f"{len(results)} parameter sets in {time.perf_counter() - started:.2f}s")
+    print(results.head(args.top).to_string(index=False))
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,12 @@
 import os
 from enum import Enum
 from pathlib import Path
-from dotenv import load_dotenv
 
-# Load .env file
-load_dotenv()
+# Load the nearest .env above this file (as load_dotenv() would); dotenv is only imported if there is one
+_ENV_FILE = next((d / ".env" for d in Path(__file__).resolve().parents if (d / ".env").is_file()), None)
+if _ENV_FILE is not None:
+    from dotenv import load_dotenv
+    load_dotenv(_ENV_FILE)
 
 class TradingMode(Enum):
     PAPER = "PAPER"
@@ -15,6 +17,7 @@ class Config:
     # General
     TRADING_MODE = TradingMode(os.getenv("TRADING_MODE", "PAPER").upper())
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    TELEMETRY_ENABLED = os.getenv("TELEMETRY_ENABLED", "true").lower() == "true" # Latency histograms
     
     # Binance Keys
     BINANCE_API_KEY = os.getenv("BINANCE_API_KEY", "")
@@ -26,19 +29,129 @@ class Config:
 
     # Symbols to trade
     SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "BNBUSDT", "XRPUSDT"]
+
+    # Strategies: comma-separated registry names, or a JSON list of {"type": ..., "params": {...}}
+    # Others (liquidity_sweep, pair_trading) are opt-in, e.g. STRATEGIES=mean_reversion,liquidity_sweep
+    STRATEGIES = os.getenv("STRATEGIES", "mean_reversion")
+
+    # Market Data
+    PRICE_HISTORY_SIZE = int(os.getenv("PRICE_HISTORY_SIZE", "500")) # Ticks kept per symbol
+    ZSCORE_WINDOW = int(os.getenv("ZSCORE_WINDOW", "20"))
+    HURST_WINDOW = int(os.getenv("HURST_WINDOW", "100"))
+    HURST_RECOMPUTE_TICKS = int(os.getenv("HURST_RECOMPUTE_TICKS", "50"))
+    HURST_RECOMPUTE_SECONDS = float(os.getenv("HURST_RECOMPUTE_SECONDS", "5.0"))
+    CORRELATION_WINDOW = int(os.getenv("CORRELATION_WINDOW", "50")) # Buckets
+    CORRELATION_BUCKET_SECONDS = float(os.getenv("CORRELATION_BUCKET_SECONDS", "1.0"))
+    BAR_INTERVALS = os.getenv("BAR_INTERVALS", "1s,1m,15m")
+    BAR_HISTORY_SIZE = int(os.getenv("BAR_HISTORY_SIZE", "500")) # Closed bars kept per symbol/interval
+    BAR_CLOSE_DELAY = float(os.getenv("BAR_CLOSE_DELAY", "0.5")) # Seconds past an interval before a quiet symbol's bar is closed
+    WS_CONSUMERS = int(os.getenv("WS_CONSUMERS", "1"))
+    WS_QUEUE_SIZE = int(os.getenv("WS_QUEUE_SIZE", "1000")) # Pending ticks per symbol before dropping oldest
+    WS_CONFLATE = os.getenv("WS_CONFLATE", "false").lower() == "true" # Keep only the latest tick per symbol
+    WS_MAX_STREAMS_PER_CONNECTION = int(os.getenv("WS_MAX_STREAMS_PER_CONNECTION", "200")) # Binance hard limit is 1024
+    WS_REDUNDANT = os.getenv("WS_REDUNDANT", "false").lower() == "true" # Hot standby connection per shard
+    WS_BASE_URL = os.getenv("WS_BASE_URL", "") # Override, e.g. a local stand-in server
+    JSON_BACKEND = os.getenv("JSON_BACKEND", "auto") # auto | orjson | ujson | json
+    ORDER_BOOK_ENABLED = os.getenv("ORDER_BOOK_ENABLED", "true").lower() == "true" # Local L2 books from diff-depth streams, on in PAPER too: the paper exchange matches against them, at one REST depth snapshot per symbol
+    ORDER_BOOK_STREAM = os.getenv("ORDER_BOOK_STREAM", "depth@100ms") # Stream suffix, "depth" for 1s updates
+    ORDER_BOOK_LEVELS = int(os.getenv("ORDER_BOOK_LEVELS", "1000")) # Levels kept per side
+    ORDER_BOOK_SNAPSHOT_LIMIT = int(os.getenv("ORDER_BOOK_SNAPSHOT_LIMIT", "1000"))
+    ORDER_BOOK_BUFFER = int(os.getenv("ORDER_BOOK_BUFFER", "1000")) # Diffs buffered per symbol while syncing
+    ORDER_BOOK_REST_URL = os.getenv("ORDER_BOOK_REST_URL", "") # Depth snapshot host, defaults per mode
+    MARKET_DATA_WEIGHT_1M = int(os.getenv("MARKET_DATA_WEIGHT_1M", "6000")) # Spot REST weight per minute for depth snapshots
+    ARCHIVE_ENABLED = os.getenv("ARCHIVE_ENABLED", "true").lower() == "true" # Record trades and bars under DATA_DIR/archive
+    ARCHIVE_FLUSH_ROWS = int(os.getenv("ARCHIVE_FLUSH_ROWS", "1000"))
+    ARCHIVE_FLUSH_SECONDS = float(os.getenv("ARCHIVE_FLUSH_SECONDS", "1.0"))
+
+    # Warm Start
+    SNAPSHOT_INTERVAL = float(os.getenv("SNAPSHOT_INTERVAL", "30")) # Seconds between engine state snapshots, 0 disables
+    SNAPSHOT_MAX_AGE = float(os.getenv("SNAPSHOT_MAX_AGE", "3600")) # Older snapshots are ignored on startup
+    BACKFILL_ENABLED = os.getenv("BACKFILL_ENABLED", "false" if TRADING_MODE == TradingMode.PAPER else "true").lower() == "true" # REST backfill of trades and klines on startup, off by default in PAPER
+    BACKFILL_TRADES = int(os.getenv("BACKFILL_TRADES", "1000")) # Max trades per symbol
+    BACKFILL_SECONDS = float(os.getenv("BACKFILL_SECONDS", "300")) # How far back to backfill without a snapshot
+    
+    # Dashboard
+    DASHBOARD_ENABLED = os.getenv("DASHBOARD_ENABLED", "true").lower() == "true" # FastAPI/uvicorn are only imported when on
+    DASHBOARD_PORT = int(os.getenv("DASHBOARD_PORT", "8000"))
+    DASHBOARD_INTERVAL = float(os.getenv("DASHBOARD_INTERVAL", "0.5")) # Seconds between broadcasts
+    DASHBOARD_CLIENT_QUEUE = int(os.getenv("DASHBOARD_CLIENT_QUEUE", "8")) # Pending messages per viewer before resyncing it
+    
+    # Strategy Workers
+    STRATEGY_WORKERS = int(os.getenv("STRATEGY_WORKERS", "0")) # Processes running strategies, 0 = in the engine process
+    STRATEGY_WORKER_CPUS = os.getenv("STRATEGY_WORKER_CPUS", "") # e.g. "2-5", one CPU per worker round-robin
+    STRATEGY_RING_SIZE = int(os.getenv("STRATEGY_RING_SIZE", "65536")) # Ticks buffered per worker
     
     # Risk Management
     MAX_POSITION_SIZE_USD = float(os.getenv("MAX_POSITION_SIZE_USD", "1000.0"))
     MAX_DRAWDOWN_PCT = float(os.getenv("MAX_DRAWDOWN_PCT", "0.05")) # 5% max drawdown
+    MAX_GROSS_EXPOSURE_USD = float(os.getenv("MAX_GROSS_EXPOSURE_USD", "5000.0")) # Sum of |position| across symbols
+    MAX_NET_EXPOSURE_USD = float(os.getenv("MAX_NET_EXPOSURE_USD", "3000.0")) # |long - short|
+    MAX_VAR_USD = float(os.getenv("MAX_VAR_USD", "500.0")) # Portfolio VaR limit, 0 disables
+    VAR_CONFIDENCE_Z = float(os.getenv("VAR_CONFIDENCE_Z", "2.33")) # 99% one-sided
+    VAR_HORIZON_SECONDS = float(os.getenv("VAR_HORIZON_SECONDS", "3600"))
+    VAR_INTERVAL_SECONDS = float(os.getenv("VAR_INTERVAL_SECONDS", "1.0")) # Covariance refresh for VaR
+    VOL_TARGET = float(os.getenv("VOL_TARGET", "0.02")) # Return volatility over VOL_HORIZON_SECONDS that still gets the full MAX_POSITION_SIZE_USD
+    VOL_HORIZON_SECONDS = float(os.getenv("VOL_HORIZON_SECONDS", "86400")) # Sizing volatility is daily by default
+    RISK_INITIAL_EQUITY = float(os.getenv("RISK_INITIAL_EQUITY", "10000.0")) # Until the account reports its own
+
+    # Execution
+    ORDER_QUEUE_SIZE = int(os.getenv("ORDER_QUEUE_SIZE", "100")) # Max in-flight orders
+    ORDER_WORKERS = int(os.getenv("ORDER_WORKERS", "4"))
+    ORDER_NETTING_MS = float(os.getenv("ORDER_NETTING_MS", "50")) # Signals per symbol are netted over this window, 0 sends each at once
+    ORDER_MIN_NOTIONAL_USD = float(os.getenv("ORDER_MIN_NOTIONAL_USD", "5.0")) # Netted orders smaller than this are dropped
+    ORDER_IN_FLIGHT_TTL = float(os.getenv("ORDER_IN_FLIGHT_TTL", "30")) # Seconds an unconfirmed order still counts against dedup
+    ORDER_BATCH_SIZE = int(os.getenv("ORDER_BATCH_SIZE", "5")) # Orders per batch request (Binance futures max is 5)
+    RATE_LIMIT_WEIGHT_1M = int(os.getenv("RATE_LIMIT_WEIGHT_1M", "2400")) # REST request weight per minute
+    RATE_LIMIT_ORDERS_10S = int(os.getenv("RATE_LIMIT_ORDERS_10S", "300"))
+    RATE_LIMIT_ORDERS_1M = int(os.getenv("RATE_LIMIT_ORDERS_1M", "1200"))
+    RATE_LIMIT_ORDER_RESERVE = float(os.getenv("RATE_LIMIT_ORDER_RESERVE", "0.2")) # Share of the weight budget only orders may use
+    BALANCE_CACHE_TTL = float(os.getenv("BALANCE_CACHE_TTL", "2.0")) # Seconds a fetched balance is reused
+    HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10")) # Keep-alive REST connections
+
+    # User Data Stream (TESTNET/LIVE)
+    USER_STREAM_ENABLED = os.getenv("USER_STREAM_ENABLED", "true").lower() == "true" # Fills and positions pushed by the exchange
+    USER_STREAM_REST_URL = os.getenv("USER_STREAM_REST_URL", "") # Listen-key endpoint host, defaults per mode
+    USER_STREAM_WS_URL = os.getenv("USER_STREAM_WS_URL", "") # Defaults per mode
+    USER_STREAM_KEEPALIVE = float(os.getenv("USER_STREAM_KEEPALIVE", "1800")) # Seconds between listen-key keepalives
+
+    # Paper Exchange
+    PAPER_SIMULATOR = os.getenv("PAPER_SIMULATOR", "true").lower() == "true" # PAPER orders go to the local SimExchange
+    PAPER_BALANCE = float(os.getenv("PAPER_BALANCE", "10000.0"))
+    SIM_NETWORK_MS = float(os.getenv("SIM_NETWORK_MS", "20.0")) # One-way latency to the simulated exchange
+    SIM_EXCHANGE_MS = float(os.getenv("SIM_EXCHANGE_MS", "5.0")) # Matching engine processing time
+    SIM_JITTER_MS = float(os.getenv("SIM_JITTER_MS", "5.0")) # Mean of the exponential jitter
+    SIM_SPREAD_BPS = float(os.getenv("SIM_SPREAD_BPS", "1.0"))
+    SIM_DEPTH_LEVELS = int(os.getenv("SIM_DEPTH_LEVELS", "20")) # Synthetic levels per side
+    SIM_LEVEL_NOTIONAL = float(os.getenv("SIM_LEVEL_NOTIONAL", "50000.0")) # Quote currency per synthetic level
+    SIM_MAKER_FEE = float(os.getenv("SIM_MAKER_FEE", "0.0002"))
+    SIM_TAKER_FEE = float(os.getenv("SIM_TAKER_FEE", "0.0004"))
     
     # Paths
     BASE_DIR = Path(__file__).resolve().parent.parent.parent
-    DATA_DIR = BASE_DIR / "data"
+    DATA_DIR = Path(os.getenv("DATA_DIR", BASE_DIR / "data")) # Archive and snapshots
+    ARCHIVE_DIR = DATA_DIR / "archive"
+    SNAPSHOT_PATH = DATA_DIR / "engine_snapshot.npz"
 
     # Redis
     REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
     REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
 
+    @classmethod
+    def user_stream_urls(cls):
+        """(REST, WebSocket) base URLs for the futures user-data stream."""
+        if cls.TRADING_MODE == TradingMode.TESTNET:
+            rest, ws = "https://testnet.binancefuture.com", "wss://stream.binancefuture.com"
+        else:
+            rest, ws = "https://fapi.binance.com", "wss://fstream.binance.com"
+        return cls.USER_STREAM_REST_URL or rest, cls.USER_STREAM_WS_URL or ws
+
+    @classmethod
+    def market_data_rest_url(cls):
+        """Spot REST base URL for the order books' depth snapshots (same market as the WebSocket streams)."""
+        if cls.TRADING_MODE == TradingMode.TESTNET:
+            return cls.ORDER_BOOK_REST_URL or "https://testnet.binance.vision"
+        return cls.ORDER_BOOK_REST_URL or "https://api.binance.com"
+
     @classmethod
     def get_api_key(cls):
         if cls.TRADING_MODE == TradingMode.TESTNET:
@@ -50,6 +163,3 @@ class Config:
         if cls.TRADING_MODE == TradingMode.TESTNET:
             return cls.BINANCE_TESTNET_SECRET_KEY
         return cls.BINANCE_SECRET_KEY
-
-# Ensure directories exist
-Config.DATA_DIR.mkdir(parents=True, exist_ok=True)
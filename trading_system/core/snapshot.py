@@ -0,0 +1,102 @@
+import os
+import time
+import numpy as np
+from pathlib import Path
+from typing import Dict, Optional
+from trading_system.core.telemetry import logger
+
+# Snapshots are a flat .npz: "{component}/{symbol}/{field}" -> array (no pickling)
+
+def capture(engine) -> Dict[str, np.ndarray]:
+    """Copy the engine's market state; cheap enough to run on the event loop."""
+    arrays: Dict[str, np.ndarray] = {'meta/saved_at': np.float64(time.time())}
+    for symbol, buf in engine.price_history.buffers.items():
+        if len(buf):
+            for field, values in buf.state().items():
+                arrays[f"price_history/{symbol}/{field}"] = values
+    for symbol, stats in engine.rolling_stats.stats.items():
+        if stats.count:
+            arrays[f"rolling_stats/{symbol}/values"] = stats.state()['values']
+    for symbol, est in engine.hurst.estimators.items():
+        if est.count:
+            for field, values in est.state().items():
+                arrays[f"hurst/{symbol}/{field}"] = values
+    for field, values in engine.corr_engine.state().items():
+        arrays[f"correlation/{field}"] = values
+    for (symbol, interval), buf in engine.bars.buffers.items():
+        if len(buf):
+            arrays[f"bars/{symbol}/{interval:g}"] = buf.state()
+    for (symbol, interval), row in engine.bars.open_state().items():
+        arrays[f"open_bars/{symbol}/{interval:g}"] = row
+    return arrays
+
+
+def write(arrays: Dict[str, np.ndarray], path: Path):
+    """Atomically write a captured snapshot (safe to run in a worker thread)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp, path)
+
+
+def save_snapshot(engine, path: Path):
+    write(capture(engine), path)
+
+
+def restore_snapshot(engine, path: Path, max_age: Optional[float] = None) -> Optional[float]:
+    """
+    Rehydrate ring buffers, rolling stats, Hurst, correlation and bar state from `path`
+    for the engine's symbols. Returns the snapshot time, or None if it is missing,
+    unreadable or older than `max_age` seconds.
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as npz:
+            arrays = {key: npz[key] for key in npz.files}
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable snapshot {path}: {e}")
+        return None
+
+    saved_at = float(arrays.get('meta/saved_at', 0.0))
+    age = time.time() - saved_at
+    if max_age is not None and age > max_age:
+        logger.info(f"Snapshot {path} is {age:.0f}s old, skipping")
+        return None
+
+    grouped: Dict[tuple, Dict[str, np.ndarray]] = {}
+    for key, values in arrays.items():
+        component, _, rest = key.partition("/")
+        name, _, field = rest.rpartition("/")
+        grouped.setdefault((component, name), {})[field] = values
+
+    symbols = set(engine.symbols)
+    for (component, name), state in grouped.items():
+        if component != "correlation" and name not in symbols:
+            continue
+        if component == "price_history":
+            engine.price_history[name].restore(state)
+        elif component == "rolling_stats":
+            engine.rolling_stats[name].restore(state)
+        elif component == "hurst":
+            engine.hurst[name].restore(state, saved_at)
+        elif component in ("bars", "open_bars"):
+            for interval, data in state.items():
+                interval = float(interval)
+                interval = int(interval) if interval.is_integer() else interval
+                if interval not in engine.bars.intervals:
+                    continue
+                if component == "bars":
+                    engine.bars.get_bars(name, interval).restore(data)
+                else:
+                    engine.bars.restore_open(name, interval, data)
+    correlation = {field: values for (component, _), state in grouped.items()
+                   if component == "correlation" for field, values in state.items()}
+    if correlation:
+        engine.corr_engine.restore(correlation)
+
+    logger.info(f"Restored market state from {path} ({age:.1f}s old)")
+    return saved_at
@@ -0,0 +1,202 @@
+import asyncio
+import multiprocessing as mp
+import os
+import time
+from typing import Callable, Dict, List, Optional
+from trading_system.core.config import Config
+from trading_system.core.telemetry import logger, latency
+from trading_system.core.snapshot import restore_snapshot
+from trading_system.core.trading_engine import TradingEngine
+from trading_system.market.decoder import Trade
+from trading_system.market.shm_ring import ShmTickRing
+
+class ShardEngine(TradingEngine):
+    """
+    Worker-side engine: market state and strategies for one shard of symbols.
+    Signals are not risk-checked here; they go back to the parent over `conn`,
+    which also brings back the parent's pair positions for `on_pair_position`.
+    Multi-leg strategies only see legs in the same shard.
+    """
+
+    def __init__(self, symbols: List[str], strategies: Optional[list], conn):
+        super().__init__(symbols, strategies=strategies)
+        self.log_signals = False
+        self.conn = conn
+
+    async def handle_signal(self, strategy_name, symbol, signal, recv_ns=None):
+        if 'legs' in signal or signal.get('action') in ['buy', 'sell']:
+            self.conn.send((strategy_name, symbol, signal, recv_ns))
+
+    async def consume(self, ring: ShmTickRing, symbols: List[str], batch_size: int = 256):
+        # Same cadence as the parent's bar flush loop, so quiet symbols' bars still close here
+        flush_period = min(min(self.bars.intervals), 1.0)
+        next_flush = time.time() + flush_period
+        while not ring.stopped:
+            while self.conn.poll():
+                self.on_pair_position(*self.conn.recv())
+            now = time.time()
+            if now >= next_flush:
+                next_flush = now + flush_period
+                try:
+                    await self.flush_bars(now - Config.BAR_CLOSE_DELAY)
+                except Exception as e:
+                    logger.error(f"Bar flush failed: {e}")
+            batch = ring.get_batch(batch_size)
+            if not len(batch):
+                ring.wait(0.1)
+                continue
+            for sym, price, qty, trade_id, trade_time, recv_ns in batch.tolist():
+                trade = Trade(symbols[sym], price, qty, trade_id, trade_time, trade_time)
+                await self.handle_market_data(trade, recv_ns or None)
+
+
+def _worker_main(index: int, symbols: List[str], shard: List[str], ring_spec: dict, conn,
+                 strategy_factory: Optional[Callable[[], list]], cpus: Optional[List[int]], snapshot_path: Optional[str]):
+    if cpus:
+        try:
+            os.sched_setaffinity(0, cpus)
+        except (AttributeError, OSError) as e:
+            logger.warning(f"Strategy worker {index}: cannot pin to CPUs {cpus}: {e}")
+    latency.enabled = False  # Histograms would be invisible to the parent's /metrics
+
+    ring = ShmTickRing(**ring_spec)
+    engine = ShardEngine(shard, strategy_factory() if strategy_factory else None, conn)
+    if snapshot_path:
+        restore_snapshot(engine, snapshot_path)
+    try:
+        asyncio.run(engine.consume(ring, symbols))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        ring.close()
+        conn.close()
+
+
+def parse_cpus(spec: str) -> List[int]:
+    """'2,3,6-8' -> [2, 3, 6, 7, 8]"""
+    cpus = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            cpus.extend(range(int(lo), int(hi) + 1))
+        else:
+            cpus.append(int(part))
+    return cpus
+
+
+class StrategyWorkerPool:
+    """
+    Runs strategies in `workers` processes, each owning a fixed shard of symbols.
+
+    The parent keeps its own market state (dashboard, risk, correlation) and
+    forwards every trade to the owning worker through a shared-memory
+    ShmTickRing; nothing is pickled on the tick path. Workers send actionable
+    signals back over a pipe that the parent's event loop watches with
+    add_reader, and the parent runs risk checks and execution as usual;
+    the outcome of pair signals goes back down the same pipe.
+    Worker i is pinned to cpus[i % len(cpus)] when `cpus` is given. Workers
+    build Config.STRATEGIES unless a picklable `strategy_factory` is given.
+    """
+
+    def __init__(self, symbols: List[str], workers: int = 2, cpus: Optional[List[int]] = None,
+                 ring_size: int = 65536, strategy_factory: Optional[Callable[[], list]] = None):
+        self.symbols = list(symbols)
+        self.index: Dict[str, int] = {s: i for i, s in enumerate(self.symbols)}
+        self.workers = max(1, min(workers, len(self.symbols)))
+        self.cpus = cpus or []
+        self.ring_size = ring_size
+        self.strategy_factory = strategy_factory
+
+        # Round-robin keeps shards balanced as symbols are added
+        self.shards: List[List[str]] = [self.symbols[i::self.workers] for i in range(self.workers)]
+        self.shard_of: Dict[str, int] = {s: i for i, shard in enumerate(self.shards) for s in shard}
+
+        self._ctx = mp.get_context("spawn")  # The parent has live threads and an event loop; don't fork them
+        self.rings: List[ShmTickRing] = []
+        self.processes = []
+        self._conns = []
+        self._on_signal = None
+        self.signals = 0
+
+    def start(self, on_signal: Callable, snapshot_path: Optional[str] = None):
+        """
+        Spawn workers; `on_signal(strategy_name, symbol, signal, recv_ns)` runs on the calling event loop.
+        Workers warm their shard from `snapshot_path` when given.
+        """
+        loop = asyncio.get_running_loop()
+        self._on_signal = on_signal
+        for i, shard in enumerate(self.shards):
+            ring = ShmTickRing(self.ring_size, wakeup=self._ctx.Event())
+            reader, writer = self._ctx.Pipe()  # Signals up, pair positions down
+            cpus = [self.cpus[i % len(self.cpus)]] if self.cpus else None
+            proc = self._ctx.Process(
+                target=_worker_main,
+                args=(i, self.symbols, shard, ring.spec(), writer, self.strategy_factory, cpus,
+                      str(snapshot_path) if snapshot_path else None),
+                name=f"strategy-worker-{i}",
+                daemon=True
+            )
+            proc.start()
+            writer.close()
+            loop.add_reader(reader.fileno(), self._drain, reader)
+            self.rings.append(ring)
+            self.processes.append(proc)
+            self._conns.append(reader)
+        logger.info(f"Started {self.workers} strategy workers for {len(self.symbols)} symbols")
+
+    def publish(self, trade: Trade, recv_ns: Optional[int] = None):
+        i = self.index.get(trade.symbol)
+        if i is None:
+            return
+        self.rings[self.shard_of[trade.symbol]].put(
+            i, trade.price, trade.qty, trade.trade_id, trade.trade_time, recv_ns or 0
+        )
+
+    def send_pair_position(self, strategy_name: str, key: tuple, position: int):
+        """Report the parent's position for a pair to the worker whose strategy traded it."""
+        shard = self.shard_of.get(key[0])
+        if shard is None or shard >= len(self._conns):
+            return
+        try:
+            self._conns[shard].send((strategy_name, key, position))
+        except OSError as e:
+            logger.error(f"Cannot report pair position to strategy worker {shard}: {e}")
+
+    def _drain(self, conn):
+        try:
+            while conn.poll():
+                strategy_name, symbol, signal, recv_ns = conn.recv()
+                self.signals += 1
+                asyncio.ensure_future(self._on_signal(strategy_name, symbol, signal, recv_ns))
+        except (EOFError, OSError):
+            asyncio.get_running_loop().remove_reader(conn.fileno())
+            logger.error("Strategy worker exited unexpectedly")
+
+    async def stop(self):
+        loop = asyncio.get_running_loop()
+        for conn in self._conns:
+            loop.remove_reader(conn.fileno())
+        for ring in self.rings:
+            ring.stop()
+        for proc in self.processes:
+            await asyncio.to_thread(proc.join, 5)
+            if proc.is_alive():
+                proc.terminate()
+        for conn in self._conns:
+            conn.close()
+        for ring in self.rings:
+            ring.close()
+        self.rings, self.processes, self._conns = [], [], []
+
+    def metrics(self) -> Dict:
+        return {
+            "workers": self.workers,
+            "signals": self.signals,
+            "shards": [
+                {"symbols": len(shard), "alive": proc.is_alive(), "cpu": self.cpus[i % len(self.cpus)] if self.cpus else None, **ring.metrics()}
+                for i, (shard, proc, ring) in enumerate(zip(self.shards, self.processes, self.rings))
+            ]
+        }
@@ -1,6 +1,7 @@
 import sys
+import time
 from loguru import logger
-from pathlib import Path
+from typing import Dict, Optional, Tuple
 
 # Configure Loguru
 def setup_logging(log_level="INFO"):
@@ -13,19 +14,164 @@ def setup_logging(log_level="INFO"):
         format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
     )
     
-    # File handler (Rotation 100 MB, Retention 10 days)
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
+    # File handler (Rotation 100 MB, Retention 10 days); the file (and logs/) is only created on the first write
     logger.add(
         "logs/trading_system.log", 
         rotation="100 MB", 
         retention="10 days", 
         level="DEBUG",
-        compression="zip"
+        compression="zip",
+        delay=True
     )
 
     logger.info("Logging initialized")
 
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram of nanosecond durations.
+
+    Each power-of-two range is split into 2**sub_bucket_bits linear buckets, so
+    recording is O(1) with ~3% relative precision and fixed memory.
+    """
+
+    def __init__(self, sub_bucket_bits: int = 5, max_magnitude: int = 40):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.sub_buckets = 1 << sub_bucket_bits
+        self.counts = [0] * (self.sub_buckets * (max_magnitude + 2))
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        if value < 2 * self.sub_buckets:
+            return value
+        shift = value.bit_length() - (self.sub_bucket_bits + 1)
+        return self.sub_buckets * (shift + 1) + (value >> shift) - self.sub_buckets
+
+    def _value_at(self, index: int) -> int:
+        # Upper edge of the bucket
+        if index < 2 * self.sub_buckets:
+            return index
+        shift = index // self.sub_buckets - 1
+        mantissa = index % self.sub_buckets + self.sub_buckets
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, value: int):
+        if value < 0:
+            value = 0
+        index = min(self._index(value), len(self.counts) - 1)
+        self.counts[index] += 1
+        if self.count == 0 or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += 1
+        self.total += value
+
+    def percentile(self, q: float) -> int:
+        if self.count == 0:
+            return 0
+        target = max(1, int(self.count * q / 100.0 + 0.5))
+        seen = 0
+        for index, c in enumerate(self.counts):
+            seen += c
+            if seen >= target:
+                return min(self._value_at(index), self.max)
+        return self.max
+
+    def summary(self, scale: float = 1e-3) -> Dict[str, float]:
+        """Percentiles in microseconds by default."""
+        return {
+            "count": self.count,
+            "mean": (self.total / self.count) * scale if self.count else 0.0,
+            "min": self.min * scale,
+            "p50": self.percentile(50) * scale,
+            "p90": self.percentile(90) * scale,
+            "p99": self.percentile(99) * scale,
+            "p999": self.percentile(99.9) * scale,
+            "max": self.max * scale
+        }
+
+
+class _Span:
+    __slots__ = ("recorder", "stage", "symbol", "start")
+
+    def __init__(self, recorder, stage, symbol):
+        self.recorder = recorder
+        self.stage = stage
+        self.symbol = symbol
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.recorder.record(self.stage, self.symbol, time.perf_counter_ns() - self.start)
+        return False
+
+
+class LatencyRecorder:
+    """
+    Per-stage / per-symbol latency histograms on the monotonic clock.
+
+    Stages used by the engine: decode, queue, history, strategy:<name>, risk,
+    submit, execution, tick and tick_to_trade. `event_skew` tracks exchange event
+    time to local receive time.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self.negative_skew = 0
+
+    def _hist(self, stage: str, symbol: str) -> LatencyHistogram:
+        key = (stage, symbol)
+        h = self.histograms.get(key)
+        if h is None:
+            h = LatencyHistogram()
+            self.histograms[key] = h
+        return h
+
+    def record(self, stage: str, symbol: Optional[str], duration_ns: int):
+        if not self.enabled:
+            return
+        self._hist(stage, "*").record(duration_ns)
+        if symbol:
+            self._hist(stage, symbol).record(duration_ns)
+
+    def span(self, stage: str, symbol: Optional[str] = None) -> _Span:
+        return _Span(self, stage, symbol)
+
+    def record_since(self, stage: str, symbol: Optional[str], start_ns: int):
+        self.record(stage, symbol, time.perf_counter_ns() - start_ns)
+
+    def record_skew(self, symbol: str, event_time_ms: int):
+        """Exchange event time (ms, wall clock) to local receive time."""
+        if not self.enabled or not event_time_ms:
+            return
+        skew_ns = int((time.time() * 1000 - event_time_ms) * 1_000_000)
+        if skew_ns < 0:
+            self.negative_skew += 1
+        self.record("event_skew", symbol, skew_ns)
+
+    def reset(self):
+        self.histograms.clear()
+        self.negative_skew = 0
+
+    def snapshot(self) -> Dict:
+        stages: Dict[str, Dict] = {}
+        for (stage, symbol), h in self.histograms.items():
+            entry = stages.setdefault(stage, {"all": None, "symbols": {}})
+            if symbol == "*":
+                entry["all"] = h.summary()
+            else:
+                entry["symbols"][symbol] = h.summary()
+        return {"unit": "us", "stages": stages, "negative_skew": self.negative_skew}
+
+
+latency = LatencyRecorder()
+
 if __name__ == "__main__":
     setup_logging()
     logger.info("Test log message")
@@ -1,91 +1,316 @@
-import pandas as pd
+import itertools
 import time
-from datetime import datetime
-
-def main():
-    print("🚀 Starting Trading Engine...")
-    
-    # Import components
-    from market.data_fetcher import DataFetcher
-    from market.analytics import Analytics
-    from strategies.mean_reversion import MeanReversionStrategy
-    from risk.risk_manager import RiskManager
-    from execution.paper_broker import PaperBroker
-    
-    # Initialize components
-    print("Initializing components...")
-    fetcher = DataFetcher()
-    strategy = MeanReversionStrategy()
-    risk = RiskManager()
-    broker = PaperBroker(initial_balance=10000)
-    
-    # Main trading loop
-    print("\nStarting trading loop...")
-    print("-" * 50)
-    
-    symbols = ['BTCUSDT', 'ETHUSDT']
-    
-    for i in range(5):  # Run 5 iterations for demo
-        print(f"\n📊 Iteration {i+1} - {datetime.now().strftime('%H:%M:%S')}")
-        
-        for symbol in symbols:
-            # Get market data
-            data = fetcher.get_mock_data(symbol, periods=100)
-            latest_price = data['close'].iloc[-1]
-            
-            # Run strategy
-            signal = strategy.analyze(symbol, data['close'])
-            
-            print(f"\n{symbol}:")
-            print(f"  Price: ${latest_price:.2f}")
-            print(f"  Z-score: {signal['zscore']:.2f}")
-            print(f"  Regime: {signal['regime']}")
-            print(f"  Action: {signal['action']}")
-            print(f"  Reason: {signal['reason']}")
-            
-            if signal['action'] != 'hold':
-                # Calculate position size
-                balance = broker.get_balance()['total']
-                position_size = strategy.calculate_position_size(signal, balance)
-                
-                # Risk check
-                risk_check = risk.check_trade(signal, position_size, balance)
-                
-                if risk_check['approved']:
-                    # Execute trade
-                    amount = position_size / latest_price
-                    result = broker.place_order(
-                        symbol, signal['side'], amount, latest_price
-                    )
-                    
-                    if result['success']:
-                        print(f"  ✅ Executed: {signal['side']} {amount:.4f} {symbol}")
-                        # Update risk manager
-                        risk.update_position(symbol, {
-                            'side': signal['side'],
-                            'amount': amount,
-                            'entry_price': latest_price
-                        })
-                    else:
-                        print(f"  ❌ Failed: {result.get('error', 'Unknown error')}")
-                else:
-                    print(f"  ⚠️  Blocked by risk: {risk_check['reason']}")
-        
-        # Show portfolio status
-        print(f"\n📈 Portfolio Status:")
-        print(f"  Cash: ${broker.balance['USDT']:.2f}")
-        print(f"  Positions: {len(broker.positions)}")
-        
-        if broker.positions:
-            for sym, pos in broker.positions.items():
-                print(f"    {sym}: {pos['amount']:.4f} @ ${pos['entry_price']:.2f}")
-        
-        print("-" * 50)
-        time.sleep(2)  # Wait before next iteration
-    
-    print("\n✅ Trading session complete!")
-    print(f"Final balance: ${broker.balance['USDT']:.2f}")
-    print(f"Total trades: {len(broker.orders)}")
-
-if __name__ == "__main__":
-    main()
+from typing import Dict, List, Optional
+from trading_system.core.config import Config
+from trading_system.core.telemetry import logger, latency
+from trading_system.market.decoder import Trade
+from trading_system.market.correlation import CorrelationEngine
+from trading_system.market.price_buffer import PriceHistoryStore
+from trading_system.market.rolling_stats import RollingStatsStore
+from trading_system.market.hurst import HurstStore
+from trading_system.market.bar_aggregator import BarAggregator, parse_intervals
+from trading_system.strategies.registry import build_strategies
+from trading_system.strategies.router import StrategyRouter
+from trading_system.risk.risk_manager import RiskManager
+from trading_system.execution.order_manager import OrderManager
+
+def default_strategies(**resources) -> list:
+    """Strategies listed in Config.STRATEGIES; `resources` are shared engine objects they may need."""
+    return build_strategies(Config.STRATEGIES, **resources)
+
+
+class TradingEngine:
+    """
+    Market state + strategy + risk pipeline shared by the live engine and the backtester.
+
+    Everything is driven by trade timestamps (no wall clock, no sleeps), so
+    replaying recorded ticks exercises exactly the code that runs live.
+    Single-leg signals are netted per symbol by an OrderManager and sent when
+    its window closes. Subclasses decide how orders are sent by overriding
+    `submit_order`, `submit_batch` for independent orders that can share a
+    request, and `submit_orders` for multi-leg groups that must fill together.
+    """
+
+    def __init__(self, symbols: List[str], strategies: Optional[list] = None, risk_manager: Optional[RiskManager] = None):
+        self.symbols = list(symbols)
+        self.log_signals = True
+
+        # Initialize Components
+        self.market_data = {} # Latest data per symbol
+        self.price_history = PriceHistoryStore(self.symbols, capacity=Config.PRICE_HISTORY_SIZE)
+        self.rolling_stats = RollingStatsStore(self.symbols, window=Config.ZSCORE_WINDOW)
+        self.hurst = HurstStore(
+            self.symbols,
+            window=Config.HURST_WINDOW,
+            recompute_ticks=Config.HURST_RECOMPUTE_TICKS,
+            recompute_seconds=Config.HURST_RECOMPUTE_SECONDS
+        )
+
+        self.corr_engine = CorrelationEngine(
+            self.symbols,
+            window_size=Config.CORRELATION_WINDOW,
+            bucket_seconds=Config.CORRELATION_BUCKET_SECONDS
+        )
+        self.risk_manager = risk_manager or RiskManager(self.symbols, corr_engine=self.corr_engine)
+        self.order_manager = OrderManager(
+            window=Config.ORDER_NETTING_MS / 1000.0,
+            min_notional=Config.ORDER_MIN_NOTIONAL_USD,
+            in_flight_ttl=Config.ORDER_IN_FLIGHT_TTL
+        )
+        self.last_ts = 0.0
+        self._order_ids = itertools.count(1)
+
+        self.bars = BarAggregator(
+            self.symbols,
+            intervals=parse_intervals(Config.BAR_INTERVALS),
+            capacity=Config.BAR_HISTORY_SIZE
+        )
+
+        # Strategies
+        self.strategies = strategies if strategies is not None else default_strategies(correlation_engine=self.corr_engine)
+        # Each event only reaches the strategies that declared it
+        self.router = StrategyRouter(self.strategies)
+        for interval in self.router.bar_intervals:
+            self.bars.subscribe(interval, self._on_bar)
+
+        # Open multi-leg positions: pair key -> the entry orders, unwound in reverse on exit
+        self.pair_positions: Dict[tuple, List[dict]] = {}
+        self._groups: Dict[str, tuple] = {}
+        self._group_seq = itertools.count(1)
+
+        # Inputs strategies can declare in `needs`
+        self.inputs = {
+            'stats': lambda symbol: self.rolling_stats[symbol],
+            'hurst': lambda symbol: self.hurst.value(symbol)
+        }
+
+    async def handle_market_data(self, trade: Trade, recv_ns: int = None):
+        """Callback for WebSocket data"""
+        if type(trade) is not Trade:
+            return  # Non-trade events are not consumed here
+
+        tick_start = time.perf_counter_ns()
+        symbol = trade.symbol
+        ts = trade.timestamp or time.time()
+        self.last_ts = ts
+        closed_bars = self.update_market_state(symbol, trade.price, trade.qty, ts)
+        latency.record_since("history", symbol, tick_start)
+
+        # Analyze and potentially execute
+        await self.process_strategies(symbol, ts, recv_ns)
+        if self.order_manager.due(ts):
+            await self.flush_orders(ts)
+        if closed_bars:
+            await self.bars.publish(closed_bars)
+        latency.record_since("tick", symbol, tick_start)
+
+    def update_market_state(self, symbol: str, price: float, qty: float, ts: float, bars: bool = True) -> list:
+        """Feed one trade into every market-state component; returns the bars it closed."""
+        self.price_history[symbol].append(price, qty, ts)
+        self.corr_engine.update_price(symbol, price, qty, ts)
+        self.rolling_stats.update(symbol, price)
+        self.hurst.update(symbol, price, ts)
+        self.risk_manager.mark(symbol, price, ts)
+        if not bars:
+            return []
+        return self.bars.update(symbol, price, qty, ts)
+
+    async def flush_bars(self, now: float):
+        """Close and publish bars whose interval ended by `now` on symbols that have gone quiet."""
+        closed = self.bars.flush(now)
+        if closed:
+            await self.bars.publish(closed)
+
+    def get_current_z(self, symbol):
+        # Helper to get z-score for dashboard, cached by the streaming stats for this tick
+        return self.rolling_stats[symbol].zscore
+
+    async def process_strategies(self, symbol, ts, recv_ns=None):
+        strategies, multi_leg = self.router.on_tick(symbol, ts)
+        if strategies:
+            # Zero-copy NumPy view over the ring buffer, valid until the next tick is appended
+            prices = self.price_history[symbol].prices
+            for strategy in strategies:
+                with latency.span(f"strategy:{strategy.name}", symbol):
+                    extra = {name: self.inputs[name](symbol) for name in strategy.needs}
+                    signal = strategy.analyze(symbol, prices, **extra)
+                await self.handle_signal(strategy.name, symbol, signal, recv_ns)
+
+        for strategy in multi_leg:
+            with latency.span(f"strategy:{strategy.name}", symbol):
+                signals = strategy.analyze_legs(symbol, self.price_history)
+            for signal in signals if isinstance(signals, list) else [signals]:
+                await self.handle_signal(strategy.name, signal.get('symbol', symbol), signal, recv_ns)
+
+    async def _on_bar(self, bar, bars):
+        symbol = bar['symbol']
+        for strategy in self.router.on_bar(symbol, bar['interval']):
+            with latency.span(f"strategy:{strategy.name}", symbol):
+                signal = strategy.analyze_bars(symbol, bars)
+            await self.handle_signal(strategy.name, symbol, signal)
+
+    async def handle_signal(self, strategy_name, symbol, signal, recv_ns=None):
+        if 'legs' in signal:
+            await self.handle_pair_signal(strategy_name, signal, recv_ns)
+        elif signal.get('action') in ['buy', 'sell']:
+            amount = self.risk_manager.calculate_position_size(symbol, signal['price'])
+            self.order_manager.add(strategy_name, symbol, signal['action'], amount, signal['price'], self.last_ts, recv_ns)
+            if self.order_manager.due(self.last_ts):
+                await self.flush_orders(self.last_ts)
+
+    async def flush_orders(self, ts: float):
+        """Turn the netted signals into orders, risk-check them and send them as one batch."""
+        orders = []
+        for order in self.order_manager.drain(self.risk_manager.position, ts):
+            symbol = order['symbol']
+            risk_start = time.perf_counter_ns()
+            reason = self.risk_manager.check_order(symbol, order['side'], order['amount'], order['price'])
+            latency.record_since("risk", symbol, risk_start)
+            if reason:
+                if self.log_signals:
+                    logger.warning(f"Trade rejected: {order['strategy']} {order['side']} {symbol}: {reason}")
+                continue
+
+            order['type'] = 'market'
+            order['client_order_id'] = self.next_client_order_id()
+            self.order_manager.track(order, ts)
+            orders.append(order)
+            if self.log_signals:
+                logger.warning(f"🎯 SIGNAL DETECTED: {order['strategy']} -> {order['side']} {symbol}")
+
+        if len(orders) == 1:
+            with latency.span("submit", orders[0]['symbol']):
+                await self.submit_order(orders[0])
+        elif orders:
+            with latency.span("submit", orders[0]['symbol']):
+                await self.submit_batch(orders)
+
+    async def handle_pair_signal(self, strategy_name, signal, recv_ns=None):
+        """
+        Size and submit both legs of a pair signal as one order group.
+        Leg A gets the usual risk-sized amount; the other legs are scaled to
+        `weight` times leg A's notional. An exit reverses the recorded entry
+        orders, so it closes exactly what was opened.
+        """
+        key = tuple(signal['pair'])
+        action = signal['action']
+        group_id = f"{strategy_name}-{next(self._group_seq)}"
+
+        if action == 'exit_pair':
+            opened = self.pair_positions.pop(key, None)
+            if not opened:
+                self.on_pair_position(strategy_name, key, 0)
+                return
+            prices = {leg['symbol']: leg['price'] for leg in signal['legs']}
+            orders = [
+                self._order(o['symbol'], 'sell' if o['side'] == 'buy' else 'buy', o['amount'],
+                            prices.get(o['symbol'], o['price']), strategy_name, recv_ns, group_id)
+                for o in reversed(opened)
+            ]
+            self._groups[group_id] = (key, opened)
+        else:
+            if key in self.pair_positions:
+                self.on_pair_position(strategy_name, key, self._pair_direction(self.pair_positions[key]))
+                return
+            risk_start = time.perf_counter_ns()
+            first = signal['legs'][0]
+            notional = self.risk_manager.calculate_position_size(first['symbol'], first['price']) * first['price']
+            orders = [
+                self._order(leg['symbol'], leg['side'], notional * leg['weight'] / leg['price'], leg['price'],
+                            strategy_name, recv_ns, group_id)
+                for leg in signal['legs']
+            ]
+            reason = next(filter(None, (self.risk_manager.check_order(o['symbol'], o['side'], o['amount'], o['price'])
+                                        for o in orders)), None)
+            latency.record_since("risk", signal['symbol'], risk_start)
+            if reason:
+                if self.log_signals:
+                    logger.warning(f"Trade rejected: {strategy_name} {action} {'/'.join(key)}: {reason}")
+                self.on_pair_position(strategy_name, key, 0)
+                return
+            self.pair_positions[key] = orders
+            self._groups[group_id] = (key, None)
+
+        if self.log_signals:
+            logger.warning(f"🎯 SIGNAL DETECTED: {strategy_name} -> {action} {'/'.join(key)} ({signal.get('reason', '')})")
+        with latency.span("submit", signal['symbol']):
+            await self.submit_orders(orders)
+
+    @staticmethod
+    def _order(symbol, side, amount, price, strategy_name, recv_ns, group_id) -> dict:
+        return {
+            'symbol': symbol,
+            'side': side,
+            'amount': amount,
+            'price': price,
+            'type': 'market',
+            'strategy': strategy_name,
+            'recv_ns': recv_ns,
+            'group_id': group_id
+        }
+
+    def next_client_order_id(self) -> str:
+        return f"arbx-{int(self.last_ts * 1000)}-{next(self._order_ids)}"
+
+    async def submit_order(self, order):
+        raise NotImplementedError
+
+    async def submit_batch(self, orders):
+        """Submit independent orders together; the default sends them one by one."""
+        for order in orders:
+            await self.submit_order(order)
+
+    async def submit_orders(self, orders):
+        """
+        Submit orders that must fill together; subclasses that can should
+        unwind filled legs when another leg fails and then call
+        `on_group_complete`. The default sends them one by one.
+        """
+        results = [await self.submit_order(order) or {} for order in orders]
+        self.on_group_complete(orders, results)
+
+    def on_group_complete(self, orders, results):
+        """
+        Restore pair bookkeeping when a group did not fill as a whole (its
+        filled legs were unwound), then report the pair's position back to
+        the strategy.
+        """
+        key, opened = self._groups.pop(orders[0]['group_id'], (None, None))
+        if key is None:
+            return
+        if any(r.get('status') == 'failed' for r in results):
+            if opened is None:
+                self.pair_positions.pop(key, None)  # Entry never happened
+            else:
+                self.pair_positions[key] = opened  # Exit failed, still holding the pair
+            logger.error(f"Order group {orders[0]['group_id']} for {'/'.join(key)} failed; filled legs unwound")
+        self.on_pair_position(orders[0]['strategy'], key, self._pair_direction(self.pair_positions.get(key)))
+
+    @staticmethod
+    def _pair_direction(opened: Optional[List[dict]]) -> int:
+        # Leg A is the first entry order: bought for a long spread
+        if not opened:
+            return 0
+        return 1 if opened[0]['side'] == 'buy' else -1
+
+    def on_pair_position(self, strategy_name: str, key: tuple, position: int):
+        """Tell the strategy behind a pair signal what the engine holds for the pair now."""
+        for strategy in self.strategies:
+            if strategy.name == strategy_name:
+                strategy.on_pair_position(key, position)
+
+    def on_order_complete(self, order, result):
+        self.order_manager.settle(order, result)
+        if result.get('status') == 'failed':
+            logger.error(f"Order {order.get('client_order_id')} failed: {result.get('reason')}")
+            return False
+        if result.get('status') == 'unknown':
+            return False  # Lost track of it (shutdown); nothing to book until the exchange says
+
+        filled = result.get('filled')
+        amount = order['amount'] if filled is None else filled
+        if not amount:
+            return False  # Accepted but not (yet) filled; fills arrive later
+        price = result.get('average') or result.get('price') or order.get('price')
+        self.risk_manager.record_fill(order['symbol'], order['side'], amount, price)
+        return True
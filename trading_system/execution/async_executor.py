@@ -0,0 +1,368 @@
+import asyncio
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+from trading_system.core.telemetry import logger, latency
+
+class AsyncOrderExecutor:
+    """
+    Non-blocking front end for a synchronous executor (BinanceExecutor or a mock exchange).
+
+    Orders go into a bounded in-flight queue and are sent from a dedicated thread
+    pool, so exchange round-trips never block the event loop. Each order gets a
+    client order id; on retryable (network) failures the executor looks the order
+    up by that id before resending it with the same id, so retries cannot double
+    fill. Completion callbacks receive (order, result) once the order is final.
+
+    Order groups (`submit_group`) occupy one queue slot and send all legs
+    concurrently; if any leg fails, the legs that filled are unwound with
+    opposite market orders so the group ends up all-or-nothing. Legs only
+    acknowledged (still open) are canceled or looked up first, so the
+    unwind covers what they actually filled. Batches
+    (`submit_batch`) are independent orders that also take one slot and go
+    out through the executor's `execute_orders` (one request per
+    `batch_size` orders) when it has one.
+    """
+
+    WORKING = ('open', 'new', 'partially_filled')  # Order statuses that may still fill
+
+    def __init__(self, executor, max_in_flight: int = 100, workers: int = 4, max_retries: int = 3,
+                 retry_delay: float = 0.5, client_id_prefix: str = "arbx", batch_size: int = 5):
+        self.executor = executor
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.workers = workers
+        self.client_id_prefix = client_id_prefix
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_in_flight)
+        self.callbacks: List[Callable] = []
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="order")
+        self._tasks: List[asyncio.Task] = []
+        self._active: Dict[asyncio.Future, tuple] = {}  # future -> (kind, item) being executed by a worker
+        self._seq = itertools.count()
+        self.running = False
+
+        self.in_flight = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.retries = 0
+        self.groups = 0
+        self.unwinds = 0
+        self.batches = 0
+
+    def on_complete(self, callback: Callable):
+        """Register `callback(order, result)` (sync or async)."""
+        self.callbacks.append(callback)
+
+    def next_client_order_id(self) -> str:
+        return f"{self.client_id_prefix}-{int(time.time() * 1000)}-{next(self._seq)}"
+
+    def start(self):
+        self.running = True
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self, timeout: float = 10.0):
+        """
+        Stop the workers. Queued submissions never reached the exchange and
+        resolve as failed; ones already executing get `timeout` seconds to
+        finish, then are looked up by client order id and resolve with the
+        exchange's state, or status 'unknown' if it can't be had.
+        """
+        self.running = False
+        queued = 0
+        while not self.queue.empty():
+            kind, item, future = self.queue.get_nowait()
+            self.queue.task_done()
+            self.in_flight -= 1 if kind == 'order' else len(item)
+            queued += 1
+            if not future.done():
+                future.set_result(self._failed(kind, item, "shutdown"))
+
+        active = dict(self._active)  # Workers drop these from _active as they are cancelled
+        if active:
+            await asyncio.wait(list(active), timeout=timeout)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        unfinished = [(future, kind, item) for future, (kind, item) in active.items() if not future.done()]
+        for future, kind, item in unfinished:
+            # Still running in a pool thread: it may yet fill, so ask the exchange rather than assume
+            orders = [item] if kind == 'order' else item
+            results = [await self._reconcile(order) for order in orders]
+            future.set_result(results[0] if kind == 'order' else results)
+            for order, result in zip(orders, results):
+                await self._notify(order, result)
+        self._pool.shutdown(wait=False)
+        if queued or unfinished:
+            logger.warning(f"Order executor stopped: {queued} queued submissions dropped, "
+                           f"{len(unfinished)} in progress reconciled")
+
+    async def _reconcile(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        fetch_order = getattr(self.executor, 'fetch_order', None)
+        if fetch_order is not None:
+            try:
+                # Not self._pool: its threads may be the ones stuck on the exchange
+                state = await asyncio.wait_for(
+                    asyncio.to_thread(fetch_order, order['client_order_id'], order['symbol']), 5.0)
+                if state:
+                    return state
+            except Exception as e:
+                logger.error(f"Order lookup at shutdown failed ({order['client_order_id']}): {e!r}")
+        logger.critical(f"Order {order['client_order_id']} state unknown at shutdown; check it on the exchange")
+        return {"status": "unknown", "reason": "shutdown", "clientOrderId": order['client_order_id']}
+
+    @staticmethod
+    def _failed(kind: str, item, reason: str):
+        """Failure result(s) shaped like the submission's future expects."""
+        if kind == 'order':
+            return {"status": "failed", "reason": reason, "clientOrderId": item['client_order_id']}
+        return [{"status": "failed", "reason": reason, "clientOrderId": o['client_order_id']} for o in item]
+
+    def submit(self, order: Dict[str, Any]) -> asyncio.Future:
+        """Queue an order without waiting; the returned future resolves with the final result."""
+        order.setdefault('client_order_id', self.next_client_order_id())
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait(('order', order, future))
+            self.submitted += 1
+            self.in_flight += 1
+        except asyncio.QueueFull:
+            self.rejected += 1
+            logger.warning(f"Order queue full, rejecting {order['client_order_id']}")
+            future.set_result(self._failed('order', order, "queue_full"))
+        return future
+
+    def submit_group(self, orders: List[Dict[str, Any]]) -> asyncio.Future:
+        """Queue orders that must fill together; the future resolves with one result per leg."""
+        for order in orders:
+            order.setdefault('client_order_id', self.next_client_order_id())
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait(('group', orders, future))
+            self.submitted += len(orders)
+            self.in_flight += len(orders)
+            self.groups += 1
+        except asyncio.QueueFull:
+            self.rejected += len(orders)
+            logger.warning(f"Order queue full, rejecting group {orders[0].get('group_id')}")
+            future.set_result(self._failed('group', orders, "queue_full"))
+        return future
+
+    def submit_batch(self, orders: List[Dict[str, Any]]) -> asyncio.Future:
+        """Queue independent orders to send together; the future resolves with one result per order."""
+        for order in orders:
+            order.setdefault('client_order_id', self.next_client_order_id())
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait(('batch', orders, future))
+            self.submitted += len(orders)
+            self.in_flight += len(orders)
+        except asyncio.QueueFull:
+            self.rejected += len(orders)
+            logger.warning(f"Order queue full, rejecting batch of {len(orders)}")
+            future.set_result(self._failed('batch', orders, "queue_full"))
+        return future
+
+    async def _worker(self):
+        while self.running:
+            kind, item, future = await self.queue.get()
+            self._active[future] = (kind, item)
+            try:
+                await self._run(kind, item, future)
+            finally:
+                self._active.pop(future, None)
+
+    async def _run(self, kind: str, item, future: asyncio.Future):
+        if kind != 'order':
+            try:
+                if kind == 'group':
+                    await self._execute_group(item, future)
+                else:
+                    await self._execute_batch(item, future)
+            finally:
+                self.queue.task_done()
+            return
+
+        order = item
+        start_ns = time.perf_counter_ns()
+        try:
+            result = await self._execute(order)
+        except Exception as e:
+            result = {"status": "failed", "reason": str(e)}
+        finally:
+            self.queue.task_done()
+            self.in_flight -= 1
+
+        self._record(order, result, start_ns)
+        if not future.done():
+            future.set_result(result)
+        await self._notify(order, result)
+
+    def _record(self, order: Dict[str, Any], result: Dict[str, Any], start_ns: int):
+        symbol = order.get('symbol')
+        latency.record_since("execution", symbol, start_ns)
+        if order.get('recv_ns'):
+            # Tick received -> order acknowledged
+            latency.record_since("tick_to_trade", symbol, order['recv_ns'])
+
+        if result.get('status') == 'failed':
+            self.failed += 1
+        else:
+            self.completed += 1
+
+    async def _execute_safe(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return await self._execute(order)
+        except Exception as e:
+            return {"status": "failed", "reason": str(e)}
+
+    async def _execute_group(self, orders: List[Dict[str, Any]], future: asyncio.Future) -> List[Dict[str, Any]]:
+        start_ns = time.perf_counter_ns()
+        try:
+            results = await asyncio.gather(*(self._execute_safe(order) for order in orders))
+        finally:
+            self.in_flight -= len(orders)
+        for order, result in zip(orders, results):
+            self._record(order, result, start_ns)
+
+        unwinds = []
+        if any(r.get('status') == 'failed' for r in results):
+            # All-or-nothing: take back whatever did fill. An acknowledged leg may still be filling,
+            # so its real fill comes from canceling or looking it up, not from the ack
+            final = await asyncio.gather(*(self._final_state(order, result) for order, result in zip(orders, results)))
+            for order, result in zip(orders, final):
+                filled = result.get('filled')
+                if result.get('status') in self.WORKING:
+                    logger.critical(f"Leg {order['client_order_id']} of group {order.get('group_id')} still "
+                                    f"{result.get('status')} after cancel/lookup; unwinding only what it reports filled")
+                if result.get('status') == 'failed' or filled == 0:
+                    continue
+                unwind = {
+                    **order,
+                    'side': 'sell' if order['side'] == 'buy' else 'buy',
+                    'amount': order['amount'] if filled is None else filled,
+                    'type': 'market',
+                    'client_order_id': self.next_client_order_id(),
+                    'unwinds': order['client_order_id'],
+                    'recv_ns': None
+                }
+                unwinds.append(unwind)
+            if unwinds:
+                self.unwinds += len(unwinds)
+                logger.warning(f"Order group {orders[0].get('group_id')} partially failed, unwinding {len(unwinds)} legs")
+        unwind_results = await asyncio.gather(*(self._execute_safe(order) for order in unwinds))
+        for order, result in zip(unwinds, unwind_results):
+            if result.get('status') == 'failed':
+                logger.critical(f"Unwind {order['client_order_id']} of {order['unwinds']} failed: {result.get('reason')}")
+
+        if not future.done():
+            future.set_result(results)
+        for order, result in zip(orders + unwinds, list(results) + list(unwind_results)):
+            await self._notify(order, result)
+        return results
+
+    async def _final_state(self, order: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+        """For an order still working (e.g. a market order's NEW ack): cancel the rest and return what filled."""
+        if result.get('status') not in self.WORKING:
+            return result
+        loop = asyncio.get_running_loop()
+        for name in ('cancel_order', 'fetch_order'):
+            # Cancel reports the state it stopped at; an order that already finished is only found by a lookup
+            method = getattr(self.executor, name, None)
+            if method is None:
+                continue
+            try:
+                state = await loop.run_in_executor(self._pool, method, order['client_order_id'], order['symbol'])
+            except Exception as e:
+                logger.error(f"{name} for {order['client_order_id']} failed: {e}")
+                continue
+            if state and state.get('status') not in self.WORKING:
+                return state
+        return result
+
+    async def _execute_batch(self, orders: List[Dict[str, Any]], future: asyncio.Future) -> List[Dict[str, Any]]:
+        start_ns = time.perf_counter_ns()
+        loop = asyncio.get_running_loop()
+        execute_orders = getattr(self.executor, 'execute_orders', None)
+        try:
+            if execute_orders is None:
+                results = await asyncio.gather(*(self._execute_safe(order) for order in orders))
+            else:
+                chunks = [orders[i:i + self.batch_size] for i in range(0, len(orders), self.batch_size)]
+                try:
+                    sent = await asyncio.gather(*(loop.run_in_executor(self._pool, execute_orders, chunk)
+                                                  for chunk in chunks))
+                    results = [result for chunk in sent for result in chunk]
+                except Exception as e:
+                    results = [{"status": "failed", "reason": str(e)} for _ in orders]
+                # Retryable failures fall back to the single-order path, which looks the order up first
+                results = await asyncio.gather(*(self._retry_safe(order, result) for order, result in zip(orders, results)))
+        finally:
+            self.in_flight -= len(orders)
+        self.batches += 1
+
+        for order, result in zip(orders, results):
+            self._record(order, result, start_ns)
+        if not future.done():
+            future.set_result(results)
+        for order, result in zip(orders, results):
+            await self._notify(order, result)
+        return results
+
+    async def _retry_safe(self, order: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return await self._retry(order, result)
+        except Exception as e:
+            return {"status": "failed", "reason": str(e)}
+
+    async def _execute(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(self._pool, self.executor.execute_order, order)
+        return await self._retry(order, result)
+
+    async def _retry(self, order: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        while result.get('status') == 'failed' and result.get('retryable') and attempt < self.max_retries:
+            attempt += 1
+            self.retries += 1
+            await asyncio.sleep(self.retry_delay * attempt)
+
+            # The first attempt may have reached the exchange; never place it twice
+            fetch_order = getattr(self.executor, 'fetch_order', None)
+            if fetch_order is not None:
+                existing = await loop.run_in_executor(self._pool, fetch_order, order['client_order_id'], order['symbol'])
+                if existing:
+                    return existing
+
+            logger.warning(f"Retrying order {order['client_order_id']} ({attempt}/{self.max_retries})")
+            result = await loop.run_in_executor(self._pool, self.executor.execute_order, order)
+        return result
+
+    async def _notify(self, order: Dict[str, Any], result: Dict[str, Any]):
+        for callback in self.callbacks:
+            try:
+                ret = callback(order, result)
+                if asyncio.iscoroutine(ret):
+                    await ret
+            except Exception as e:
+                logger.error(f"Order completion callback failed: {e}")
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queue.qsize(),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "retries": self.retries,
+            "groups": self.groups,
+            "unwinds": self.unwinds,
+            "batches": self.batches
+        }
@@ -1,25 +1,60 @@
-import ccxt
 import time
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from trading_system.core.config import Config
 from trading_system.core.telemetry import logger
+from trading_system.execution.rate_limiter import (RequestScheduler, WEIGHT_ORDER, WEIGHT_BATCH_ORDERS,
+                                                   WEIGHT_QUERY_ORDER, WEIGHT_ACCOUNT)
 
 class BinanceExecutor:
-    def __init__(self):
+    def __init__(self, simulator=None):
         self.mode = Config.TRADING_MODE
+        # PAPER orders go to this SimExchange when given, instead of a fake instant fill
+        self.simulator = simulator
         self.api_key = Config.get_api_key()
         self.secret_key = Config.get_secret_key()
+
+        # Weight/order-count budgets instead of ccxt's per-call sleeps; orders go first
+        self.scheduler = RequestScheduler(
+            weight_limit=Config.RATE_LIMIT_WEIGHT_1M,
+            orders_10s=Config.RATE_LIMIT_ORDERS_10S,
+            orders_1m=Config.RATE_LIMIT_ORDERS_1M,
+            order_reserve=Config.RATE_LIMIT_ORDER_RESERVE
+        )
         
         self.client = None
         if self.mode in [Config.TRADING_MODE.TESTNET, Config.TRADING_MODE.LIVE]:
             self._init_client()
 
+    def _session(self):
+        """Keep-alive connection pool sized for the order workers; every response syncs the scheduler."""
+        import requests
+        from requests.adapters import HTTPAdapter
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=Config.HTTP_POOL_SIZE, pool_maxsize=Config.HTTP_POOL_SIZE)
+        session.mount("https://", adapter)
+        session.hooks['response'].append(self._on_response)
+        return session
+
+    def _on_response(self, response, *args, **kwargs):
+        self.scheduler.update(response.headers)
+        if response.status_code in (418, 429):
+            retry_after = float(response.headers.get('Retry-After', 1))
+            logger.warning(f"Binance rate limit hit ({response.status_code}), backing off {retry_after:.0f}s")
+            self.scheduler.backoff(retry_after)
+
+    def _call(self, fn, *args, weight: int = 1, orders: int = 0, **kwargs):
+        self.scheduler.acquire(weight, orders)
+        return fn(*args, **kwargs)
+
     def _init_client(self):
+        # ccxt is large; PAPER mode never loads it
+        import ccxt
         try:
             self.client = ccxt.binance({
                 'apiKey': self.api_key,
                 'secret': self.secret_key,
-                'enableRateLimit': True,
+                'enableRateLimit': False,  # Budgeted by self.scheduler
+                'session': self._session(),
                 'options': {
                     'defaultType': 'future'  # Assuming Futures trading for hedging
                 }
@@ -35,42 +70,147 @@ class BinanceExecutor:
         """
         Execute order on Binance.
         Order dict expected: {'symbol': 'BTC/USDT', 'side': 'buy', 'amount': 0.001, 'type': 'market'}
+        Optional 'client_order_id' is sent as the exchange client order id so retries are idempotent.
         """
+        client_order_id = order.get('client_order_id')
+
         if self.mode == Config.TRADING_MODE.PAPER:
+            if self.simulator is not None:
+                return self.simulator.execute_order(order)
             logger.info(f"PAPER EXECUTION: {order}")
-            return {"status": "filled", "id": f"paper_{int(time.time())}", "info": order}
+            return {
+                "status": "filled",
+                "id": f"paper_{int(time.time())}",
+                "clientOrderId": client_order_id,
+                "average": order.get('price'),
+                "filled": order.get('amount'),
+                "info": order
+            }
 
         if not self.client:
             logger.error("Client not initialized for Live/Testnet execution")
             return {"status": "failed", "reason": "client_not_ready"}
 
+        import ccxt  # Already loaded by _init_client
         try:
             symbol = order['symbol'].replace("USDT", "/USDT") # CCXT format
             side = order['side']
             amount = order.get('amount')
             order_type = order.get('type', 'market')
             
+            params = {'clientOrderId': client_order_id} if client_order_id else {}
+            
             logger.info(f"Sending Order to Binance: {side} {amount} {symbol} ({order_type})")
             
             if order_type == 'market':
-                response = self.client.create_market_order(symbol, side, amount)
+                response = self._call(self.client.create_market_order, symbol, side, amount, params=params,
+                                      weight=WEIGHT_ORDER, orders=1)
             else:
                 price = order.get('price')
-                response = self.client.create_limit_order(symbol, side, amount, price)
+                response = self._call(self.client.create_limit_order, symbol, side, amount, price, params=params,
+                                      weight=WEIGHT_ORDER, orders=1)
+            self.scheduler.invalidate('balance')
                 
             logger.success(f"Order Executed: {response['id']}")
             return response
             
         except Exception as e:
             logger.error(f"Order Execution Failed: {e}")
-            return {"status": "failed", "reason": str(e)}
+            # Network errors leave the order state unknown; the caller may look it up and retry
+            return {"status": "failed", "reason": str(e), "retryable": isinstance(e, ccxt.NetworkError)}
+
+    def execute_orders(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Place several orders in one batchOrders request (futures, at most 5 per call).
+        Returns one result per order, in order; an order the exchange rejected comes
+        back failed without affecting the others.
+        """
+        if self.mode == Config.TRADING_MODE.PAPER or len(orders) == 1:
+            return [self.execute_order(order) for order in orders]
+        if not self.client:
+            logger.error("Client not initialized for Live/Testnet execution")
+            return [{"status": "failed", "reason": "client_not_ready"} for _ in orders]
+
+        batch = []
+        for order in orders:
+            request = {
+                'symbol': order['symbol'].replace("USDT", "/USDT"),
+                'type': order.get('type', 'market'),
+                'side': order['side'],
+                'amount': order['amount'],
+                'params': {'clientOrderId': order['client_order_id']} if order.get('client_order_id') else {}
+            }
+            if request['type'] != 'market':
+                request['price'] = order.get('price')
+            batch.append(request)
+
+        import ccxt
+        try:
+            logger.info(f"Sending batch of {len(orders)} orders to Binance")
+            responses = self._call(self.client.create_orders, batch, weight=WEIGHT_BATCH_ORDERS, orders=len(batch))
+            self.scheduler.invalidate('balance')
+        except Exception as e:
+            logger.error(f"Batch Order Execution Failed: {e}")
+            return [{"status": "failed", "reason": str(e), "retryable": isinstance(e, ccxt.NetworkError),
+                     "clientOrderId": order.get('client_order_id')} for order in orders]
+
+        results = []
+        for order, response in zip(orders, responses):
+            if response.get('id') is None:
+                # Per-order error entry ({"code": ..., "msg": ...})
+                reason = (response.get('info') or {}).get('msg', 'rejected')
+                logger.error(f"Order {order.get('client_order_id')} rejected in batch: {reason}")
+                results.append({"status": "failed", "reason": reason, "clientOrderId": order.get('client_order_id')})
+            else:
+                results.append(response)
+        return results
+
+    def fetch_order(self, client_order_id: str, symbol: str) -> Optional[Dict[str, Any]]:
+        """Look up an order by client order id, None if the exchange doesn't know it."""
+        if self.mode == Config.TRADING_MODE.PAPER and self.simulator is not None:
+            return self.simulator.fetch_order(client_order_id, symbol)
+        if self.mode == Config.TRADING_MODE.PAPER or not self.client:
+            return None
+        import ccxt
+        try:
+            return self._call(self.client.fetch_order, None, symbol.replace("USDT", "/USDT"),
+                              params={'origClientOrderId': client_order_id}, weight=WEIGHT_QUERY_ORDER)
+        except ccxt.OrderNotFound:
+            return None
+        except Exception as e:
+            logger.error(f"Order lookup failed ({client_order_id}): {e}")
+            return None
+
+    def cancel_order(self, client_order_id: str, symbol: str) -> Optional[Dict[str, Any]]:
+        """Cancel an order by client order id; its state when canceled, None if unknown or already final."""
+        if self.mode == Config.TRADING_MODE.PAPER and self.simulator is not None:
+            return self.simulator.cancel_order(client_order_id, symbol)
+        if self.mode == Config.TRADING_MODE.PAPER or not self.client:
+            return None
+        import ccxt
+        try:
+            return self._call(self.client.cancel_order, None, symbol.replace("USDT", "/USDT"),
+                              params={'origClientOrderId': client_order_id}, weight=WEIGHT_ORDER)
+        except ccxt.OrderNotFound:
+            return None  # Filled (or never placed); fetch_order tells which
+        except Exception as e:
+            logger.error(f"Order cancel failed ({client_order_id}): {e}")
+            return None
+
+    def fetch_balance(self, ttl: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Account balance; concurrent callers share one request and the result is
+        reused for `ttl` seconds (Config.BALANCE_CACHE_TTL). Orders invalidate it.
+        """
+        ttl = Config.BALANCE_CACHE_TTL if ttl is None else ttl
+        return self.scheduler.shared('balance', lambda: self._call(self.client.fetch_balance, weight=WEIGHT_ACCOUNT), ttl)
 
     def get_positions(self):
         if self.mode == Config.TRADING_MODE.PAPER:
-            return []
+            return self.simulator.get_positions() if self.simulator is not None else []
         try:
             # Fetch futures positions
-            balance = self.client.fetch_balance()
+            balance = self.fetch_balance()
             positions = [p for p in balance['info']['positions'] if float(p['positionAmt']) != 0]
             return positions
         except Exception as e:
@@ -0,0 +1,448 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from trading_system.core.telemetry import logger
+
+class LatencyModel:
+    """Order -> matching engine delay: fixed network + exchange processing + exponential jitter."""
+
+    def __init__(self, network_ms: float = 20.0, exchange_ms: float = 5.0, jitter_ms: float = 5.0,
+                 seed: Optional[int] = None):
+        self.network_ms = network_ms
+        self.exchange_ms = exchange_ms
+        self.jitter_ms = jitter_ms
+        self._rng = random.Random(seed)
+
+    def sample(self) -> float:
+        """One-way delay in seconds."""
+        jitter = self._rng.expovariate(1.0 / self.jitter_ms) if self.jitter_ms > 0 else 0.0
+        return (self.network_ms + self.exchange_ms + jitter) / 1000.0
+
+
+class SimBook:
+    """
+    L2 book for one symbol, array-backed (best level first).
+
+    Until real levels are supplied with `set_levels`, depth is synthesised
+    around the last trade: `levels` levels per side, the touch `spread_bps / 2`
+    from the trade and each level `step_bps` further out, each holding
+    `level_notional` of quote currency. Taken liquidity stays taken until
+    the next market update rebuilds the book.
+    """
+
+    __slots__ = ("levels", "spread_bps", "step_bps", "level_notional", "synthetic", "last",
+                 "bid_px", "bid_qty", "ask_px", "ask_qty", "_dirty", "_offsets")
+
+    def __init__(self, levels: int = 20, spread_bps: float = 1.0, step_bps: float = 1.0, level_notional: float = 50_000.0):
+        self.levels = levels
+        self.spread_bps = spread_bps
+        self.step_bps = step_bps
+        self.level_notional = level_notional
+        self.synthetic = True
+        self.last = 0.0
+        self._offsets = (spread_bps / 2 + step_bps * np.arange(levels)) / 10000.0
+        self.bid_px = self.ask_px = self.bid_qty = self.ask_qty = np.zeros(0)
+        self._dirty = False
+
+    def update(self, price: float):
+        self.last = price
+        if self.synthetic:
+            self._dirty = True
+
+    def set_levels(self, bid_px, bid_qty, ask_px, ask_qty):
+        """Use real depth (e.g. a local order book) instead of the synthetic ladder."""
+        self.synthetic = False
+        self._dirty = False
+        self.bid_px = np.array(bid_px, dtype=np.float64)
+        self.bid_qty = np.array(bid_qty, dtype=np.float64)
+        self.ask_px = np.array(ask_px, dtype=np.float64)
+        self.ask_qty = np.array(ask_qty, dtype=np.float64)
+
+    def _rebuild(self):
+        self.ask_px = self.last * (1.0 + self._offsets)
+        self.bid_px = self.last * (1.0 - self._offsets)
+        self.ask_qty = self.level_notional / self.ask_px
+        self.bid_qty = self.level_notional / self.bid_px
+        self._dirty = False
+
+    def side(self, side: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(prices, remaining qty) that an order of `side` takes from."""
+        if self._dirty:
+            self._rebuild()
+        return (self.ask_px, self.ask_qty) if side == 'buy' else (self.bid_px, self.bid_qty)
+
+    def take(self, side: str, amount: float, limit: Optional[float] = None) -> Tuple[float, float]:
+        """Walk the opposite side up to `amount` (and `limit`); returns (filled, quote cost)."""
+        prices, qtys = self.side(side)
+        filled = cost = 0.0
+        for i in range(len(prices)):
+            px = float(prices[i])
+            if limit is not None and (px > limit if side == 'buy' else px < limit):
+                break
+            avail = float(qtys[i])
+            if avail <= 0:
+                continue
+            q = min(avail, amount - filled)
+            qtys[i] = avail - q
+            filled += q
+            cost += q * px
+            if filled >= amount:
+                break
+        return filled, cost
+
+    @property
+    def mid(self) -> float:
+        if self._dirty or self.synthetic:
+            return self.last
+        if len(self.bid_px) and len(self.ask_px):
+            return (self.bid_px[0] + self.ask_px[0]) / 2
+        return self.last
+
+
+class SimPosition:
+    """Net futures position (one-way mode) with average entry, realized PnL and the last mark."""
+    __slots__ = ("qty", "entry", "realized", "mark")
+
+    def __init__(self, mark: float = 0.0):
+        self.qty = 0.0
+        self.entry = 0.0
+        self.realized = 0.0
+        self.mark = mark
+
+    def apply(self, qty: float, price: float):
+        """Add a signed fill: extends at the average price, reduces (or flips) realizing PnL."""
+        current = self.qty
+        new = current + qty
+        if current == 0.0 or (current > 0) == (qty > 0):
+            self.entry = (self.entry * current + price * qty) / new
+        else:
+            closing = min(abs(qty), abs(current))
+            self.realized += closing * (price - self.entry) * (1.0 if current > 0 else -1.0)
+            if abs(new) < 1e-12:
+                new = 0.0
+                self.entry = 0.0
+            elif (new > 0) != (current > 0):
+                self.entry = price  # Flipped: the remainder opened at this price
+        self.qty = new
+
+    def pnl(self) -> float:
+        return self.realized + self.qty * (self.mark - self.entry)
+
+
+class SimOrder:
+    __slots__ = ("id", "client_id", "symbol", "side", "type", "amount", "price", "tif",
+                 "filled", "cost", "fee", "status", "timestamp", "source")
+
+    def __init__(self, oid, client_id, symbol, side, otype, amount, price, tif, timestamp, source):
+        self.id = oid
+        self.client_id = client_id
+        self.symbol = symbol
+        self.side = side
+        self.type = otype
+        self.amount = amount
+        self.price = price
+        self.tif = tif
+        self.filled = 0.0
+        self.cost = 0.0
+        self.fee = 0.0
+        self.status = 'open'
+        self.timestamp = timestamp
+        self.source = source
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "id": self.id,
+            "clientOrderId": self.client_id,
+            "symbol": self.symbol,
+            "side": self.side,
+            "average": self.cost / self.filled if self.filled else self.price,
+            "filled": self.filled,
+            "remaining": self.amount - self.filled,
+            "fee": self.fee,
+            "timestamp": self.timestamp
+        }
+
+
+class SimExchange:
+    """
+    In-process futures exchange: market and limit orders matched against a
+    simulated L2 book per symbol, maker/taker fees, net long/short positions
+    and a latency model. Implements the executor interface (`execute_order`,
+    `fetch_order`, `get_positions`), so it can stand in for BinanceExecutor
+    behind AsyncOrderExecutor. It is an in-process executor only: there is
+    no REST/WebSocket facade, so the HTTP client and user data stream are not
+    exercised by it.
+
+    Two clocks:
+      clock=None  wall clock (live load tests): `execute_order` sleeps the
+                  sampled latency in the calling thread, then matches.
+      clock=fn    simulated time (backtests): orders reach the book only when
+                  a market update at or after their arrival time is seen, and
+                  `execute_order` returns them 'open'.
+
+    Fills that happen after `execute_order` returns (delayed arrivals,
+    resting limits hit by trades) are reported to `on_fill` listeners as
+    (order, result) with the incremental fill. Resting limit orders fill at
+    their limit price against trades that trade through them, up to the
+    trade's size.
+    """
+
+    def __init__(self, initial_balance: float = 10000.0, maker_fee: float = 0.0002, taker_fee: float = 0.0004,
+                 latency: Optional[LatencyModel] = None, clock: Optional[Callable[[], float]] = None,
+                 max_leverage: float = 10.0, book_levels: int = 20, spread_bps: float = 1.0,
+                 step_bps: float = 1.0, level_notional: float = 50_000.0):
+        self.initial_balance = initial_balance
+        self.balance = initial_balance  # Wallet: deposits - fees (PnL lives in positions)
+        self.maker_fee = maker_fee
+        self.taker_fee = taker_fee
+        self.latency = latency
+        self.clock = clock
+        self.max_leverage = max_leverage
+        self._book_args = (book_levels, spread_bps, step_bps, level_notional)
+
+        self.books: Dict[str, SimBook] = {}
+        self.positions: Dict[str, SimPosition] = {}
+        self.orders: Dict[str, SimOrder] = {}  # client order id -> order
+        self._resting: Dict[str, Tuple[list, list]] = {}  # symbol -> (bid heap, ask heap)
+        self._pending: list = []  # (arrival, seq, order) not yet at the matching engine
+        self._listeners: List[Callable] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+        self.fills = 0
+        self.rejected = 0
+        self.fees_paid = 0.0
+        # Running account totals so the margin check is O(1); equity() recomputes exactly
+        self._gross = 0.0
+        self._pnl = 0.0
+
+    def on_fill(self, callback: Callable):
+        """Register `callback(order, result)` for fills after submission."""
+        self._listeners.append(callback)
+
+    def book(self, symbol: str) -> SimBook:
+        book = self.books.get(symbol)
+        if book is None:
+            book = self.books[symbol] = SimBook(*self._book_args)
+        return book
+
+    def _now(self) -> float:
+        return self.clock() if self.clock else time.time()
+
+    # Market data
+
+    def on_trade(self, symbol: str, price: float, qty: float = 0.0, timestamp: Optional[float] = None):
+        """Advance to `timestamp`: deliver due orders against the old book, then trade through resting limits."""
+        with self._lock:
+            if self._pending:
+                self._release(timestamp if timestamp is not None else self._now())
+            book = self.book(symbol)
+            book.update(price)
+            pos = self.positions.get(symbol)
+            if pos is not None and pos.qty:
+                self._remark(pos, book.mid)
+            if symbol in self._resting:
+                self._cross_resting(symbol, price, qty)
+
+    def set_levels(self, symbol: str, bid_px, bid_qty, ask_px, ask_qty):
+        """Match `symbol` against real depth from now on (see SimBook.set_levels)."""
+        with self._lock:
+            book = self.book(symbol)
+            book.set_levels(bid_px, bid_qty, ask_px, ask_qty)
+            pos = self.positions.get(symbol)
+            if pos is not None and pos.qty:
+                self._remark(pos, book.mid)
+
+    def advance(self, timestamp: float):
+        """Deliver orders whose latency has elapsed by `timestamp`."""
+        with self._lock:
+            self._release(timestamp)
+
+    def _release(self, timestamp: float):
+        while self._pending and self._pending[0][0] <= timestamp:
+            _, _, order = heapq.heappop(self._pending)
+            if order.status == 'open':
+                self._match(order)
+                if order.filled:
+                    self._notify(order, order.filled, order.cost, order.fee)
+
+    # Orders
+
+    def execute_order(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        symbol = order['symbol']
+        side = order['side']
+        amount = float(order['amount'])
+        otype = order.get('type', 'market')
+        price = order.get('price')
+        if amount <= 0 or side not in ('buy', 'sell') or (otype == 'limit' and not price):
+            self.rejected += 1
+            return {"status": "failed", "reason": "Invalid order", "clientOrderId": order.get('client_order_id')}
+
+        client_id = order.get('client_order_id') or f"sim-{next(self._ids)}"
+        sim = SimOrder(f"sim_{next(self._ids)}", client_id, symbol, side, otype, amount, price,
+                       order.get('time_in_force', 'GTC'), self._now(), order)
+
+        delay = self.latency.sample() if self.latency else 0.0
+        if delay and self.clock is None:
+            time.sleep(delay)  # Caller's thread plays the round trip
+            sim.timestamp = self._now()
+
+        with self._lock:
+            reason = self._margin_check(symbol, side, amount)
+            if reason:
+                self.rejected += 1
+                return {"status": "failed", "reason": reason, "clientOrderId": client_id}
+            self.orders[client_id] = sim
+            if delay and self.clock is not None:
+                heapq.heappush(self._pending, (sim.timestamp + delay, next(self._ids), sim))
+            else:
+                self._match(sim)
+            return sim.result()
+
+    def _margin_check(self, symbol: str, side: str, amount: float) -> Optional[str]:
+        book = self.book(symbol)
+        if not book.last:
+            return "No market for symbol"
+        pos = self.positions.get(symbol)
+        current = pos.qty if pos else 0.0
+        new = current + (amount if side == 'buy' else -amount)
+        if abs(new) <= abs(current):
+            return None  # Reducing never needs margin
+        gross = self._gross + (abs(new) - abs(current)) * book.mid
+        if gross > (self.balance + self._pnl) * self.max_leverage:
+            return "Insufficient margin"
+        return None
+
+    def _remark(self, pos: SimPosition, mark: float):
+        self._gross += abs(pos.qty) * (mark - pos.mark)
+        self._pnl += pos.qty * (mark - pos.mark)
+        pos.mark = mark
+
+    def _apply(self, symbol: str, qty: float, price: float):
+        pos = self.positions.get(symbol)
+        if pos is None:
+            pos = self.positions[symbol] = SimPosition(self.books[symbol].mid)
+        self._gross -= abs(pos.qty) * pos.mark
+        self._pnl -= pos.pnl()
+        pos.apply(qty, price)
+        self._gross += abs(pos.qty) * pos.mark
+        self._pnl += pos.pnl()
+
+    def _match(self, order: SimOrder):
+        book = self.books[order.symbol]
+        limit = order.price if order.type == 'limit' else None
+        filled, cost = book.take(order.side, order.amount - order.filled, limit)
+        if filled:
+            self._fill(order, filled, cost, self.taker_fee)
+        if order.filled >= order.amount:
+            order.status = 'filled'
+        elif order.type == 'limit' and order.tif == 'GTC':
+            bids, asks = self._resting.setdefault(order.symbol, ([], []))
+            if order.side == 'buy':
+                heapq.heappush(bids, (-order.price, order.timestamp, order.id, order))
+            else:
+                heapq.heappush(asks, (order.price, order.timestamp, order.id, order))
+            order.status = 'partially_filled' if order.filled else 'open'
+        else:
+            # Market remainder beyond the book, or IOC/FOK limit: cancel the rest
+            order.status = 'partially_filled' if order.filled else 'canceled'
+
+    def _fill(self, order: SimOrder, filled: float, cost: float, fee_rate: float):
+        fee = cost * fee_rate
+        order.filled += filled
+        order.cost += cost
+        order.fee += fee
+        self.balance -= fee
+        self.fees_paid += fee
+        self.fills += 1
+        self._apply(order.symbol, filled if order.side == 'buy' else -filled, cost / filled)
+
+    def _cross_resting(self, symbol: str, price: float, qty: float):
+        bids, asks = self._resting[symbol]
+        remaining = qty if qty > 0 else float('inf')
+        # A trade at `price` fills bids at or above it and asks at or below it
+        for heap, crosses in ((bids, lambda o: o.price >= price), (asks, lambda o: o.price <= price)):
+            while heap and remaining > 0:
+                order = heap[0][3]
+                if order.status not in ('open', 'partially_filled'):
+                    heapq.heappop(heap)
+                    continue
+                if not crosses(order):
+                    break
+                q = min(order.amount - order.filled, remaining)
+                remaining -= q
+                before_fee = order.fee
+                self._fill(order, q, q * order.price, self.maker_fee)
+                if order.filled >= order.amount:
+                    order.status = 'filled'
+                    heapq.heappop(heap)
+                else:
+                    order.status = 'partially_filled'
+                self._notify(order, q, q * order.price, order.fee - before_fee)
+
+    def _notify(self, order: SimOrder, filled: float, cost: float, fee: float):
+        result = order.result()
+        result.update(filled=filled, average=cost / filled, fee=fee)
+        for callback in self._listeners:
+            try:
+                callback(order.source, result)
+            except Exception as e:
+                logger.error(f"Simulated fill callback failed: {e}")
+
+    def cancel_order(self, client_order_id: str, symbol: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            order = self.orders.get(client_order_id)
+            if order is None:
+                return None
+            if order.status in ('open', 'partially_filled'):
+                order.status = 'canceled'  # Lazily dropped from the resting heap
+            return order.result()
+
+    def fetch_order(self, client_order_id: str, symbol: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        order = self.orders.get(client_order_id)
+        return order.result() if order else None
+
+    # Account
+
+    def gross_exposure(self) -> float:
+        return sum(abs(p.qty) * self.books[s].mid for s, p in self.positions.items() if p.qty)
+
+    def equity(self) -> float:
+        return self.balance + sum(p.realized + p.qty * (self.books[s].mid - p.entry) for s, p in self.positions.items())
+
+    def get_balance(self) -> Dict[str, float]:
+        return {'USDT': self.balance, 'total': self.equity()}
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "equity": self.equity(),
+            "balance": self.balance,
+            "fees": self.fees_paid,
+            "realized_pnl": sum(p.realized for p in self.positions.values()),
+            "fills": self.fills,
+            "rejected": self.rejected,
+            "pending": len(self._pending),
+            "resting": sum(o.status in ('open', 'partially_filled') for o in self.orders.values()),
+            "positions": sum(1 for p in self.positions.values() if p.qty)
+        }
+
+    def get_positions(self) -> List[Dict[str, Any]]:
+        """Open positions in the shape of Binance futures `positions`."""
+        out = []
+        for symbol, p in self.positions.items():
+            if not p.qty:
+                continue
+            mark = self.books[symbol].mid
+            out.append({
+                'symbol': symbol,
+                'positionAmt': str(p.qty),
+                'entryPrice': str(p.entry),
+                'markPrice': str(mark),
+                'unRealizedProfit': str(p.qty * (mark - p.entry))
+            })
+        return out
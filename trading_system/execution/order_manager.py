@@ -0,0 +1,159 @@
+import math
+from typing import Callable, Dict, List, Optional, Tuple
+
+class OrderManager:
+    """
+    Nets single-leg signals per symbol over a short window before they become orders.
+
+    Within a window each strategy's latest signal per symbol counts once (a
+    z-score that stays past its threshold for several ticks is one vote, not
+    many), and opposite votes from different strategies cancel. When the
+    window closes the net quantity is checked against what the account
+    already holds or has on the way: quantity in the same direction as the
+    current position plus in-flight orders only tops that exposure up to the
+    net signal size, so repeated entries never stack. Orders that survive
+    are handed back together so they can go out as one batch.
+
+    Time is whatever the caller passes (trade timestamps in backtests, wall
+    clock live); `window=0` flushes every signal straight away. Orders the
+    exchange left working stop counting as in flight after `in_flight_ttl`
+    seconds if no final result arrives for them.
+    """
+
+    FINAL = ('filled', 'closed', 'canceled', 'expired', 'rejected', 'failed')  # Order statuses that end it
+
+    def __init__(self, window: float = 0.05, min_notional: float = 5.0, in_flight_ttl: float = 30.0):
+        self.window = window
+        self.min_notional = min_notional
+        self.in_flight_ttl = in_flight_ttl
+
+        # symbol -> strategy -> (signed qty, price, recv_ns)
+        self.pending: Dict[str, Dict[str, Tuple[float, float, Optional[int]]]] = {}
+        self._deadline = math.inf
+
+        # client order id -> (symbol, signed remaining qty, submit time) for orders not yet final
+        self.in_flight: Dict[str, Tuple[str, float, float]] = {}
+        self.working: Dict[str, float] = {}  # symbol -> signed in-flight qty
+
+        self.signals = 0
+        self.netted = 0
+        self.deduped = 0
+        self.orders = 0
+        self.flushes = 0
+
+    def add(self, strategy: str, symbol: str, side: str, amount: float, price: float,
+            timestamp: float, recv_ns: Optional[int] = None):
+        """Record a sized signal; a strategy's newer signal for the symbol replaces its older one."""
+        self.signals += 1
+        votes = self.pending.setdefault(symbol, {})
+        prev = votes.get(strategy)
+        if prev is not None and prev[2] is not None and (recv_ns is None or prev[2] < recv_ns):
+            recv_ns = prev[2]  # Latency is measured from the first tick that asked for it
+        votes[strategy] = (amount if side == 'buy' else -amount, price, recv_ns)
+        if self._deadline == math.inf:
+            self._deadline = timestamp + self.window
+
+    def due(self, timestamp: float) -> bool:
+        return timestamp >= self._deadline
+
+    def exposure(self, symbol: str, position: float) -> float:
+        """Signed position plus the unfilled part of in-flight orders."""
+        return position + self.working.get(symbol, 0.0)
+
+    def drain(self, position: Callable[[str], float], timestamp: float) -> List[dict]:
+        """
+        Close the window: net each symbol's votes, dedup against `position(symbol)`
+        and in-flight orders, and return the order dicts left to send ('type'
+        and 'client_order_id' are the caller's).
+        """
+        self._expire(timestamp)
+        pending, self.pending = self.pending, {}
+        self._deadline = math.inf
+        self.flushes += 1
+        orders = []
+        for symbol, votes in pending.items():
+            net = sum(v[0] for v in votes.values())
+            price = next(reversed(votes.values()))[1]
+            recv = [v[2] for v in votes.values() if v[2] is not None]
+            if abs(net) * price < self.min_notional:
+                self.netted += len(votes)
+                continue
+
+            held = self.exposure(symbol, position(symbol))
+            qty = net
+            if held * net > 0:
+                # Already exposed this way: only top up to the signal's size
+                qty = math.copysign(max(abs(net) - abs(held), 0.0), net)
+                if abs(qty) * price < self.min_notional:
+                    self.deduped += len(votes)
+                    continue
+            if len(votes) > 1:
+                self.netted += len(votes) - 1
+            orders.append({
+                'symbol': symbol,
+                'side': 'buy' if qty > 0 else 'sell',
+                'amount': abs(qty),
+                'price': price,
+                'strategy': '+'.join(votes),
+                'recv_ns': min(recv) if recv else None
+            })
+        return orders
+
+    def track(self, order: dict, timestamp: float):
+        """Count a submitted order as in flight until `settle` sees it final."""
+        signed = order['amount'] if order['side'] == 'buy' else -order['amount']
+        self.in_flight[order['client_order_id']] = (order['symbol'], signed, timestamp)
+        self._adjust(order['symbol'], signed)
+        self.orders += 1
+
+    def settle(self, order: dict, result: dict):
+        """Update an order's in-flight quantity from an execution result or fill report."""
+        client_id = order.get('client_order_id')
+        entry = self.in_flight.get(client_id)
+        if entry is None:
+            return
+        symbol, signed, submitted = entry
+        status = result.get('status')
+        remaining = result.get('remaining')
+        if result.get('source') == 'stream':
+            # Execution reports come one per fill (`filled` is that fill alone) until a final status
+            if status in self.FINAL:
+                left = 0.0
+            elif remaining is not None:
+                left = math.copysign(float(remaining), signed)
+            else:
+                left = signed - math.copysign(float(result.get('filled') or 0.0), signed)
+        else:
+            # A market order's unfilled remainder is canceled unless it hasn't reached the book yet
+            working = ('open', 'new') if order.get('type', 'market') == 'market' else ('open', 'new', 'partially_filled')
+            left = math.copysign(float(remaining), signed) if status in working and remaining else 0.0
+        if abs(left) > 1e-12:
+            self.in_flight[client_id] = (symbol, left, submitted)
+        else:
+            left = 0.0
+            del self.in_flight[client_id]
+        self._adjust(symbol, left - signed)
+
+    def _expire(self, timestamp: float):
+        cutoff = timestamp - self.in_flight_ttl
+        for client_id in [c for c, (_, _, t) in self.in_flight.items() if t < cutoff]:
+            symbol, signed, _ = self.in_flight.pop(client_id)
+            self._adjust(symbol, -signed)
+
+    def _adjust(self, symbol: str, delta: float):
+        working = self.working.get(symbol, 0.0) + delta
+        if abs(working) < 1e-12:
+            self.working.pop(symbol, None)
+        else:
+            self.working[symbol] = working
+
+    def metrics(self) -> Dict:
+        return {
+            "signals": self.signals,
+            "netted": self.netted,
+            "deduped": self.deduped,
+            "orders": self.orders,
+            "flushes": self.flushes,
+            "in_flight": len(self.in_flight),
+            "pending_symbols": len(self.pending)
+        }
@@ -1,4 +1,6 @@
 import pandas as pd
+import itertools
+from typing import Any, Callable, Dict, Optional
 
 class PaperBroker:
     def __init__(self, initial_balance=100000):
@@ -6,14 +8,14 @@ class PaperBroker:
         self.positions = {}
         self.orders = []
     
-    def place_order(self, symbol, side, amount, price):
+    def place_order(self, symbol, side, amount, price, fee=0.0, timestamp=None):
         cost = amount * price
         
         if side == 'buy':
-            if self.balance['USDT'] < cost:
+            if self.balance['USDT'] < cost + fee:
                 return {'success': False, 'error': 'Insufficient balance'}
             
-            self.balance['USDT'] -= cost
+            self.balance['USDT'] -= cost + fee
             if symbol in self.positions:
                 self.positions[symbol]['amount'] += amount
             else:
@@ -23,7 +25,7 @@ class PaperBroker:
             if symbol not in self.positions or self.positions[symbol]['amount'] < amount:
                 return {'success': False, 'error': 'No position to sell'}
             
-            self.balance['USDT'] += cost
+            self.balance['USDT'] += cost - fee
             self.positions[symbol]['amount'] -= amount
             if self.positions[symbol]['amount'] <= 0:
                 del self.positions[symbol]
@@ -33,7 +35,8 @@ class PaperBroker:
             'side': side,
             'amount': amount,
             'price': price,
-            'timestamp': pd.Timestamp.now()
+            'fee': fee,
+            'timestamp': timestamp if timestamp is not None else pd.Timestamp.now()
         }
         self.orders.append(order)
         
@@ -42,3 +45,60 @@ class PaperBroker:
     def get_balance(self):
         total = self.balance['USDT']
         return {'USDT': self.balance['USDT'], 'total': total}
+
+
+class FixedBpsSlippage:
+    """Fills `bps` basis points through the reference price, against the taker."""
+
+    def __init__(self, bps: float = 1.0):
+        self.bps = bps
+
+    def __call__(self, side: str, price: float, amount: float) -> float:
+        adj = price * self.bps / 10000.0
+        return price + adj if side == 'buy' else price - adj
+
+
+class PercentFee:
+    """Fee as a fraction of notional (Binance spot taker default 0.1%)."""
+
+    def __init__(self, rate: float = 0.001):
+        self.rate = rate
+
+    def __call__(self, side: str, price: float, amount: float) -> float:
+        return price * amount * self.rate
+
+
+class PaperExecutor:
+    """
+    Executor interface (`execute_order`) filled by a PaperBroker, with pluggable
+    slippage and fee models and an injectable clock for simulated time.
+    """
+
+    def __init__(self, broker: PaperBroker, slippage: Optional[Callable] = None, fees: Optional[Callable] = None,
+                 clock: Optional[Callable[[], Any]] = None):
+        self.broker = broker
+        self.slippage = slippage or FixedBpsSlippage(0.0)
+        self.fees = fees or PercentFee(0.0)
+        self.clock = clock
+        self._ids = itertools.count(1)
+
+    def execute_order(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        side = order['side']
+        amount = order['amount']
+        price = self.slippage(side, order['price'], amount)
+        fee = self.fees(side, price, amount)
+        timestamp = self.clock() if self.clock else None
+
+        result = self.broker.place_order(order['symbol'], side, amount, price, fee=fee, timestamp=timestamp)
+        if not result['success']:
+            return {"status": "failed", "reason": result['error'], "clientOrderId": order.get('client_order_id')}
+
+        return {
+            "status": "filled",
+            "id": f"paper_{next(self._ids)}",
+            "clientOrderId": order.get('client_order_id'),
+            "average": price,
+            "filled": amount,
+            "fee": fee,
+            "timestamp": timestamp
+        }
@@ -0,0 +1,214 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+# Request weights (USDⓈ-M futures REST API)
+WEIGHT_ORDER = 1
+WEIGHT_BATCH_ORDERS = 5
+WEIGHT_QUERY_ORDER = 1
+WEIGHT_ACCOUNT = 5
+
+# Spot GET /api/v3/depth weight by `limit` (market data for the local order books)
+DEPTH_WEIGHTS = ((100, 5), (500, 25), (1000, 50), (5000, 250))
+
+
+def depth_weight(limit: int) -> int:
+    for upto, weight in DEPTH_WEIGHTS:
+        if limit <= upto:
+            return weight
+    return DEPTH_WEIGHTS[-1][1]
+
+
+class Budget:
+    """Usage in Binance's fixed windows (aligned to the epoch, e.g. each wall-clock minute)."""
+
+    __slots__ = ("limit", "window", "used", "_slot")
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self.used = 0
+        self._slot = -1
+
+    def _roll(self, now: float):
+        slot = int(now // self.window)
+        if slot != self._slot:
+            self._slot = slot
+            self.used = 0
+
+    def room(self, now: float) -> int:
+        self._roll(now)
+        return self.limit - self.used
+
+    def consume(self, amount: int, now: float):
+        self._roll(now)
+        self.used += amount
+
+    def sync(self, used: int, now: float):
+        """Take the exchange's count; ours may miss other processes on the same key/IP."""
+        self._roll(now)
+        self.used = max(self.used, used)
+
+    def reset_in(self, now: float) -> float:
+        return (int(now // self.window) + 1) * self.window - now
+
+
+class RequestScheduler:
+    """
+    Client-side budgeting for exchange REST calls, shared by every thread that uses the client.
+
+    Tracks request weight per minute and order counts per 10s and per minute,
+    locally as calls are made and from the X-MBX-USED-WEIGHT-* / X-MBX-ORDER-COUNT-*
+    headers the exchange returns. Order placement may use the whole budget;
+    everything else (queries, polling) stops at `1 - order_reserve` of the
+    weight limit and also waits while any order is waiting, so bookkeeping
+    never delays an order. Callers block only when a budget is exhausted,
+    until its window rolls over (or a 429/418 `Retry-After` has passed),
+    instead of pacing every call with sleeps.
+
+    `shared(key, fn, ttl)` coalesces identical reads: concurrent callers wait
+    for the one call already in flight, and its result is reused for `ttl`
+    seconds.
+    """
+
+    def __init__(self, weight_limit: int = 2400, orders_10s: int = 300, orders_1m: int = 1200,
+                 order_reserve: float = 0.2, clock: Callable[[], float] = time.time):
+        self.weight = Budget(weight_limit, 60.0)
+        self.orders_10s = Budget(orders_10s, 10.0)
+        self.orders_1m = Budget(orders_1m, 60.0)
+        self.order_reserve = order_reserve
+        self.clock = clock
+
+        self._cond = threading.Condition()
+        self._orders_waiting = 0
+        self._blocked_until = 0.0
+
+        self._cache: Dict[Any, Tuple[float, Any]] = {}  # key -> (fetched at, result)
+        self._inflight: Dict[Any, threading.Event] = {}
+
+        self.requests = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.coalesced = 0
+        self.cache_hits = 0
+        self.backoffs = 0
+
+    def _wait_for(self, weight: int, orders: int, now: float) -> float:
+        """Seconds until the call fits, 0 if it fits now."""
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        if orders:
+            waits = [b.reset_in(now) for b, n in ((self.orders_10s, orders), (self.orders_1m, orders))
+                     if b.room(now) < n]
+            if self.weight.room(now) < weight:
+                waits.append(self.weight.reset_in(now))
+            return max(waits, default=0.0)
+        headroom = self.weight.limit * self.order_reserve
+        if self._orders_waiting or self.weight.room(now) - weight < headroom:
+            return self.weight.reset_in(now) if not self._orders_waiting else 0.05
+        return 0.0
+
+    def acquire(self, weight: int = 1, orders: int = 0):
+        """Block until a call with this weight (and order count) fits the budgets, then reserve it."""
+        with self._cond:
+            started = None
+            if orders:
+                self._orders_waiting += 1
+            try:
+                while True:
+                    now = self.clock()
+                    delay = self._wait_for(weight, orders, now)
+                    if delay <= 0:
+                        break
+                    if started is None:
+                        started = now
+                        self.waits += 1
+                    self._cond.wait(delay)
+            finally:
+                if orders:
+                    self._orders_waiting -= 1
+                    self._cond.notify_all()
+            self.weight.consume(weight, now)
+            if orders:
+                self.orders_10s.consume(orders, now)
+                self.orders_1m.consume(orders, now)
+            self.requests += 1
+            if started is not None:
+                self.wait_time += now - started
+
+    def update(self, headers: Optional[Mapping[str, str]]):
+        """Sync the budgets with the usage counters in a response's headers."""
+        if not headers:
+            return
+        now = self.clock()
+        with self._cond:
+            for name, value in headers.items():
+                name = name.lower()
+                if name == 'x-mbx-used-weight-1m':
+                    self.weight.sync(int(value), now)
+                elif name == 'x-mbx-order-count-10s':
+                    self.orders_10s.sync(int(value), now)
+                elif name == 'x-mbx-order-count-1m':
+                    self.orders_1m.sync(int(value), now)
+
+    def backoff(self, seconds: float):
+        """Hold every call for `seconds` (429/418 with Retry-After)."""
+        with self._cond:
+            self.backoffs += 1
+            self._blocked_until = max(self._blocked_until, self.clock() + seconds)
+
+    def shared(self, key, fn: Callable[[], Any], ttl: float = 0.0):
+        """Result of `fn()`, shared with concurrent callers of the same key and cached for `ttl` seconds."""
+        with self._cond:
+            cached = self._cache.get(key)
+            if cached is not None and self.clock() - cached[0] < ttl:
+                self.cache_hits += 1
+                return cached[1]
+            event = self._inflight.get(key)
+            leader = event is None
+            if leader:
+                event = self._inflight[key] = threading.Event()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            event.wait()
+            with self._cond:
+                cached = self._cache.get(key)
+            if cached is None:
+                return fn()  # The leader failed; try on our own
+            return cached[1]
+
+        try:
+            result = fn()
+            with self._cond:
+                self._cache[key] = (self.clock(), result)
+            return result
+        except Exception:
+            with self._cond:
+                self._cache.pop(key, None)  # Waiters must not pick up an expired result
+            raise
+        finally:
+            with self._cond:
+                del self._inflight[key]
+            event.set()
+
+    def invalidate(self, key):
+        with self._cond:
+            self._cache.pop(key, None)
+
+    def metrics(self) -> Dict:
+        now = self.clock()
+        with self._cond:
+            return {
+                "weight_used": self.weight.limit - self.weight.room(now),
+                "weight_limit": self.weight.limit,
+                "orders_10s": self.orders_10s.limit - self.orders_10s.room(now),
+                "orders_1m": self.orders_1m.limit - self.orders_1m.room(now),
+                "requests": self.requests,
+                "waits": self.waits,
+                "wait_time_s": round(self.wait_time, 3),
+                "coalesced": self.coalesced,
+                "cache_hits": self.cache_hits,
+                "backoffs": self.backoffs
+            }
@@ -0,0 +1,289 @@
+import asyncio
+import json
+import time
+import websockets
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from trading_system.core.telemetry import logger
+
+# Binance order status -> the statuses the rest of the engine uses
+ORDER_STATUS = {
+    'NEW': 'open',
+    'PARTIALLY_FILLED': 'partially_filled',
+    'FILLED': 'filled',
+    'CANCELED': 'canceled',
+    'EXPIRED': 'expired',
+    'EXPIRED_IN_MATCH': 'expired',
+    'REJECTED': 'failed'
+}
+
+
+class PositionLedger:
+    """
+    In-memory account state built from user-data events (futures).
+
+    ACCOUNT_UPDATE carries absolute position amounts and wallet balances, so
+    applying one is idempotent; a position or balance older than the one held
+    (by exchange time) is ignored, which lets a REST resync and the stream
+    overlap safely. ORDER_TRADE_UPDATE executions become `(order, result)`
+    pairs in the same shape the order executors report, with `filled` the
+    incremental fill, so the engine's fill handling works unchanged.
+    """
+
+    def __init__(self):
+        self.positions: Dict[str, Dict[str, float]] = {}  # symbol -> qty, entry, unrealized, updated
+        self.balances: Dict[str, Dict[str, float]] = {}  # asset -> wallet, cross, updated
+        self._order_listeners: List[Callable] = []
+        self._position_listeners: List[Callable] = []
+        self._balance_listeners: List[Callable] = []
+
+        self.events = 0
+        self.fills = 0
+        self.stale = 0
+
+    def on_order(self, callback: Callable):
+        """Register `callback(order, result)` for every fill and every order that ends unfilled."""
+        self._order_listeners.append(callback)
+
+    def on_position(self, callback: Callable):
+        """Register `callback(symbol, qty, entry)` for position changes."""
+        self._position_listeners.append(callback)
+
+    def on_balance(self, callback: Callable):
+        """Register `callback(asset, wallet_balance)` for balance changes."""
+        self._balance_listeners.append(callback)
+
+    def position(self, symbol: str) -> float:
+        pos = self.positions.get(symbol)
+        return pos['qty'] if pos else 0.0
+
+    def apply(self, event: Dict[str, Any]):
+        """Apply one user-data event."""
+        self.events += 1
+        kind = event.get('e')
+        if kind == 'ACCOUNT_UPDATE':
+            ts = event.get('T', event.get('E', 0)) / 1000.0
+            account = event.get('a', {})
+            for b in account.get('B', ()):
+                self.set_balance(b['a'], float(b['wb']), float(b.get('cw', b['wb'])), ts)
+            for p in account.get('P', ()):
+                self.set_position(p['s'], float(p['pa']), float(p['ep']), float(p.get('up', 0.0)), ts)
+        elif kind == 'ORDER_TRADE_UPDATE':
+            self._order_update(event['o'], event.get('T', event.get('E', 0)) / 1000.0)
+
+    def _order_update(self, o: Dict[str, Any], ts: float):
+        status = ORDER_STATUS.get(o.get('X'), 'open')
+        last = float(o.get('l', 0.0))
+        if o.get('x') == 'TRADE' and last > 0:
+            self.fills += 1
+        elif status in ('open', 'partially_filled'):
+            return  # Acknowledgements and amendments carry nothing to book
+
+        amount = float(o['q'])
+        order = {
+            'symbol': o['s'],
+            'side': o['S'].lower(),
+            'amount': amount,
+            'type': o.get('o', 'MARKET').lower(),
+            'client_order_id': o.get('c')
+        }
+        result = {
+            'status': status,
+            'id': o.get('i'),
+            'clientOrderId': o.get('c'),
+            'filled': last,
+            'average': float(o.get('L', 0.0)) or float(o.get('ap', 0.0)) or None,
+            'remaining': amount - float(o.get('z', 0.0)),
+            'fee': float(o.get('n', 0.0)),
+            'timestamp': ts,
+            'source': 'stream'
+        }
+        for callback in self._order_listeners:
+            try:
+                callback(order, result)
+            except Exception as e:
+                logger.error(f"User stream order listener failed: {e}")
+
+    def set_position(self, symbol: str, qty: float, entry: float, unrealized: float = 0.0, ts: float = 0.0):
+        current = self.positions.get(symbol)
+        if current is not None and ts < current['updated']:
+            self.stale += 1
+            return
+        self.positions[symbol] = {'qty': qty, 'entry': entry, 'unrealized': unrealized, 'updated': ts}
+        if current is not None and current['qty'] == qty and current['entry'] == entry:
+            return
+        for callback in self._position_listeners:
+            try:
+                callback(symbol, qty, entry)
+            except Exception as e:
+                logger.error(f"User stream position listener failed ({symbol}): {e}")
+
+    def set_balance(self, asset: str, wallet: float, cross: float, ts: float = 0.0):
+        current = self.balances.get(asset)
+        if current is not None and ts < current['updated']:
+            self.stale += 1
+            return
+        self.balances[asset] = {'wallet': wallet, 'cross': cross, 'updated': ts}
+        for callback in self._balance_listeners:
+            try:
+                callback(asset, wallet)
+            except Exception as e:
+                logger.error(f"User stream balance listener failed ({asset}): {e}")
+
+    def load(self, positions: List[Dict[str, Any]], assets: List[Dict[str, Any]]):
+        """Resync from a REST account snapshot (fapi /v2/account `positions` and `assets`)."""
+        seen = set()
+        for p in positions:
+            symbol = p['symbol']
+            seen.add(symbol)
+            self.set_position(symbol, float(p['positionAmt']), float(p.get('entryPrice', 0.0)),
+                              float(p.get('unrealizedProfit', 0.0)), float(p.get('updateTime', 0)) / 1000.0)
+        for symbol in [s for s in self.positions if s not in seen]:
+            # Not listed means flat
+            self.set_position(symbol, 0.0, 0.0, 0.0, self.positions[symbol]['updated'])
+        for a in assets:
+            self.set_balance(a['asset'], float(a['walletBalance']), float(a.get('crossWalletBalance', a['walletBalance'])),
+                             float(a.get('updateTime', 0)) / 1000.0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'positions': {s: dict(p) for s, p in self.positions.items() if p['qty']},
+            'balances': {a: dict(b) for a, b in self.balances.items()}
+        }
+
+    def metrics(self) -> Dict:
+        return {
+            "events": self.events,
+            "fills": self.fills,
+            "stale": self.stale,
+            "open_positions": sum(1 for p in self.positions.values() if p['qty'])
+        }
+
+
+AccountSnapshot = Callable[[], Awaitable[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]]
+
+
+class UserDataStream:
+    """
+    Listen-key user-data stream feeding a PositionLedger.
+
+    Each connection gets a fresh listen key (POST /fapi/v1/listenKey), which
+    is kept alive with a PUT every `keepalive_interval` seconds (Binance
+    expires it after 60 minutes). Right after connecting, and so after
+    every reconnect, `resync()` loads a REST account snapshot into the
+    ledger: fills missed while disconnected show up as position changes,
+    and events queued on the socket meanwhile are applied after it (older
+    ones are ignored by the ledger). A `listenKeyExpired` event or failed
+    keepalive forces a reconnect. `rest_url` and `ws_url` can point at a
+    local mock exchange.
+    """
+
+    def __init__(self, api_key: str, ledger: PositionLedger, rest_url: str, ws_url: str,
+                 resync: Optional[AccountSnapshot] = None, keepalive_interval: float = 1800.0,
+                 listen_key_path: str = "/fapi/v1/listenKey"):
+        self.api_key = api_key
+        self.ledger = ledger
+        self.rest_url = rest_url.rstrip("/")
+        self.ws_url = ws_url.rstrip("/")
+        self.resync = resync
+        self.keepalive_interval = keepalive_interval
+        self.listen_key_path = listen_key_path
+
+        self.running = False
+        self.connected = False
+        self.ws = None
+        self.listen_key: Optional[str] = None
+        self._http = None  # httpx.AsyncClient, created on first use
+        self.reconnect_delay = 1
+
+        self.messages = 0
+        self.reconnects = 0
+        self.resyncs = 0
+        self.keepalives = 0
+        self.last_msg_time = time.time()
+
+    async def _request(self, method: str) -> Dict[str, Any]:
+        if self._http is None:
+            import httpx
+            self._http = httpx.AsyncClient(base_url=self.rest_url, headers={'X-MBX-APIKEY': self.api_key}, timeout=10.0)
+        params = {'listenKey': self.listen_key} if method != 'POST' and self.listen_key else None
+        response = await self._http.request(method, self.listen_key_path, params=params)
+        response.raise_for_status()
+        return response.json() if response.content else {}
+
+    async def _keepalive(self):
+        while True:
+            await asyncio.sleep(self.keepalive_interval)
+            try:
+                await self._request('PUT')
+                self.keepalives += 1
+            except Exception as e:
+                logger.warning(f"User stream keepalive failed ({e}), reconnecting with a new listen key")
+                if self.ws is not None:
+                    await self.ws.close()
+                return
+
+    async def run(self):
+        self.running = True
+        while self.running:
+            keepalive = None
+            try:
+                self.listen_key = (await self._request('POST'))['listenKey']
+                async with websockets.connect(f"{self.ws_url}/ws/{self.listen_key}") as ws:
+                    self.ws = ws
+                    self.connected = True
+                    self.reconnect_delay = 1  # Reset backoff
+                    logger.success("Connected to Binance user-data stream")
+                    keepalive = asyncio.create_task(self._keepalive())
+                    if self.resync is not None:
+                        positions, assets = await self.resync()
+                        self.ledger.load(positions, assets)
+                        self.resyncs += 1
+
+                    async for msg in ws:
+                        self.messages += 1
+                        self.last_msg_time = time.time()
+                        try:
+                            event = json.loads(msg)
+                        except ValueError as e:
+                            logger.warning(f"Malformed user-data message skipped: {e}")
+                            continue
+                        if event.get('e') == 'listenKeyExpired':
+                            logger.warning("Listen key expired, reconnecting")
+                            break
+                        self.ledger.apply(event)
+            except Exception as e:
+                logger.error(f"User-data stream error: {e}")
+            finally:
+                self.connected = False
+                self.ws = None
+                if keepalive is not None:
+                    keepalive.cancel()
+
+            if self.running:
+                self.reconnects += 1
+                await asyncio.sleep(self.reconnect_delay)
+                self.reconnect_delay = min(self.reconnect_delay * 2, 60)  # Exponential backoff
+
+    async def stop(self):
+        self.running = False
+        if self.ws is not None:
+            await self.ws.close()
+        if self._http is not None:
+            try:
+                if self.listen_key:
+                    await self._request('DELETE')
+            except Exception as e:
+                logger.debug(f"Closing listen key failed: {e}")
+            await self._http.aclose()
+            self._http = None
+
+    def metrics(self) -> Dict:
+        return {
+            "connected": self.connected,
+            "messages": self.messages,
+            "reconnects": self.reconnects,
+            "resyncs": self.resyncs,
+            "keepalives": self.keepalives,
+            "last_msg_age": time.time() - self.last_msg_time,
+            **self.ledger.metrics()
+        }
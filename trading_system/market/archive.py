@@ -0,0 +1,307 @@
+import json
+import os
+import queue
+import threading
+import time
+import numpy as np
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from trading_system.core.telemetry import logger
+from trading_system.market.decoder import Trade
+from trading_system.market.bar_aggregator import BAR_FIELDS
+
+DAY_MS = 86_400_000
+
+# Column name -> dtype. Each column is its own append-only raw file per segment.
+TRADE_COLUMNS = {"time": np.int64, "price": np.float64, "qty": np.float64, "trade_id": np.int64}
+BAR_COLUMNS = {name: (np.int64 if name == "open_time" else np.float64) for name in BAR_FIELDS}
+
+INDEX_FILE = "index.json"
+
+def _kind(interval: Optional[float] = None) -> str:
+    return "trades" if interval is None else f"bars_{interval:g}s"
+
+
+def _day(ts_ms: int) -> str:
+    return time.strftime("%Y-%m-%d", time.gmtime(ts_ms // DAY_MS * 86400))
+
+
+def _columns(kind: str) -> Dict[str, type]:
+    return TRADE_COLUMNS if kind == "trades" else BAR_COLUMNS
+
+
+def _time_column(kind: str) -> str:
+    return "time" if kind == "trades" else "open_time"
+
+
+class _Segment:
+    """Rows buffered for one (kind, symbol, day) segment until the next flush."""
+    __slots__ = ("path", "columns", "rows", "start", "end", "count")
+
+    def __init__(self, path: Path, columns: Dict[str, type], count: int = 0,
+                 start: Optional[int] = None, end: Optional[int] = None):
+        self.path = path
+        self.columns = columns
+        self.rows: List[tuple] = []
+        self.count = count
+        self.start = start
+        self.end = end
+
+
+class TickRecorder:
+    """
+    Append-only columnar archive of trades and closed bars.
+
+    Layout: {root}/{kind}/{symbol}/{YYYY-MM-DD}/{column}.bin where kind is
+    'trades' or 'bars_{interval}s'. Rows are buffered in memory and appended
+    to the column files every `flush_rows` rows or `flush_seconds` of tick time,
+    and index.json records the time range and row count of every segment.
+    Timestamps are epoch milliseconds (UTC days). The file writes happen on a
+    writer thread, so a flush on the tick path only hands the buffers over;
+    `flush(wait=True)` returns once everything is on disk.
+    """
+
+    def __init__(self, root: Path, flush_rows: int = 1000, flush_seconds: float = 1.0):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.index = load_index(self.root)
+        self._segments: Dict[Tuple[str, str, str], _Segment] = {}
+        self._pending = 0
+        self._last_flush: Optional[float] = None
+        self.rows_written = 0
+        self.flushes = 0
+        self.write_errors = 0
+
+        self._writes: queue.Queue = queue.Queue()  # (segment batches, index) in flush order
+        self._writer = threading.Thread(target=self._write_loop, name="tick-archive", daemon=True)
+        self._writer.start()
+
+    def _segment(self, kind: str, symbol: str, ts_ms: int) -> _Segment:
+        key = (kind, symbol, _day(ts_ms))
+        seg = self._segments.get(key)
+        if seg is None:
+            entry = self.index.get("/".join(key), {})
+            path = self.root.joinpath(*key)
+            seg = _Segment(path, _columns(kind), _truncate_segment(path, _columns(kind)),
+                           entry.get("start"), entry.get("end"))
+            self._segments[key] = seg
+        return seg
+
+    def _add(self, kind: str, symbol: str, ts_ms: int, row: tuple, now: float):
+        seg = self._segment(kind, symbol, ts_ms)
+        seg.rows.append(row)
+        if seg.start is None:
+            seg.start = ts_ms
+        seg.end = ts_ms if seg.end is None else max(seg.end, ts_ms)
+        self._pending += 1
+        if self._last_flush is None:
+            self._last_flush = now
+        if self._pending >= self.flush_rows or now - self._last_flush >= self.flush_seconds:
+            self.flush(now)
+
+    def record_trade(self, trade: Trade):
+        self._add("trades", trade.symbol, trade.trade_time,
+                  (trade.trade_time, trade.price, trade.qty, trade.trade_id), trade.timestamp)
+
+    def record_bar(self, bar: dict, bars=None):
+        """BarAggregator subscriber callback."""
+        open_ms = int(bar['open_time'] * 1000)
+        row = (open_ms,) + tuple(bar[name] for name in BAR_FIELDS[1:])
+        self._add(_kind(bar['interval']), bar['symbol'], open_ms, row, bar['open_time'] + bar['interval'])
+
+    def flush(self, now: Optional[float] = None, wait: bool = False):
+        self._last_flush = now if now is not None else time.time()
+        if self._pending:
+            batch = []
+            for key, seg in list(self._segments.items()):
+                if not seg.rows:
+                    continue
+                batch.append((seg.path, seg.columns, seg.rows))
+                seg.count += len(seg.rows)
+                self.rows_written += len(seg.rows)
+                seg.rows = []
+                self.index["/".join(key)] = {"start": seg.start, "end": seg.end, "rows": seg.count}
+            self._pending = 0
+            self.flushes += 1
+            self._writes.put((batch, dict(self.index)))
+
+            # Keep only today's segments open
+            for key in [k for k, s in self._segments.items() if s.end is not None and s.end < (self._last_flush * 1000 - DAY_MS)]:
+                del self._segments[key]
+        if wait:
+            self._writes.join()
+
+    def _write_loop(self):
+        while True:
+            item = self._writes.get()
+            try:
+                if item is None:
+                    return
+                batch, index = item
+                for path, columns, rows in batch:
+                    path.mkdir(parents=True, exist_ok=True)
+                    for (name, dtype), column in zip(columns.items(), zip(*rows)):
+                        with open(path / f"{name}.bin", "ab") as f:
+                            f.write(np.asarray(column, dtype=dtype).tobytes())
+                self._write_index(index)
+            except Exception as e:
+                self.write_errors += 1
+                logger.error(f"Tick archive write failed: {e}")
+            finally:
+                self._writes.task_done()
+
+    def _write_index(self, index: Dict[str, dict]):
+        tmp = self.root / (INDEX_FILE + ".tmp")
+        tmp.write_text(json.dumps(index))
+        os.replace(tmp, self.root / INDEX_FILE)
+
+    def close(self):
+        self.flush(wait=True)
+        self._writes.put(None)
+        self._writer.join()
+        logger.info(f"Tick archive closed ({self.rows_written} rows written to {self.root})")
+
+    def metrics(self) -> Dict:
+        return {
+            "rows_written": self.rows_written,
+            "pending": self._pending,
+            "flushes": self.flushes,
+            "write_queue": self._writes.qsize(),
+            "write_errors": self.write_errors,
+            "segments": len(self.index)
+        }
+
+
+def load_index(root: Path) -> Dict[str, dict]:
+    path = Path(root) / INDEX_FILE
+    if path.exists():
+        try:
+            return json.loads(path.read_text())
+        except ValueError:
+            logger.warning(f"Corrupt archive index at {path}, rebuilding")
+    return rebuild_index(root)
+
+
+def rebuild_index(root: Path) -> Dict[str, dict]:
+    """Recreate the segment index by scanning the column files."""
+    root = Path(root)
+    index = {}
+    if not root.exists():
+        return index
+    for kind_dir in sorted(p for p in root.iterdir() if p.is_dir()):
+        kind = kind_dir.name
+        for seg_dir in sorted(kind_dir.glob("*/*")):
+            data = _map_segment(seg_dir, _columns(kind))
+            if data is None:
+                continue
+            t = data[_time_column(kind)]
+            if len(t):
+                index[f"{kind}/{seg_dir.parent.name}/{seg_dir.name}"] = {
+                    "start": int(t.min()), "end": int(t.max()), "rows": len(t)
+                }
+    return index
+
+
+def _map_segment(path: Path, columns: Dict[str, type]) -> Optional[Dict[str, np.ndarray]]:
+    # A crash mid-flush can leave columns of different lengths; use the shortest
+    sizes = {}
+    for name, dtype in columns.items():
+        f = path / f"{name}.bin"
+        if not f.exists():
+            return None
+        sizes[name] = f.stat().st_size // np.dtype(dtype).itemsize
+    rows = min(sizes.values())
+    if rows == 0:
+        return {name: np.empty(0, dtype=dtype) for name, dtype in columns.items()}
+    return {name: np.memmap(path / f"{name}.bin", dtype=dtype, mode="r", shape=(rows,))
+            for name, dtype in columns.items()}
+
+
+def _truncate_segment(path: Path, columns: Dict[str, type]) -> int:
+    """Trim a reopened segment's columns to a common length before appending; returns its row count."""
+    if not path.exists():
+        return 0
+    files = {name: path / f"{name}.bin" for name in columns}
+    sizes = {name: f.stat().st_size if f.exists() else 0 for name, f in files.items()}
+    rows = min(sizes[name] // np.dtype(dtype).itemsize for name, dtype in columns.items())
+    for name, dtype in columns.items():
+        size = rows * np.dtype(dtype).itemsize
+        if sizes[name] != size:
+            with open(files[name], "ab") as f:
+                f.truncate(size)
+    return rows
+
+
+class TickArchive:
+    """
+    Reader for a TickRecorder archive.
+
+    Segments are memory-mapped, so slices are zero-copy views into the page
+    cache; only `read` (which spans several days) concatenates into RAM.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.index = load_index(self.root)
+
+    def refresh(self):
+        self.index = load_index(self.root)
+
+    def symbols(self, interval: Optional[float] = None) -> List[str]:
+        prefix = _kind(interval) + "/"
+        return sorted({k.split("/")[1] for k in self.index if k.startswith(prefix)})
+
+    def segments(self, symbol: str, start: Optional[int] = None, end: Optional[int] = None,
+                 interval: Optional[float] = None) -> List[Tuple[Path, dict]]:
+        """Segments overlapping [start, end] (epoch ms), oldest first."""
+        prefix = f"{_kind(interval)}/{symbol}/"
+        out = []
+        for key in sorted(k for k in self.index if k.startswith(prefix)):
+            entry = self.index[key]
+            if start is not None and entry["end"] < start:
+                continue
+            if end is not None and entry["start"] > end:
+                continue
+            out.append((self.root / key, entry))
+        return out
+
+    def iter_segments(self, symbol: str, start: Optional[int] = None, end: Optional[int] = None,
+                      interval: Optional[float] = None) -> Iterator[Dict[str, np.ndarray]]:
+        """Yield {column: memmap view} per day, sliced to [start, end]."""
+        kind = _kind(interval)
+        time_col = _time_column(kind)
+        for path, _ in self.segments(symbol, start, end, interval):
+            data = _map_segment(path, _columns(kind))
+            if data is None:
+                continue
+            t = data[time_col]
+            lo = 0 if start is None else int(np.searchsorted(t, start, side="left"))
+            hi = len(t) if end is None else int(np.searchsorted(t, end, side="right"))
+            if hi > lo:
+                yield {name: col[lo:hi] for name, col in data.items()}
+
+    def read(self, symbol: str, start: Optional[int] = None, end: Optional[int] = None,
+             interval: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """Columns for [start, end]; zero-copy when the range sits inside one day."""
+        parts = list(self.iter_segments(symbol, start, end, interval))
+        if len(parts) == 1:
+            return parts[0]
+        columns = _columns(_kind(interval))
+        if not parts:
+            return {name: np.empty(0, dtype=dtype) for name, dtype in columns.items()}
+        return {name: np.concatenate([p[name] for p in parts]) for name in columns}
+
+    def read_trades(self, symbol: str, start: Optional[int] = None, end: Optional[int] = None) -> Dict[str, np.ndarray]:
+        return self.read(symbol, start, end)
+
+    def read_bars(self, symbol: str, interval: float, start: Optional[int] = None, end: Optional[int] = None) -> Dict[str, np.ndarray]:
+        return self.read(symbol, start, end, interval)
+
+    def trades(self, symbol: str, start: Optional[int] = None, end: Optional[int] = None) -> Iterator[Trade]:
+        """Replay archived trades as Trade tuples (for the backtester)."""
+        for seg in self.iter_segments(symbol, start, end):
+            for t, p, q, tid in zip(seg["time"].tolist(), seg["price"].tolist(),
+                                    seg["qty"].tolist(), seg["trade_id"].tolist()):
+                yield Trade(symbol, p, q, tid, t, t)
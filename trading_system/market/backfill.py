@@ -0,0 +1,133 @@
+import asyncio
+import heapq
+import time
+import numpy as np
+from typing import Dict, Iterable, List, Optional
+from trading_system.core.config import Config, TradingMode
+from trading_system.core.telemetry import logger
+from trading_system.market.decoder import Trade
+
+def ccxt_symbol(symbol: str) -> str:
+    return symbol.replace("USDT", "/USDT")
+
+
+def ccxt_timeframe(interval: float) -> str:
+    seconds = int(interval)
+    for unit, size in (("d", 86400), ("h", 3600), ("m", 60)):
+        if seconds >= size and seconds % size == 0:
+            return f"{seconds // size}{unit}"
+    return f"{seconds}s"
+
+
+def replay(engine, trades: Iterable[Trade]) -> int:
+    """
+    Feed historical trades into the engine's market state (no strategies, no bars).
+    Trades at or before a symbol's newest buffered tick are skipped, so sources can overlap.
+    """
+    last = {s: (buf.timestamps[-1] if len(buf) else 0.0) for s, buf in engine.price_history.buffers.items()}
+    applied = 0
+    for trade in trades:
+        ts = trade.timestamp
+        if ts <= last.get(trade.symbol, 0.0):
+            continue
+        engine.update_market_state(trade.symbol, trade.price, trade.qty, ts, bars=False)
+        last[trade.symbol] = ts
+        applied += 1
+    return applied
+
+
+class RestBackfill:
+    """
+    Bulk-loads recent trades and klines over REST with ccxt's asyncio client.
+
+    Symbols are fetched concurrently; each symbol pages through trades in
+    `batch`-sized requests and pulls every bar interval in parallel. The
+    exchange rate limiter is left on so a large universe queues rather than
+    getting banned.
+    """
+
+    def __init__(self, max_trades: int = 1000, lookback_seconds: float = 300.0, bar_limit: int = 500, batch: int = 1000):
+        self.max_trades = max_trades
+        self.lookback_seconds = lookback_seconds
+        self.bar_limit = bar_limit
+        self.batch = batch
+
+    def _client(self):
+        import ccxt.async_support as ccxt_async
+        client = ccxt_async.binance({'enableRateLimit': True})
+        if Config.TRADING_MODE == TradingMode.TESTNET:
+            client.set_sandbox_mode(True)
+        return client
+
+    async def fetch_trades(self, client, symbol: str, since_ms: int) -> List[Trade]:
+        market = ccxt_symbol(symbol)
+        out: List[Trade] = []
+        while len(out) < self.max_trades:
+            batch = await client.fetch_trades(market, since=since_ms, limit=self.batch)
+            for t in batch:
+                tid = int(t['id']) if t.get('id') is not None else 0
+                out.append(Trade(symbol, float(t['price']), float(t['amount']), tid, t['timestamp'], t['timestamp']))
+            if len(batch) < self.batch:
+                break
+            since_ms = batch[-1]['timestamp'] + 1
+        if len(out) >= self.max_trades:
+            logger.warning(f"Backfill for {symbol} capped at {self.max_trades} trades")
+        return out[:self.max_trades]
+
+    async def fetch_bars(self, client, symbol: str, interval: float) -> Optional[np.ndarray]:
+        """Closed klines as a BarBuffer state array (vwap approximated by typical price, trade count unknown)."""
+        rows = await client.fetch_ohlcv(ccxt_symbol(symbol), ccxt_timeframe(interval), limit=self.bar_limit + 1)
+        now_ms = time.time() * 1000
+        rows = [r for r in rows if r[0] + interval * 1000 <= now_ms]  # Drop the still-open kline
+        if not rows:
+            return None
+        ohlcv = np.asarray(rows, dtype=np.float64).T
+        open_time = ohlcv[0] / 1000
+        vwap = (ohlcv[2] + ohlcv[3] + ohlcv[4]) / 3
+        return np.vstack([open_time, ohlcv[1:6], vwap, np.zeros_like(open_time)])
+
+    async def _symbol(self, client, symbol: str, since_ms: int, intervals: List[float]):
+        results = await asyncio.gather(
+            self.fetch_trades(client, symbol, since_ms),
+            *(self.fetch_bars(client, symbol, i) for i in intervals),
+            return_exceptions=True
+        )
+        trades, bars = results[0], dict(zip(intervals, results[1:]))
+        if isinstance(trades, Exception):
+            logger.warning(f"Trade backfill failed for {symbol}: {trades}")
+            trades = []
+        for interval, result in list(bars.items()):
+            if isinstance(result, Exception):
+                logger.warning(f"{ccxt_timeframe(interval)} kline backfill failed for {symbol}: {result}")
+                bars[interval] = None
+        return trades, bars
+
+    async def run(self, engine, since: Optional[Dict[str, float]] = None) -> int:
+        """
+        Backfill every engine symbol; `since` maps symbol -> epoch seconds already covered.
+        Returns the number of trades applied.
+        """
+        since = since or {}
+        floor = time.time() - self.lookback_seconds
+        started = time.perf_counter()
+
+        client = self._client()
+        try:
+            await client.load_markets()  # Once, rather than racing in every request
+            results = await asyncio.gather(*(
+                self._symbol(client, s, int(max(since.get(s, 0.0), floor) * 1000), engine.bars.intervals)
+                for s in engine.symbols
+            ))
+        finally:
+            await client.close()
+
+        for symbol, (_, bars) in zip(engine.symbols, results):
+            for interval, data in bars.items():
+                if data is not None:
+                    engine.bars.restore_bars(symbol, interval, data)
+
+        merged = heapq.merge(*(trades for trades, _ in results), key=lambda tr: tr.trade_time)
+        applied = replay(engine, merged)
+        logger.info(f"REST backfill applied {applied} trades across {len(engine.symbols)} symbols "
+                    f"in {time.perf_counter() - started:.2f}s")
+        return applied
@@ -0,0 +1,239 @@
+import asyncio
+import math
+import numpy as np
+from typing import Callable, Dict, Iterable, List, Tuple
+from trading_system.core.telemetry import logger
+
+BAR_FIELDS = ("open_time", "open", "high", "low", "close", "volume", "vwap", "trades")
+
+class BarBuffer:
+    """Fixed-capacity columnar store of closed bars; columns are zero-copy views valid until the next append."""
+
+    def __init__(self, capacity: int = 500):
+        self.capacity = capacity
+        self._data = np.zeros((len(BAR_FIELDS), capacity * 2), dtype=np.float64)
+        self._idx = 0
+        self.count = 0
+
+    def append(self, row: Tuple[float, ...]):
+        i = self._idx
+        self._data[:, i] = row
+        self._data[:, i + self.capacity] = row
+        self._idx = (i + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def __len__(self):
+        return self.count
+
+    def state(self) -> np.ndarray:
+        """(fields, n) copy of the closed bars, oldest first."""
+        end = self._idx + self.capacity
+        return self._data[:, end - self.count:end].copy()
+
+    def restore(self, data: np.ndarray):
+        n = min(data.shape[1], self.capacity)
+        rows = data[:, data.shape[1] - n:]
+        self._data[:, :n] = rows
+        self._data[:, self.capacity:self.capacity + n] = rows
+        self._idx = n % self.capacity
+        self.count = n
+
+    def column(self, name: str) -> np.ndarray:
+        end = self._idx + self.capacity
+        return self._data[BAR_FIELDS.index(name), end - self.count:end]
+
+    @property
+    def open_time(self) -> np.ndarray:
+        return self.column("open_time")
+
+    @property
+    def open(self) -> np.ndarray:
+        return self.column("open")
+
+    @property
+    def high(self) -> np.ndarray:
+        return self.column("high")
+
+    @property
+    def low(self) -> np.ndarray:
+        return self.column("low")
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.column("close")
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self.column("volume")
+
+    @property
+    def vwap(self) -> np.ndarray:
+        return self.column("vwap")
+
+    @property
+    def trades(self) -> np.ndarray:
+        return self.column("trades")
+
+
+class _OpenBar:
+    __slots__ = ("bucket", "open", "high", "low", "close", "volume", "notional", "trades")
+
+    def state(self) -> np.ndarray:
+        return np.array([getattr(self, f) for f in self.__slots__], dtype=np.float64)
+
+    @classmethod
+    def from_state(cls, row: np.ndarray) -> "_OpenBar":
+        bar = cls(int(row[0]), float(row[1]))
+        bar.high, bar.low, bar.close, bar.volume, bar.notional = (float(v) for v in row[2:7])
+        bar.trades = int(row[7])
+        return bar
+
+    def __init__(self, bucket: int, price: float):
+        self.bucket = bucket
+        self.open = self.high = self.low = self.close = price
+        self.volume = 0.0
+        self.notional = 0.0
+        self.trades = 0
+
+
+class BarAggregator:
+    """
+    Streams trades into OHLCV + VWAP + trade-count bars at several intervals.
+
+    A bar closes when the first trade of a later interval arrives for that
+    symbol, or on `flush` once the interval has passed on the clock (so quiet
+    symbols still close bars). Closed bars are appended to per-symbol
+    BarBuffers and published to subscribers of that interval, so strategies
+    can run on bar close instead of on every trade. Subscribing to an
+    interval that is not aggregated adds it.
+    """
+
+    def __init__(self, symbols: Iterable[str], intervals: Iterable[float] = (1, 60, 900), capacity: int = 500):
+        self.intervals = sorted(set(intervals))
+        self.capacity = capacity
+        self.buffers: Dict[Tuple[str, float], BarBuffer] = {}
+        self._open: Dict[Tuple[str, float], _OpenBar] = {}
+        self._closed: Dict[Tuple[str, float], int] = {}  # Last closed bucket, so late trades can't reopen it
+        self.subscribers: Dict[float, List[Callable]] = {i: [] for i in self.intervals}
+        for s in symbols:
+            for i in self.intervals:
+                self.buffers[(s, i)] = BarBuffer(capacity)
+
+    def subscribe(self, interval: float, callback: Callable):
+        """Register `callback(bar, bars)` (sync or async) for bar closes at `interval` seconds."""
+        if interval not in self.subscribers:
+            logger.warning(f"Bar interval {interval}s not in BAR_INTERVALS {self.intervals}, aggregating it too")
+            self.intervals = sorted(self.intervals + [interval])
+            self.subscribers[interval] = []
+        self.subscribers[interval].append(callback)
+
+    def get_bars(self, symbol: str, interval: float) -> BarBuffer:
+        key = (symbol, interval)
+        buf = self.buffers.get(key)
+        if buf is None:
+            buf = BarBuffer(self.capacity)
+            self.buffers[key] = buf
+        return buf
+
+    def open_state(self) -> Dict[Tuple[str, float], np.ndarray]:
+        """Bars still being built, for snapshots."""
+        return {key: bar.state() for key, bar in self._open.items()}
+
+    def restore_open(self, symbol: str, interval: float, row: np.ndarray):
+        self._open[(symbol, interval)] = _OpenBar.from_state(row)
+
+    def restore_bars(self, symbol: str, interval: float, data: np.ndarray):
+        """Replace closed bars (e.g. from REST klines); an open bar they already cover is discarded."""
+        self.get_bars(symbol, interval).restore(data)
+        if not data.shape[1]:
+            return
+        last = int(data[0, -1] // interval)
+        self._closed[(symbol, interval)] = max(self._closed.get((symbol, interval), last), last)
+        bar = self._open.get((symbol, interval))
+        if bar is not None and bar.bucket <= last:
+            del self._open[(symbol, interval)]
+
+    def update(self, symbol: str, price: float, quantity: float, timestamp: float) -> List[dict]:
+        """Add a trade; returns the bars it closed."""
+        closed = []
+        for interval in self.intervals:
+            key = (symbol, interval)
+            bucket = int(timestamp // interval)
+            bar = self._open.get(key)
+
+            if bar is not None and bucket > bar.bucket:
+                closed.append(self._close(symbol, interval, bar))
+                bar = None
+
+            if bar is None:
+                if bucket <= self._closed.get(key, -1):
+                    continue  # Late trade for a bar already closed by `flush`
+                bar = _OpenBar(bucket, price)
+                self._open[key] = bar
+            elif bucket < bar.bucket:
+                # Late trade for an already closed bar
+                continue
+
+            if price > bar.high:
+                bar.high = price
+            elif price < bar.low:
+                bar.low = price
+            bar.close = price
+            bar.volume += quantity
+            bar.notional += price * quantity
+            bar.trades += 1
+        return closed
+
+    def flush(self, now: float) -> List[dict]:
+        """Close every open bar whose interval has elapsed by `now` (for symbols that went quiet)."""
+        closed = []
+        for (symbol, interval), bar in list(self._open.items()):
+            if int(now // interval) > bar.bucket:
+                closed.append(self._close(symbol, interval, bar))
+                del self._open[(symbol, interval)]
+        return closed
+
+    def _close(self, symbol: str, interval: float, bar: _OpenBar) -> dict:
+        vwap = bar.notional / bar.volume if bar.volume > 0 else bar.close
+        open_time = bar.bucket * interval
+        self._closed[(symbol, interval)] = bar.bucket
+        self.get_bars(symbol, interval).append(
+            (open_time, bar.open, bar.high, bar.low, bar.close, bar.volume, vwap, bar.trades)
+        )
+        return {
+            'symbol': symbol,
+            'interval': interval,
+            'open_time': open_time,
+            'open': bar.open,
+            'high': bar.high,
+            'low': bar.low,
+            'close': bar.close,
+            'volume': bar.volume,
+            'vwap': vwap,
+            'trades': bar.trades
+        }
+
+    async def publish(self, closed: List[dict]):
+        for bar in closed:
+            bars = self.get_bars(bar['symbol'], bar['interval'])
+            for callback in self.subscribers.get(bar['interval'], []):
+                result = callback(bar, bars)
+                if asyncio.iscoroutine(result):
+                    await result
+
+
+def parse_intervals(spec: str) -> List[float]:
+    """Parse '1s,1m,15m' / '1,60,900' into seconds."""
+    units = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+    out = []
+    for token in spec.split(","):
+        token = token.strip().lower()
+        if not token:
+            continue
+        if token[-1] in units:
+            value = float(token[:-1]) * units[token[-1]]
+        else:
+            value = float(token)
+        out.append(int(value) if math.isclose(value, round(value)) else value)
+    return out
@@ -1,65 +1,201 @@
 import asyncio
-import json
 import time
 import websockets
-import logging
 from typing import List, Callable, Dict, Optional
 from trading_system.core.config import Config
-from trading_system.core.telemetry import logger
+from trading_system.core.telemetry import logger, latency
+from trading_system.market.tick_queue import SymbolQueues
+from trading_system.market.decoder import MessageDecoder, Trade
 
-class BinanceWebSocketManager:
-    def __init__(self, symbols: List[str], callback: Callable[[Dict], None]):
-        self.symbols = [s.lower() for s in symbols]
-        self.callback = callback
+class StreamShard:
+    """One combined-stream connection carrying a subset of streams, with its own backoff."""
+
+    def __init__(self, name: str, base_url: str, streams: List[str], on_message: Callable[[str, str], None]):
+        self.name = name
+        self.streams = streams
+        self.url = f"{base_url}/stream?streams={'/'.join(streams)}"
+        self.on_message = on_message
         self.running = False
         self.ws = None
-        self.base_url = "wss://stream.binance.com:9443/ws"
-        if Config.TRADING_MODE.value == "TESTNET":
-            self.base_url = "wss://testnet.binance.vision/ws"
-        
+        self.connected = False
         self.reconnect_delay = 5
+        self.reconnects = 0
+        self.messages = 0
+        self.malformed = 0
         self.last_msg_time = time.time()
 
-    async def start(self):
+    async def run(self):
         self.running = True
         while self.running:
             try:
-                streams = "/".join([f"{s}@trade" for s in self.symbols])
-                url = f"{self.base_url}/{streams}"
-                logger.info(f"Connecting to Binance WebSocket: {url}...")
-                
-                async with websockets.connect(url) as ws:
+                logger.info(f"[{self.name}] Connecting to Binance WebSocket ({len(self.streams)} streams)...")
+
+                async with websockets.connect(self.url) as ws:
                     self.ws = ws
-                    logger.success("Connected to Binance WebSocket")
+                    self.connected = True
+                    logger.success(f"[{self.name}] Connected to Binance WebSocket")
                     self.reconnect_delay = 5  # Reset backoff
-                    
+
                     while self.running:
                         try:
                             msg = await asyncio.wait_for(ws.recv(), timeout=20.0)
-                            data = json.loads(msg)
                             self.last_msg_time = time.time()
-                            await self.callback(data)
+                            self.messages += 1
+                            self.on_message(self.name, msg)
+                        except (ValueError, KeyError, TypeError, AttributeError) as e:
+                            # Bad JSON or a payload missing fields: drop the frame, keep the connection
+                            self.malformed += 1
+                            logger.warning(f"[{self.name}] Malformed message skipped: {e!r}")
                         except asyncio.TimeoutError:
-                            logger.warning("WebSocket Keepalive Timeout. Reconnecting...")
+                            logger.warning(f"[{self.name}] WebSocket Keepalive Timeout. Reconnecting...")
                             break
                         except websockets.exceptions.ConnectionClosed:
-                            logger.warning("WebSocket Connection Closed. Reconnecting...")
+                            if self.running:  # Not our own stop()
+                                logger.warning(f"[{self.name}] WebSocket Connection Closed. Reconnecting...")
                             break
             except Exception as e:
-                logger.error(f"WebSocket Error: {e}")
+                logger.error(f"[{self.name}] WebSocket Error: {e}")
+            finally:
+                self.connected = False
+                self.ws = None
+
+            if self.running:
+                self.reconnects += 1
                 await asyncio.sleep(self.reconnect_delay)
                 self.reconnect_delay = min(self.reconnect_delay * 2, 60) # Exponential backoff
 
     async def stop(self):
-        logger.info("Stopping WebSocket Manager...")
         self.running = False
         if self.ws:
             await self.ws.close()
 
+    def metrics(self) -> Dict:
+        return {
+            "connected": self.connected,
+            "streams": len(self.streams),
+            "messages": self.messages,
+            "malformed": self.malformed,
+            "reconnects": self.reconnects,
+            "last_msg_age": time.time() - self.last_msg_time
+        }
+
+
+class BinanceWebSocketManager:
+    """
+    Producer/consumer market data feed over Binance combined streams.
+
+    Streams are sharded across connections of at most `max_streams_per_connection`
+    each; every shard reconnects independently. With `redundant=True` each shard
+    gets a second hot connection and messages are de-duplicated on the per-stream
+    sequence (trade id / final update id), so losing either connection is seamless.
+    The receive loops only parse and enqueue, `consumers` tasks drain per-symbol
+    queues into `callback(data, recv_ns)` where `recv_ns` is the perf_counter_ns
+    receive time, for tick-to-trade measurement. Depth diffs bypass the queues
+    (dropping or conflating them would break the book's sequence) and go
+    straight to `on_depth(event)` when it is given.
+    """
+
+    def __init__(self, symbols: List[str], callback: Callable[[Dict], None], consumers: int = 1,
+                 queue_size: int = 1000, conflate: bool = False, max_streams_per_connection: int = 200,
+                 redundant: bool = False, channels: List[str] = None, base_url: Optional[str] = None,
+                 json_backend: str = "auto", on_depth: Optional[Callable[[Dict], None]] = None):
+        self.symbols = [s.lower() for s in symbols]
+        self.callback = callback
+        self.running = False
+        self.consumers = consumers
+        self.queues = SymbolQueues(maxsize=queue_size, conflate=conflate)
+        self._consumer_tasks: List[asyncio.Task] = []
+
+        self.base_url = "wss://stream.binance.com:9443"
+        if Config.TRADING_MODE.value == "TESTNET":
+            self.base_url = "wss://testnet.binance.vision"
+        if base_url:
+            self.base_url = base_url.rstrip("/")
+
+        self.decoder = MessageDecoder(json_backend)
+        self.channels = channels or ["trade"]
+        self.on_depth = on_depth
+        self.max_streams_per_connection = max_streams_per_connection
+        self.redundant = redundant
+        self.shards = self._build_shards()
+
+        self._last_seq: Dict[str, int] = {}
+        self.duplicates = 0
+        self.last_msg_time = time.time()
+
+    def _build_shards(self) -> List[StreamShard]:
+        streams = [f"{s}@{c}" for s in self.symbols for c in self.channels]
+        n = self.max_streams_per_connection
+        shards = []
+        for k in range(0, len(streams), n):
+            chunk = streams[k:k + n]
+            shards.append(StreamShard(f"shard-{k // n}", self.base_url, chunk, self._on_message))
+            if self.redundant:
+                shards.append(StreamShard(f"shard-{k // n}-b", self.base_url, chunk, self._on_message))
+        return shards
+
+    def _on_message(self, shard: str, msg: str):
+        recv_ns = time.perf_counter_ns()
+        stream, data = self.decoder.decode(msg)
+
+        # Trade ids and depth final update ids both increase monotonically per stream
+        if type(data) is Trade:
+            seq = data.trade_id
+            symbol = data.symbol
+            latency.record_skew(symbol, data.event_time)
+        else:
+            seq = data.get('u')
+            symbol = data.get('s', '')
+        latency.record_since("decode", symbol, recv_ns)
+
+        if stream is not None and seq is not None:
+            if seq <= self._last_seq.get(stream, -1):
+                self.duplicates += 1
+                return
+            self._last_seq[stream] = seq
+
+        self.last_msg_time = time.time()
+        if self.on_depth is not None and type(data) is not Trade and data.get('e') == 'depthUpdate':
+            self.on_depth(data)
+            return
+        self.queues.put_nowait(symbol, (recv_ns, data))
+
+    async def _consume(self):
+        while self.running:
+            symbol, (recv_ns, data) = await self.queues.get()
+            latency.record_since("queue", symbol, recv_ns)
+            try:
+                await self.callback(data, recv_ns)
+            except Exception as e:
+                logger.error(f"Market data handler error ({symbol}): {e}")
+            finally:
+                self.queues.task_done(symbol)
+
+    def metrics(self) -> Dict:
+        metrics = self.queues.metrics()
+        metrics["duplicates"] = self.duplicates
+        metrics["json_backend"] = self.decoder.backend
+        metrics["shards"] = {s.name: s.metrics() for s in self.shards}
+        return metrics
+
+    async def start(self):
+        self.running = True
+        self._consumer_tasks = [asyncio.create_task(self._consume()) for _ in range(self.consumers)]
+        logger.info(f"Starting {len(self.shards)} Binance WebSocket connection(s) for {len(self.symbols)} symbols")
+        await asyncio.gather(*(shard.run() for shard in self.shards))
+
+    async def stop(self):
+        logger.info("Stopping WebSocket Manager...")
+        self.running = False
+        for task in self._consumer_tasks:
+            task.cancel()
+        self._consumer_tasks = []
+        await asyncio.gather(*(shard.stop() for shard in self.shards))
+
 if __name__ == "__main__":
     # Test
-    async def handler(msg):
-        print(f"Update: {msg.get('s')} ${msg.get('p')}")
+    async def handler(trade, recv_ns=None):
+        print(f"Update: {trade.symbol} ${trade.price}")
 
     ws = BinanceWebSocketManager(["btcusdt", "ethusdt"], handler)
     loop = asyncio.get_event_loop()
@@ -1,75 +1,181 @@
-import pandas as pd
+import math
+import time
 import numpy as np
-from typing import Dict, List
-from trading_system.core.telemetry import logger
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 class CorrelationEngine:
-    def __init__(self, symbols: List[str], window_size: int = 50):
-        self.symbols = symbols
+    """
+    Rolling correlation / covariance / beta over time-bucketed returns.
+
+    Ticks are sampled into `bucket_seconds` buckets (last price per bucket) so
+    every symbol's return lines up on the same clock. When a bucket closes, one
+    return row is pushed into a `window_size` ring and the running sums and
+    cross-products are updated in O(k^2); reads never rescan the window.
+    """
+
+    def __init__(self, symbols: List[str], window_size: int = 50, bucket_seconds: float = 1.0,
+                 min_periods: int = 10, resync_interval: int = 1000):
+        self.symbols = list(symbols)
+        self.index: Dict[str, int] = {s: i for i, s in enumerate(self.symbols)}
         self.window_size = window_size
-        self.price_history: Dict[str, List[float]] = {s: [] for s in symbols}
-        self.returns_df = pd.DataFrame()
+        self.bucket_seconds = bucket_seconds
+        self.min_periods = min_periods
+        self.resync_interval = resync_interval
+
+        k = len(self.symbols)
+        self._returns = np.zeros((window_size, k), dtype=np.float64)
+        self._idx = 0
+        self.count = 0
+        self._sum = np.zeros(k, dtype=np.float64)
+        self._cross = np.zeros((k, k), dtype=np.float64)
+        self._updates = 0
 
-    def update_price(self, symbol: str, price: float):
-        if symbol not in self.price_history:
+        self._last = np.full(k, np.nan)  # Latest price in the open bucket
+        self._close = np.full(k, np.nan)  # Price at the previous bucket close
+        self._bucket: Optional[int] = None
+
+    def update_price(self, symbol: str, price: float, quantity: float = 0.0, timestamp: Optional[float] = None):
+        i = self.index.get(symbol)
+        if i is None:
             return
-            
-        self.price_history[symbol].append(price)
-        if len(self.price_history[symbol]) > self.window_size + 1:
-             self.price_history[symbol].pop(0)
-
-    def calculate_correlations(self) -> pd.DataFrame:
-        # Construct DataFrame
-        data = {}
-        min_len = float('inf')
-        
-        for s in self.symbols:
-            l = len(self.price_history[s])
-            if l < 10: # Minimum data needed
-                return pd.DataFrame()
-            min_len = min(min_len, l)
-
-        # Align lengths
-        for s in self.symbols:
-            data[s] = self.price_history[s][-min_len:]
-            
-        df = pd.DataFrame(data)
-        
-        # Calculate returns
-        returns = df.pct_change().dropna()
-        
-        if returns.empty:
+
+        if timestamp is None:
+            timestamp = time.time()
+        bucket = int(timestamp // self.bucket_seconds)
+
+        if self._bucket is None:
+            self._bucket = bucket
+        elif bucket > self._bucket:
+            self._close_buckets(bucket - self._bucket)
+            self._bucket = bucket
+
+        self._last[i] = price
+
+    def _close_buckets(self, n: int):
+        prev = self._close
+        if np.isnan(prev).all():
+            # First bucket only seeds the reference prices
+            self._close = self._last.copy()
+            return
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            row = self._last / prev - 1.0
+        # Symbols without a previous close contribute a flat return
+        row[~np.isfinite(row)] = 0.0
+        self._close = self._last.copy()
+        self._push(row)
+
+        # Empty buckets in between carry prices forward (zero return)
+        flat = np.zeros_like(row)
+        for _ in range(min(n - 1, self.window_size)):
+            self._push(flat)
+
+    def _push(self, row: np.ndarray):
+        if self.count == self.window_size:
+            old = self._returns[self._idx]
+            self._sum -= old
+            self._cross -= np.outer(old, old)
+        else:
+            self.count += 1
+
+        self._returns[self._idx] = row
+        self._sum += row
+        self._cross += np.outer(row, row)
+        self._idx = (self._idx + 1) % self.window_size
+
+        self._updates += 1
+        if self._updates >= self.resync_interval:
+            self.resync()
+
+    def resync(self):
+        """Rebuild running sums exactly from the stored returns window."""
+        r = self._returns[:self.count] if self.count < self.window_size else self._returns
+        self._sum = r.sum(axis=0)
+        self._cross = r.T @ r
+        self._updates = 0
+
+    def state(self) -> Dict[str, np.ndarray]:
+        """Return rows oldest first plus the open bucket, keyed to `symbols` order."""
+        if self.count < self.window_size:
+            returns = self._returns[:self.count]
+        else:
+            returns = np.roll(self._returns, -self._idx, axis=0)
+        return {
+            'symbols': np.array(self.symbols),
+            'returns': returns.copy(),
+            'last': self._last.copy(),
+            'close': self._close.copy(),
+            'bucket': np.int64(-1 if self._bucket is None else self._bucket)
+        }
+
+    def restore(self, state: Dict[str, np.ndarray]):
+        """Load a state saved for the same or an overlapping symbol set; unknown symbols are dropped."""
+        cols = [(self.index[s], j) for j, s in enumerate(state['symbols'].tolist()) if s in self.index]
+        dst = [i for i, _ in cols]
+        src = [j for _, j in cols]
+
+        rows = state['returns'][-self.window_size:]
+        self._returns[:] = 0.0
+        self._returns[:len(rows), dst] = rows[:, src]
+        self.count = len(rows)
+        self._idx = self.count % self.window_size
+        self.resync()
+
+        self._last[:] = np.nan
+        self._close[:] = np.nan
+        self._last[dst] = state['last'][src]
+        self._close[dst] = state['close'][src]
+        bucket = int(state['bucket'])
+        self._bucket = None if bucket < 0 else bucket
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.min_periods
+
+    def covariance_matrix(self) -> np.ndarray:
+        n = self.count
+        if n < 2:
+            return np.zeros_like(self._cross)
+        return (self._cross - np.outer(self._sum, self._sum) / n) / (n - 1)
+
+    def covariance(self, a: str, b: str) -> float:
+        n = self.count
+        if n < 2:
+            return 0.0
+        i, j = self.index[a], self.index[b]
+        return float((self._cross[i, j] - self._sum[i] * self._sum[j] / n) / (n - 1))
+
+    def correlation(self, a: str, b: str) -> float:
+        denom = math.sqrt(max(self.covariance(a, a), 0.0) * max(self.covariance(b, b), 0.0))
+        if denom == 0:
+            return 0.0
+        return self.covariance(a, b) / denom
+
+    def calculate_correlations(self) -> "pd.DataFrame":
+        import pandas as pd  # Research/reporting only; the live path stays on NumPy
+        if not self.ready:
             return pd.DataFrame()
-            
+
+        cov = self.covariance_matrix()
+        std = np.sqrt(np.clip(np.diag(cov), 0.0, None))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = cov / np.outer(std, std)
+
         # Correlation matrix
-        corr_matrix = returns.corr()
+        corr_matrix = pd.DataFrame(corr, index=self.symbols, columns=self.symbols)
         return corr_matrix
 
     def get_beta(self, target_symbol: str, benchmark_symbol: str) -> float:
         # Calculate beta: Cov(r_target, r_benchmark) / Var(r_benchmark)
-        # Needs aligned data
-        # Simply use the cached calculation logic or recompute
-        # For efficiency, we reuse calculate_correlations logic if expanded
-        # Here we do a quick ad-hoc for simplicity
-        
-        if len(self.price_history[target_symbol]) < 20 or len(self.price_history[benchmark_symbol]) < 20:
+        if not self.ready:
             return 1.0
 
-        s1 = pd.Series(self.price_history[target_symbol])
-        s2 = pd.Series(self.price_history[benchmark_symbol])
-        
-        # Truncate to match
-        l = min(len(s1), len(s2))
-        s1 = s1.iloc[-l:]
-        s2 = s2.iloc[-l:]
-        
-        r1 = s1.pct_change().dropna()
-        r2 = s2.pct_change().dropna()
-        
-        cov = r1.cov(r2)
-        var = r2.var()
-        
-        if var == 0:
+        var = self.covariance(benchmark_symbol, benchmark_symbol)
+
+        if var <= 0:
             return 1.0
-            
-        return cov / var
+
+        return self.covariance(target_symbol, benchmark_symbol) / var
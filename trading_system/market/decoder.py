@@ -0,0 +1,62 @@
+import json
+from typing import Any, Callable, NamedTuple, Optional, Tuple
+from trading_system.core.telemetry import logger
+
+class Trade(NamedTuple):
+    """Compact trade record; prices are converted from strings once, at decode time."""
+    symbol: str
+    price: float
+    qty: float
+    trade_id: int
+    event_time: int  # Exchange event time (ms)
+    trade_time: int  # Trade time (ms)
+
+    @property
+    def timestamp(self) -> float:
+        return self.trade_time / 1000.0
+
+
+def load_json_backend(name: str = "auto") -> Tuple[Callable[[Any], Any], str]:
+    """Return (loads, backend_name), preferring orjson, then ujson, then the stdlib."""
+    name = name.lower()
+    if name in ("auto", "orjson"):
+        try:
+            import orjson
+            return orjson.loads, "orjson"
+        except ImportError:
+            if name == "orjson":
+                logger.warning("orjson not installed, falling back")
+    if name in ("auto", "ujson"):
+        try:
+            import ujson
+            return ujson.loads, "ujson"
+        except ImportError:
+            if name == "ujson":
+                logger.warning("ujson not installed, falling back")
+    return json.loads, "json"
+
+
+def decode_trade(data: dict) -> Trade:
+    return Trade(
+        data['s'],
+        float(data['p']),
+        float(data['q']),
+        data.get('t', 0),
+        data.get('E', 0),
+        data.get('T', 0)
+    )
+
+
+class MessageDecoder:
+    """Decodes raw (combined-stream) messages; trade events become Trade tuples, others stay dicts."""
+
+    def __init__(self, backend: str = "auto"):
+        self.loads, self.backend = load_json_backend(backend)
+
+    def decode(self, msg) -> Tuple[Optional[str], Any]:
+        envelope = self.loads(msg)
+        stream = envelope.get('stream')
+        data = envelope.get('data', envelope)
+        if data.get('e') == 'trade':
+            return stream, decode_trade(data)
+        return stream, data
@@ -0,0 +1,161 @@
+import time
+import numpy as np
+from typing import Dict, Iterable, Optional
+
+class HurstEstimator:
+    """
+    Streaming Hurst exponent over the last `window` prices.
+
+    Keeps running sum / sum-of-squares of the lag-L price differences for every
+    lag, so each tick costs O(lags) instead of rebuilding 18 difference arrays.
+    The regression itself only runs every `recompute_ticks` ticks or
+    `recompute_seconds` of tick time; in between the cached value is served.
+    Same estimator as MeanReversionStrategy.calculate_hurst (tau = sqrt(std)).
+    """
+
+    def __init__(self, window: int = 100, max_lag: int = 20, recompute_ticks: int = 50,
+                 recompute_seconds: float = 5.0, resync_interval: int = 5000):
+        if max_lag < 4 or window < max_lag:
+            # Lags run 2..max_lag-1 and each needs that many prices in the window; the fit needs two lags
+            raise ValueError(f"Hurst window {window} (HURST_WINDOW) must be at least max_lag {max_lag}, "
+                             f"and max_lag at least 4")
+        self.window = window
+        self.lags = np.arange(2, max_lag)
+        self.recompute_ticks = recompute_ticks
+        self.recompute_seconds = recompute_seconds
+        self.resync_interval = resync_interval
+
+        self._log_lags = np.log(self.lags)
+        self._x = self._log_lags - self._log_lags.mean()
+        self._xx = float((self._x ** 2).sum())
+
+        self._prices = np.zeros(window * 2, dtype=np.float64)
+        self._idx = 0
+        self.count = 0
+
+        self._sum = np.zeros(len(self.lags), dtype=np.float64)
+        self._sumsq = np.zeros(len(self.lags), dtype=np.float64)
+        self._n = np.zeros(len(self.lags), dtype=np.int64)
+
+        self.value = 0.5
+        self.computed = False
+        self._ticks_since = 0
+        self._last_compute_ts = 0.0
+        self._updates = 0
+
+    def _view(self) -> np.ndarray:
+        end = self._idx + self.window
+        return self._prices[end - self.count:end]
+
+    def update(self, price: float, timestamp: Optional[float] = None) -> float:
+        if timestamp is None:
+            timestamp = time.time()
+
+        v = self._view()
+        n = len(v)
+        if n == self.window:
+            # Steady state: the oldest price leaves with its lag differences,
+            # the new price brings one difference per lag
+            d_old = v[self.lags] - v[0]
+            d_new = price - v[n - self.lags]
+            self._sum += d_new - d_old
+            self._sumsq += d_new * d_new - d_old * d_old
+        else:
+            mask = self.lags <= n
+            if mask.any():
+                d = price - v[n - self.lags[mask]]
+                self._sum[mask] += d
+                self._sumsq[mask] += d * d
+                self._n[mask] += 1
+
+        i = self._idx
+        self._prices[i] = self._prices[i + self.window] = price
+        self._idx = (i + 1) % self.window
+        if self.count < self.window:
+            self.count += 1
+
+        self._updates += 1
+        if self._updates >= self.resync_interval:
+            self.resync()
+
+        self._ticks_since += 1
+        if (not self.computed or self._ticks_since >= self.recompute_ticks
+                or timestamp - self._last_compute_ts >= self.recompute_seconds):
+            self.recompute(timestamp)
+        return self.value
+
+    def resync(self):
+        """Rebuild the lag accumulators exactly from the stored window."""
+        v = self._view()
+        for k, lag in enumerate(self.lags):
+            d = v[lag:] - v[:-lag] if lag < len(v) else v[:0]
+            self._sum[k] = d.sum()
+            self._sumsq[k] = (d * d).sum()
+            self._n[k] = len(d)
+        self._updates = 0
+
+    def state(self) -> Dict[str, np.ndarray]:
+        return {'prices': self._view().copy(), 'value': np.float64(self.value), 'computed': np.bool_(self.computed)}
+
+    def restore(self, state: Dict[str, np.ndarray], timestamp: Optional[float] = None):
+        prices = state['prices'][-self.window:]
+        n = len(prices)
+        self._prices[:n] = prices
+        self._prices[self.window:self.window + n] = prices
+        self._idx = n % self.window
+        self.count = n
+        self.resync()
+        self.value = float(state['value'])
+        self.computed = bool(state['computed'])
+        self._ticks_since = 0
+        self._last_compute_ts = timestamp if timestamp is not None else time.time()
+
+    def recompute(self, timestamp: Optional[float] = None) -> float:
+        self._ticks_since = 0
+        self._last_compute_ts = timestamp if timestamp is not None else time.time()
+
+        if (self._n < 2).any():
+            return self.value
+
+        mean = self._sum / self._n
+        var = self._sumsq / self._n - mean * mean
+        if (var <= 0).any():
+            return self.value
+
+        # log(tau) = log(var) / 4, H = 2 * slope
+        y = 0.25 * np.log(var)
+        slope = float((self._x * (y - y.mean())).sum() / self._xx)
+        self.value = slope * 2.0
+        self.computed = True
+        return self.value
+
+
+class HurstStore:
+    """Per-symbol HurstEstimator with a cached value for strategies and the dashboard."""
+
+    def __init__(self, symbols: Iterable[str], window: int = 100, recompute_ticks: int = 50,
+                 recompute_seconds: float = 5.0):
+        self.window = window
+        self.recompute_ticks = recompute_ticks
+        self.recompute_seconds = recompute_seconds
+        self.estimators: Dict[str, HurstEstimator] = {s: self._new() for s in symbols}
+
+    def _new(self) -> HurstEstimator:
+        return HurstEstimator(self.window, recompute_ticks=self.recompute_ticks,
+                              recompute_seconds=self.recompute_seconds)
+
+    def get(self, symbol: str) -> HurstEstimator:
+        est = self.estimators.get(symbol)
+        if est is None:
+            est = self._new()
+            self.estimators[symbol] = est
+        return est
+
+    def __getitem__(self, symbol: str) -> HurstEstimator:
+        return self.get(symbol)
+
+    def update(self, symbol: str, price: float, timestamp: Optional[float] = None) -> float:
+        return self.get(symbol).update(price, timestamp)
+
+    def value(self, symbol: str) -> float:
+        return self.get(symbol).value
@@ -0,0 +1,343 @@
+import asyncio
+import json
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+from trading_system.core.telemetry import logger
+from trading_system.execution.rate_limiter import RequestScheduler, depth_weight
+
+class BookSide:
+    """
+    One side of an L2 book as sorted parallel arrays, best level last.
+
+    Keys are the price for bids and minus the price for asks, so both sides
+    sort ascending with the best level at index n-1: best price and top-N
+    reads are O(1) slices, and updates near the touch (the common case)
+    only shift a few elements. At most `capacity` levels are kept; the
+    worst ones are dropped first.
+    """
+
+    __slots__ = ("is_ask", "capacity", "keys", "qty", "n")
+
+    def __init__(self, is_ask: bool, capacity: int = 1000):
+        self.is_ask = is_ask
+        self.capacity = capacity
+        self.keys = np.zeros(capacity, dtype=np.float64)
+        self.qty = np.zeros(capacity, dtype=np.float64)
+        self.n = 0
+
+    def clear(self):
+        self.n = 0
+
+    def load(self, prices: np.ndarray, qtys: np.ndarray):
+        keys = -prices if self.is_ask else prices
+        order = np.argsort(keys, kind="stable")
+        keep = order[qtys[order] > 0][-self.capacity:]
+        self.n = len(keep)
+        self.keys[:self.n] = keys[keep]
+        self.qty[:self.n] = qtys[keep]
+
+    def apply(self, prices: np.ndarray, qtys: np.ndarray):
+        """Set the given levels (qty 0 removes a level) in one vectorised merge."""
+        if not len(prices):
+            return
+        n = self.n
+        keys = -prices if self.is_ask else prices
+        cur = self.keys[:n]
+        idx = np.searchsorted(cur, keys)
+        hit = idx < n
+        hit[hit] = cur[idx[hit]] == keys[hit]
+        self.qty[idx[hit]] = qtys[hit]
+
+        new = ~hit & (qtys > 0)
+        if new.any():
+            order = np.argsort(keys[new], kind="stable")
+            merged_keys = np.insert(cur, idx[new][order], keys[new][order])
+            merged_qty = np.insert(self.qty[:n], idx[new][order], qtys[new][order])
+        else:
+            merged_keys, merged_qty = cur, self.qty[:n]
+
+        if not (qtys[hit] > 0).all() or len(merged_keys) > self.capacity:
+            live = merged_qty > 0
+            merged_keys, merged_qty = merged_keys[live][-self.capacity:], merged_qty[live][-self.capacity:]
+        if merged_keys is not cur:
+            m = len(merged_keys)
+            self.keys[:m] = merged_keys
+            self.qty[:m] = merged_qty
+            self.n = m
+
+    def best(self) -> Tuple[float, float]:
+        if not self.n:
+            return 0.0, 0.0
+        key = float(self.keys[self.n - 1])
+        return (-key if self.is_ask else key), float(self.qty[self.n - 1])
+
+    def top(self, levels: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(prices, qtys) of the best `levels` levels, best first."""
+        lo = max(0, self.n - levels)
+        keys = self.keys[lo:self.n][::-1]
+        return (-keys if self.is_ask else keys.copy()), self.qty[lo:self.n][::-1].copy()
+
+    def volume(self, levels: int) -> float:
+        return float(self.qty[max(0, self.n - levels):self.n].sum())
+
+
+def _levels(rows) -> Tuple[np.ndarray, np.ndarray]:
+    if not len(rows):
+        return np.zeros(0), np.zeros(0)
+    arr = np.asarray(rows, dtype=np.float64).reshape(-1, 2)
+    return arr[:, 0], arr[:, 1]
+
+
+class L2Book:
+    """Local order book for one symbol, kept in step with the exchange's update ids."""
+
+    def __init__(self, symbol: str, capacity: int = 1000):
+        self.symbol = symbol
+        self.bids = BookSide(False, capacity)
+        self.asks = BookSide(True, capacity)
+        self.last_update_id = 0
+        self.event_time = 0
+
+    def load_snapshot(self, last_update_id: int, bids, asks):
+        self.bids.load(*_levels(bids))
+        self.asks.load(*_levels(asks))
+        self.last_update_id = last_update_id
+
+    def apply_diff(self, event: Dict):
+        self.bids.apply(*_levels(event.get('b', ())))
+        self.asks.apply(*_levels(event.get('a', ())))
+        self.last_update_id = event['u']
+        self.event_time = event.get('E', self.event_time)
+
+    def clear(self):
+        self.bids.clear()
+        self.asks.clear()
+        self.last_update_id = 0
+
+    @property
+    def best_bid(self) -> float:
+        return self.bids.best()[0]
+
+    @property
+    def best_ask(self) -> float:
+        return self.asks.best()[0]
+
+    @property
+    def mid(self) -> float:
+        bid, ask = self.best_bid, self.best_ask
+        return (bid + ask) / 2 if bid and ask else 0.0
+
+    @property
+    def spread_bps(self) -> float:
+        bid, ask = self.best_bid, self.best_ask
+        return (ask - bid) / ((ask + bid) / 2) * 10000 if bid and ask else 0.0
+
+    def imbalance(self, levels: int = 10) -> float:
+        """(bid volume - ask volume) / total over the top `levels`, in [-1, 1]."""
+        bid, ask = self.bids.volume(levels), self.asks.volume(levels)
+        total = bid + ask
+        return (bid - ask) / total if total else 0.0
+
+    def top(self, levels: int = 20) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """(bid prices, bid qtys, ask prices, ask qtys), best first."""
+        return (*self.bids.top(levels), *self.asks.top(levels))
+
+
+SnapshotFetcher = Callable[[str], Awaitable[Tuple[int, list, list]]]
+
+
+class OrderBookManager:
+    """
+    Local L2 books for many symbols from `@depth` diff streams.
+
+    Diffs are buffered per symbol until a REST snapshot arrives; buffered
+    events up to the snapshot's lastUpdateId are dropped and the first one
+    applied must straddle it. After that each event must continue the
+    previous one (`U == u + 1`, or `pu == u` on futures streams); a gap
+    clears the book and resyncs from a fresh snapshot. `on_depth` is
+    synchronous and cheap, so it is called straight from the WebSocket
+    receive path. `fetch_snapshot(symbol) -> (last_update_id, bids, asks)`
+    can be swapped for recorded snapshots to replay depth feeds offline.
+    The default fetches GET /api/v3/depth from `rest_url` with httpx, each
+    request waiting for room in `scheduler`'s weight budget when one is given.
+    Listeners get `(symbol, book)` after every applied update.
+    """
+
+    def __init__(self, symbols: List[str], capacity: int = 1000, snapshot_limit: int = 1000,
+                 max_buffer: int = 1000, retry_delay: float = 1.0, fetch_snapshot: Optional[SnapshotFetcher] = None,
+                 rest_url: str = "https://api.binance.com", scheduler: Optional[RequestScheduler] = None):
+        self.symbols = [s.upper() for s in symbols]
+        self.books: Dict[str, L2Book] = {s: L2Book(s, capacity) for s in self.symbols}
+        self.snapshot_limit = snapshot_limit
+        self.retry_delay = retry_delay
+        self.fetch_snapshot = fetch_snapshot or self._fetch_rest_snapshot
+        self.rest_url = rest_url.rstrip("/")
+        self.scheduler = scheduler
+        self.listeners: List[Callable[[str, L2Book], None]] = []
+
+        self._live: Dict[str, bool] = {s: False for s in self.symbols}
+        self._fresh = set()  # Loaded from a snapshot, next event only has to straddle it
+        self._buffers: Dict[str, Deque[Dict]] = {s: deque(maxlen=max_buffer) for s in self.symbols}
+        self._syncing: Dict[str, asyncio.Task] = {}
+        self._client = None  # httpx.AsyncClient, created on the first snapshot
+        self._client_lock = asyncio.Lock()
+
+        self.updates = 0
+        self.resyncs = 0
+        self.gaps = 0
+        self.stale = 0
+
+    def book(self, symbol: str) -> Optional[L2Book]:
+        """The symbol's book while it is in sync, else None."""
+        return self.books[symbol] if self._live.get(symbol) else None
+
+    def on_update(self, callback: Callable[[str, L2Book], None]):
+        self.listeners.append(callback)
+
+    def on_depth(self, event: Dict) -> bool:
+        """Apply one depthUpdate event; returns True if the book changed."""
+        symbol = event.get('s')
+        book = self.books.get(symbol)
+        if book is None:
+            return False
+        if not self._live[symbol]:
+            self._buffers[symbol].append(event)
+            self._schedule_sync(symbol)
+            return False
+
+        if event['u'] <= book.last_update_id:
+            self.stale += 1
+            return False
+        if symbol in self._fresh:
+            gap = event['U'] > book.last_update_id + 1
+        elif event.get('pu') is not None:
+            gap = event['pu'] != book.last_update_id
+        else:
+            gap = event['U'] != book.last_update_id + 1
+        if gap:
+            self.gaps += 1
+            logger.warning(f"Depth gap on {symbol} (have {book.last_update_id}, got {event['U']}..{event['u']}), resyncing")
+            self._reset(symbol)
+            self._buffers[symbol].append(event)
+            self._schedule_sync(symbol)
+            return False
+
+        book.apply_diff(event)
+        self._fresh.discard(symbol)
+        self._applied(symbol, book)
+        return True
+
+    def _applied(self, symbol: str, book: L2Book):
+        self.updates += 1
+        for callback in self.listeners:
+            try:
+                callback(symbol, book)
+            except Exception as e:
+                logger.error(f"Order book listener failed ({symbol}): {e}")
+
+    def _reset(self, symbol: str):
+        self._live[symbol] = False
+        self.books[symbol].clear()
+        self._buffers[symbol].clear()
+
+    def _schedule_sync(self, symbol: str):
+        task = self._syncing.get(symbol)
+        if task is None or task.done():
+            self._syncing[symbol] = asyncio.ensure_future(self._sync(symbol))
+
+    async def _sync(self, symbol: str):
+        book = self.books[symbol]
+        buffer = self._buffers[symbol]
+        while not self._live[symbol]:
+            self.resyncs += 1
+            try:
+                last_update_id, bids, asks = await self.fetch_snapshot(symbol)
+            except Exception as e:
+                logger.warning(f"Depth snapshot for {symbol} failed: {e}")
+                await asyncio.sleep(self.retry_delay)
+                continue
+
+            while buffer and buffer[0]['u'] <= last_update_id:
+                buffer.popleft()
+            if buffer and buffer[0]['U'] > last_update_id + 1:
+                # Snapshot is older than the first buffered diff; fetch a newer one
+                await asyncio.sleep(self.retry_delay)
+                continue
+
+            book.load_snapshot(last_update_id, bids, asks)
+            self._fresh.add(symbol)
+            self._live[symbol] = True
+            while buffer and self._live[symbol]:
+                self.on_depth(buffer.popleft())  # A gap here resets the book and loops again
+        if self._live[symbol]:
+            logger.info(f"Order book {symbol} in sync at update {book.last_update_id}")
+            self._applied(symbol, book)
+
+    async def wait_synced(self):
+        """Wait for every in-flight snapshot sync (replays and tests)."""
+        while any(not t.done() for t in self._syncing.values()):
+            await asyncio.gather(*self._syncing.values(), return_exceptions=True)
+
+    def _new_client(self):
+        import httpx
+        return httpx.AsyncClient(base_url=self.rest_url, timeout=10.0)
+
+    async def _fetch_rest_snapshot(self, symbol: str) -> Tuple[int, list, list]:
+        async with self._client_lock:
+            if self._client is None:
+                # Import and build off the loop; the first import would stall tick processing
+                self._client = await asyncio.to_thread(self._new_client)
+        if self.scheduler is not None:
+            await asyncio.to_thread(self.scheduler.acquire, depth_weight(self.snapshot_limit))
+        response = await self._client.get("/api/v3/depth", params={'symbol': symbol, 'limit': self.snapshot_limit})
+        if self.scheduler is not None:
+            self.scheduler.update(response.headers)
+            if response.status_code in (418, 429):
+                retry_after = float(response.headers.get('Retry-After', 1))
+                logger.warning(f"Depth snapshot rate limited ({response.status_code}), backing off {retry_after:.0f}s")
+                self.scheduler.backoff(retry_after)
+        response.raise_for_status()
+        data = response.json()
+        return data['lastUpdateId'], data['bids'], data['asks']
+
+    async def close(self):
+        for task in self._syncing.values():
+            task.cancel()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def metrics(self) -> Dict:
+        return {
+            "in_sync": sum(self._live.values()),
+            "symbols": len(self.symbols),
+            "updates": self.updates,
+            "resyncs": self.resyncs,
+            "gaps": self.gaps,
+            "stale": self.stale,
+            "spread_bps": {s: round(b.spread_bps, 3) for s, b in self.books.items() if self._live[s]}
+        }
+
+
+def load_depth_file(path: str) -> Iterator[Dict]:
+    """depthUpdate events from a JSON-lines capture (raw or combined-stream envelopes)."""
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            msg = json.loads(line)
+            data = msg.get('data', msg)
+            if data.get('e') == 'depthUpdate':
+                yield data
+
+
+async def replay_depth(manager: OrderBookManager, events: Iterable[Dict]) -> int:
+    """Feed recorded depth events, letting each triggered snapshot sync finish before continuing."""
+    applied = 0
+    for event in events:
+        applied += manager.on_depth(event)
+        if manager._syncing:
+            await manager.wait_synced()
+    return applied
@@ -0,0 +1,155 @@
+import math
+import numpy as np
+from typing import List, Optional, Tuple
+
+class PairState:
+    """
+    Time-aligned log-price samples for two legs with a rolling OLS hedge ratio.
+
+    Each trade of either leg updates that leg's latest price; the pair is
+    sampled on a `sample_seconds` clock (the newest sample is overwritten
+    until its bucket closes), so both legs always line up in time regardless
+    of which one trades more. Running sums over the last `window` samples give
+    the regression log(a) = alpha + beta * log(b) and its residual variance in
+    O(1) per update, and therefore the spread z-score without rescanning.
+    Samples are stored relative to the first observation to keep the sums
+    well conditioned.
+    """
+
+    def __init__(self, leg_a: str, leg_b: str, window: int = 300, sample_seconds: float = 1.0,
+                 min_samples: int = 60, resync_interval: int = 1000):
+        self.leg_a = leg_a
+        self.leg_b = leg_b
+        self.window = window
+        self.sample_seconds = sample_seconds
+        self.min_samples = min_samples
+        self.resync_interval = resync_interval
+
+        self._x = np.zeros(window * 2, dtype=np.float64)  # log(b) - origin
+        self._y = np.zeros(window * 2, dtype=np.float64)  # log(a) - origin
+        self._idx = 0
+        self.count = 0
+        self._sx = self._sy = self._sxx = self._syy = self._sxy = 0.0
+        self._updates = 0
+
+        self.price_a: Optional[float] = None
+        self.price_b: Optional[float] = None
+        self._origin: Optional[Tuple[float, float]] = None
+        self._bucket: Optional[int] = None
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (self.leg_a, self.leg_b)
+
+    def update(self, symbol: str, price: float, timestamp: float) -> bool:
+        """Apply a trade of either leg; returns True once both legs are priced."""
+        if symbol == self.leg_a:
+            self.price_a = price
+        elif symbol == self.leg_b:
+            self.price_b = price
+        else:
+            return False
+        if self.price_a is None or self.price_b is None or price <= 0:
+            return False
+
+        if self._origin is None:
+            self._origin = (math.log(self.price_a), math.log(self.price_b))
+        y = math.log(self.price_a) - self._origin[0]
+        x = math.log(self.price_b) - self._origin[1]
+
+        bucket = int(timestamp // self.sample_seconds)
+        if bucket == self._bucket:
+            self._replace_last(x, y)
+        else:
+            self._bucket = bucket
+            self._push(x, y)
+        return True
+
+    def _add(self, x: float, y: float, sign: float):
+        self._sx += sign * x
+        self._sy += sign * y
+        self._sxx += sign * x * x
+        self._syy += sign * y * y
+        self._sxy += sign * x * y
+
+    def _push(self, x: float, y: float):
+        i = self._idx
+        if self.count == self.window:
+            self._add(self._x[i], self._y[i], -1.0)
+        else:
+            self.count += 1
+        self._x[i] = self._x[i + self.window] = x
+        self._y[i] = self._y[i + self.window] = y
+        self._add(x, y, 1.0)
+        self._idx = (i + 1) % self.window
+
+        self._updates += 1
+        if self._updates >= self.resync_interval:
+            self.resync()
+
+    def _replace_last(self, x: float, y: float):
+        j = (self._idx - 1) % self.window
+        self._add(self._x[j], self._y[j], -1.0)
+        self._x[j] = self._x[j + self.window] = x
+        self._y[j] = self._y[j + self.window] = y
+        self._add(x, y, 1.0)
+
+    def resync(self):
+        """Recompute the running sums exactly from the stored window."""
+        end = self._idx + self.window
+        x = self._x[end - self.count:end]
+        y = self._y[end - self.count:end]
+        self._sx, self._sy = float(x.sum()), float(y.sum())
+        self._sxx, self._syy, self._sxy = float(x @ x), float(y @ y), float(x @ y)
+        self._updates = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.min_samples
+
+    def _moments(self) -> Tuple[float, float, float, float, float]:
+        n = self.count
+        mx, my = self._sx / n, self._sy / n
+        cxx = self._sxx - n * mx * mx
+        cxy = self._sxy - n * mx * my
+        cyy = self._syy - n * my * my
+        return mx, my, cxx, cxy, cyy
+
+    @property
+    def beta(self) -> float:
+        """Hedge ratio: log-return sensitivity of leg A to leg B."""
+        if self.count < 2:
+            return 1.0
+        _, _, cxx, cxy, _ = self._moments()
+        return float(cxy / cxx) if cxx > 0 else 1.0
+
+    @property
+    def zscore(self) -> float:
+        """Residual of the newest sample against the rolling fit, in residual standard deviations."""
+        if self.count < 3:
+            return 0.0
+        mx, my, cxx, cxy, cyy = self._moments()
+        if cxx <= 0:
+            return 0.0
+        beta = cxy / cxx
+        resid_var = (cyy - beta * cxy) / (self.count - 2)
+        if resid_var <= 0:
+            return 0.0
+        j = self._idx - 1 + self.window
+        resid = (self._y[j] - my) - beta * (self._x[j] - mx)
+        return float(resid / math.sqrt(resid_var))
+
+
+def select_pairs(corr_engine, max_pairs: int = 10, min_correlation: float = 0.7) -> List[Tuple[str, str]]:
+    """Most correlated symbol pairs from a CorrelationEngine's current window, best first."""
+    if not corr_engine.ready:
+        return []
+    cov = corr_engine.covariance_matrix()
+    std = np.sqrt(np.clip(np.diag(cov), 0.0, None))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        corr = cov / np.outer(std, std)
+    i, j = np.triu_indices(len(corr_engine.symbols), k=1)
+    values = corr[i, j]
+    order = np.argsort(-np.nan_to_num(values, nan=-1.0))
+    symbols = corr_engine.symbols
+    return [(symbols[i[k]], symbols[j[k]]) for k in order[:max_pairs] if values[k] >= min_correlation]
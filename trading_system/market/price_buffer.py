@@ -0,0 +1,111 @@
+import time
+import numpy as np
+from typing import Dict, Iterable, Optional
+
+class PriceRingBuffer:
+    """
+    Fixed-capacity tick history (timestamp, price, quantity) backed by preallocated NumPy arrays.
+
+    Every sample is written twice (at idx and idx + capacity) so the most recent
+    `capacity` samples are always contiguous and can be returned as zero-copy views.
+    Views are only valid until the next append.
+    """
+
+    def __init__(self, capacity: int = 500):
+        self.capacity = capacity
+        self._timestamps = np.zeros(capacity * 2, dtype=np.float64)
+        self._prices = np.zeros(capacity * 2, dtype=np.float64)
+        self._quantities = np.zeros(capacity * 2, dtype=np.float64)
+        self._idx = 0  # Next write slot in [0, capacity)
+        self.count = 0
+
+    def append(self, price: float, quantity: float = 0.0, timestamp: Optional[float] = None):
+        if timestamp is None:
+            timestamp = time.time()
+
+        i = self._idx
+        j = i + self.capacity
+        self._timestamps[i] = self._timestamps[j] = timestamp
+        self._prices[i] = self._prices[j] = price
+        self._quantities[i] = self._quantities[j] = quantity
+
+        self._idx = (i + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def _window(self) -> slice:
+        end = self._idx + self.capacity
+        return slice(end - self.count, end)
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def prices(self) -> np.ndarray:
+        return self._prices[self._window()]
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._timestamps[self._window()]
+
+    @property
+    def quantities(self) -> np.ndarray:
+        return self._quantities[self._window()]
+
+    @property
+    def last_price(self) -> float:
+        if self.count == 0:
+            return 0.0
+        return float(self._prices[self._idx + self.capacity - 1])
+
+    @property
+    def first_price(self) -> float:
+        if self.count == 0:
+            return 0.0
+        return float(self._prices[self._idx + self.capacity - self.count])
+
+    def clear(self):
+        self._idx = 0
+        self.count = 0
+
+    def state(self) -> Dict[str, np.ndarray]:
+        """Copy of the buffered samples, oldest first."""
+        return {
+            'timestamps': self.timestamps.copy(),
+            'prices': self.prices.copy(),
+            'quantities': self.quantities.copy()
+        }
+
+    def restore(self, state: Dict[str, np.ndarray]):
+        """Replace the contents with `state` (keeps the newest `capacity` samples)."""
+        n = min(len(state['prices']), self.capacity)
+        for arr, key in ((self._timestamps, 'timestamps'), (self._prices, 'prices'), (self._quantities, 'quantities')):
+            values = state[key][len(state[key]) - n:]
+            arr[:n] = values
+            arr[self.capacity:self.capacity + n] = values
+        self._idx = n % self.capacity
+        self.count = n
+
+
+class PriceHistoryStore:
+    """One shared ring buffer per symbol, read by the engine, strategies and correlation engine."""
+
+    def __init__(self, symbols: Iterable[str], capacity: int = 500):
+        self.capacity = capacity
+        self.buffers: Dict[str, PriceRingBuffer] = {s: PriceRingBuffer(capacity) for s in symbols}
+
+    def get(self, symbol: str) -> PriceRingBuffer:
+        buf = self.buffers.get(symbol)
+        if buf is None:
+            buf = PriceRingBuffer(self.capacity)
+            self.buffers[symbol] = buf
+        return buf
+
+    def __getitem__(self, symbol: str) -> PriceRingBuffer:
+        return self.get(symbol)
+
+    def __contains__(self, symbol: str):
+        return symbol in self.buffers
+
+    def append(self, symbol: str, price: float, quantity: float = 0.0, timestamp: Optional[float] = None):
+        self.get(symbol).append(price, quantity, timestamp)
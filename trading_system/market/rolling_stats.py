@@ -0,0 +1,123 @@
+import math
+import numpy as np
+from typing import Dict, Iterable
+
+class RollingStats:
+    """
+    Sliding-window mean / variance / z-score updated in O(1) per tick.
+
+    Uses the windowed form of Welford's update (add newest, remove oldest) and
+    recomputes from the raw window every `resync_interval` updates to bound
+    floating point drift. Matches pandas `rolling(window).mean()/std()` (ddof=1).
+    """
+
+    def __init__(self, window: int = 20, resync_interval: int = 1000):
+        self.window = window
+        self.resync_interval = resync_interval
+        self._values = np.zeros(window, dtype=np.float64)
+        self._idx = 0
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._updates = 0
+        self.last = 0.0
+
+    def update(self, x: float):
+        x = float(x)  # Stats stay plain floats whatever the caller passes
+        if self.count < self.window:
+            # Warm-up: plain Welford
+            self._values[self._idx] = x
+            self.count += 1
+            delta = x - self.mean
+            self.mean += delta / self.count
+            self._m2 += delta * (x - self.mean)
+        else:
+            old = float(self._values[self._idx])  # Not numpy.float64, which would leak into mean/zscore
+            self._values[self._idx] = x
+            old_mean = self.mean
+            self.mean += (x - old) / self.window
+            self._m2 += (x - old) * (x - self.mean + old - old_mean)
+
+        self._idx = (self._idx + 1) % self.window
+        self.last = x
+
+        self._updates += 1
+        if self._updates >= self.resync_interval:
+            self.resync()
+
+    def resync(self):
+        """Recompute mean and M2 exactly from the stored window."""
+        values = self._values[:self.count]
+        if self.count:
+            self.mean = float(values.mean())
+            self._m2 = float(((values - self.mean) ** 2).sum())
+        self._updates = 0
+
+    def state(self) -> Dict[str, np.ndarray]:
+        """Window values oldest first."""
+        if self.count < self.window:
+            values = self._values[:self.count]
+        else:
+            values = np.roll(self._values, -self._idx)
+        return {'values': values.copy()}
+
+    def restore(self, state: Dict[str, np.ndarray]):
+        self._idx = 0
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        for x in state['values'][-self.window:]:
+            self.update(float(x))
+        self.resync()
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.window
+
+    @property
+    def variance(self) -> float:
+        if self.count < 2:
+            return 0.0
+        return max(self._m2, 0.0) / (self.count - 1)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def volatility(self) -> float:
+        """Rolling std relative to the rolling mean."""
+        if self.mean == 0:
+            return 0.0
+        return self.std / abs(self.mean)
+
+    @property
+    def zscore(self) -> float:
+        std = self.std
+        if not self.ready or std == 0:
+            return 0.0
+        return (self.last - self.mean) / std
+
+
+class RollingStatsStore:
+    """Per-symbol RollingStats, updated once per tick and shared by strategies and the dashboard."""
+
+    def __init__(self, symbols: Iterable[str], window: int = 20, resync_interval: int = 1000):
+        self.window = window
+        self.resync_interval = resync_interval
+        self.stats: Dict[str, RollingStats] = {s: RollingStats(window, resync_interval) for s in symbols}
+
+    def get(self, symbol: str) -> RollingStats:
+        stats = self.stats.get(symbol)
+        if stats is None:
+            stats = RollingStats(self.window, self.resync_interval)
+            self.stats[symbol] = stats
+        return stats
+
+    def __getitem__(self, symbol: str) -> RollingStats:
+        return self.get(symbol)
+
+    def update(self, symbol: str, price: float) -> RollingStats:
+        stats = self.get(symbol)
+        stats.update(price)
+        return stats
@@ -0,0 +1,118 @@
+import time
+import numpy as np
+from multiprocessing import shared_memory
+from typing import Optional
+
+TICK_DTYPE = np.dtype([
+    ("symbol", np.int32),  # Index into the pool's symbol list
+    ("price", np.float64),
+    ("qty", np.float64),
+    ("trade_id", np.int64),
+    ("time", np.int64),  # Trade time (ms)
+    ("recv_ns", np.int64)  # perf_counter_ns at receipt, 0 if unknown
+])
+
+# Header slots (int64): producer position, consumer position, consumer asleep, stop, overruns
+_HEAD, _TAIL, _ASLEEP, _STOP, _OVERRUNS = range(5)
+_HEADER_SLOTS = 8
+
+
+class ShmTickRing:
+    """
+    Single-producer / single-consumer tick ring in shared memory.
+
+    The producer never blocks: when the consumer falls more than `capacity`
+    records behind, the oldest records are overwritten and the consumer skips
+    ahead (drop-oldest, like SymbolQueues). A record read while it could have
+    been overwritten is discarded. The consumer sleeps on `wakeup` (a
+    multiprocessing.Event) only after flagging itself asleep, so the producer
+    pays for a set() only when the consumer is actually idle.
+    """
+
+    def __init__(self, capacity: int = 65536, name: Optional[str] = None, wakeup=None):
+        self.capacity = capacity
+        size = _HEADER_SLOTS * 8 + capacity * TICK_DTYPE.itemsize
+        self.owner = name is None
+        self._shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size if self.owner else 0)
+        self._header = np.ndarray(_HEADER_SLOTS, dtype=np.int64, buffer=self._shm.buf)
+        self._records = np.ndarray(capacity, dtype=TICK_DTYPE, buffer=self._shm.buf, offset=_HEADER_SLOTS * 8)
+        if self.owner:
+            self._header[:] = 0
+        self.wakeup = wakeup
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def spec(self) -> dict:
+        """Picklable arguments to attach from another process."""
+        return {"capacity": self.capacity, "name": self.name, "wakeup": self.wakeup}
+
+    # Producer
+
+    def put(self, symbol: int, price: float, qty: float, trade_id: int, trade_time: int, recv_ns: int = 0):
+        head = int(self._header[_HEAD])
+        self._records[head % self.capacity] = (symbol, price, qty, trade_id, trade_time, recv_ns)
+        self._header[_HEAD] = head + 1  # Publish after the record is written
+        if self._header[_ASLEEP] and self.wakeup is not None:
+            self.wakeup.set()
+
+    def stop(self):
+        self._header[_STOP] = 1
+        if self.wakeup is not None:
+            self.wakeup.set()
+
+    # Consumer
+
+    @property
+    def stopped(self) -> bool:
+        return bool(self._header[_STOP])
+
+    def get_batch(self, max_items: int = 256) -> np.ndarray:
+        """Copy out up to `max_items` pending records (oldest first)."""
+        tail = int(self._header[_TAIL])
+        head = int(self._header[_HEAD])
+        if head - tail > self.capacity:
+            self._header[_OVERRUNS] += head - tail - self.capacity
+            tail = head - self.capacity
+        n = min(head - tail, max_items)
+        if n <= 0:
+            return self._records[:0]
+
+        start = tail % self.capacity
+        end = start + n
+        if end <= self.capacity:
+            batch = self._records[start:end].copy()
+        else:
+            batch = np.concatenate((self._records[start:], self._records[:end - self.capacity]))
+
+        # Anything the producer lapped while we copied may be torn
+        lapped = int(self._header[_HEAD]) - self.capacity - tail
+        if lapped > 0:
+            self._header[_OVERRUNS] += min(lapped, n)
+            batch = batch[lapped:]
+        self._header[_TAIL] = tail + n
+        return batch
+
+    def wait(self, timeout: float = 0.1):
+        """Block until the producer publishes (or timeout), without missing a wakeup."""
+        if self.wakeup is None:
+            time.sleep(min(timeout, 0.001))
+            return
+        self._header[_ASLEEP] = 1
+        if self._header[_HEAD] == self._header[_TAIL] and not self.stopped:
+            self.wakeup.wait(timeout)
+        self.wakeup.clear()
+        self._header[_ASLEEP] = 0
+
+    # Both
+
+    def metrics(self) -> dict:
+        head, tail = int(self._header[_HEAD]), int(self._header[_TAIL])
+        return {"published": head, "consumed": tail, "lag": head - tail, "overruns": int(self._header[_OVERRUNS])}
+
+    def close(self):
+        del self._header, self._records
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
@@ -0,0 +1,74 @@
+import asyncio
+from collections import deque
+from typing import Any, Deque, Dict, Set, Tuple
+
+class SymbolQueues:
+    """
+    Bounded per-symbol queues drained by one or more consumer tasks.
+
+    A symbol is handed to at most one consumer at a time so per-symbol order is
+    preserved while different symbols are processed concurrently. When a
+    symbol's queue is full the oldest tick is dropped. In `conflate` mode only
+    the latest tick per symbol is kept, so a slow consumer always sees fresh
+    prices (intermediate trades are skipped, so bar volumes undercount).
+    """
+
+    def __init__(self, maxsize: int = 1000, conflate: bool = False):
+        self.maxsize = 1 if conflate else maxsize
+        self.conflate = conflate
+        self._pending: Dict[str, Deque[Any]] = {}
+        self._scheduled: Set[str] = set()
+        self._ready: asyncio.Queue = asyncio.Queue()
+
+        self.enqueued = 0
+        self.processed = 0
+        self.dropped = 0
+        self.conflated = 0
+        self.max_depth = 0
+
+    def put_nowait(self, symbol: str, item: Any):
+        q = self._pending.get(symbol)
+        if q is None:
+            q = deque(maxlen=self.maxsize)
+            self._pending[symbol] = q
+
+        if len(q) == self.maxsize:
+            # deque(maxlen) evicts the oldest entry on append
+            if self.conflate:
+                self.conflated += 1
+            else:
+                self.dropped += 1
+        q.append(item)
+        self.enqueued += 1
+        self.max_depth = max(self.max_depth, len(q))
+
+        if symbol not in self._scheduled:
+            self._scheduled.add(symbol)
+            self._ready.put_nowait(symbol)
+
+    async def get(self) -> Tuple[str, Any]:
+        """Wait for the next symbol with pending ticks; must be followed by `task_done(symbol)`."""
+        symbol = await self._ready.get()
+        return symbol, self._pending[symbol].popleft()
+
+    def task_done(self, symbol: str):
+        self.processed += 1
+        if self._pending[symbol]:
+            self._ready.put_nowait(symbol)
+        else:
+            self._scheduled.discard(symbol)
+
+    def depth(self) -> int:
+        return sum(len(q) for q in self._pending.values())
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "depth": self.depth(),
+            "depth_by_symbol": {s: len(q) for s, q in self._pending.items()},
+            "max_depth": self.max_depth,
+            "enqueued": self.enqueued,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "conflated": self.conflated,
+            "conflate": self.conflate
+        }
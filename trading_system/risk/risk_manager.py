@@ -1,52 +1,314 @@
+import math
+import numpy as np
+from typing import Dict, Iterable, Optional
 from trading_system.core.config import Config
 from trading_system.core.telemetry import logger
 
 class RiskManager:
-    def __init__(self):
-        self.max_position_size = Config.MAX_POSITION_SIZE_USD
-        self.max_drawdown_pct = Config.MAX_DRAWDOWN_PCT
+    """
+    Portfolio risk on array-backed position and mark vectors.
+
+    Every tick marks one symbol in O(1): running totals of gross and net
+    exposure and unrealized PnL are adjusted by that symbol's delta, and
+    equity/drawdown are checked against the peak. A drawdown breach trips a
+    circuit breaker that stays on (new risk refused, reductions allowed)
+    until `resume` or `reset_equity`. Fills update the same totals. Portfolio VaR (z * sqrt(w' S w) over dollar positions w, with S
+    the CorrelationEngine covariance scaled to `var_horizon` seconds) is
+    refreshed at most every `var_interval` seconds; between refreshes a
+    pre-trade check prices the trade's marginal VaR from the cached S w, so
+    `check_order` does a handful of float ops and no dict or array walks.
+    Position sizes target `vol_target` return volatility over `vol_horizon`
+    seconds, from the same covariance.
+
+    Equity is `capital + realized + unrealized`; `update_pnl(equity)` with the
+    account's real equity (fees, funding) re-bases `capital` so ticks keep
+    marking from the reconciled value.
+    """
+
+    def __init__(self, symbols: Iterable[str] = (), initial_equity: Optional[float] = None, corr_engine=None,
+                 max_position_usd: Optional[float] = None, max_gross_usd: Optional[float] = None,
+                 max_net_usd: Optional[float] = None, max_var_usd: Optional[float] = None,
+                 max_drawdown_pct: Optional[float] = None, var_confidence_z: Optional[float] = None,
+                 var_horizon: Optional[float] = None, var_interval: Optional[float] = None,
+                 vol_target: Optional[float] = None, vol_horizon: Optional[float] = None):
+        self.max_position_size = max_position_usd if max_position_usd is not None else Config.MAX_POSITION_SIZE_USD
+        self.max_gross_usd = max_gross_usd if max_gross_usd is not None else Config.MAX_GROSS_EXPOSURE_USD
+        self.max_net_usd = max_net_usd if max_net_usd is not None else Config.MAX_NET_EXPOSURE_USD
+        self.max_var_usd = max_var_usd if max_var_usd is not None else Config.MAX_VAR_USD
+        self.max_drawdown_pct = max_drawdown_pct if max_drawdown_pct is not None else Config.MAX_DRAWDOWN_PCT
+        self.var_z = var_confidence_z if var_confidence_z is not None else Config.VAR_CONFIDENCE_Z
+        self.var_horizon = var_horizon if var_horizon is not None else Config.VAR_HORIZON_SECONDS
+        self.var_interval = var_interval if var_interval is not None else Config.VAR_INTERVAL_SECONDS
+        self.vol_target = vol_target if vol_target is not None else Config.VOL_TARGET
+        self.vol_horizon = vol_horizon if vol_horizon is not None else Config.VOL_HORIZON_SECONDS
+        self.corr_engine = corr_engine
+
+        self.capital = initial_equity if initial_equity is not None else Config.RISK_INITIAL_EQUITY
+        self.peak_equity = self.capital
+        self.current_equity = self.capital
+        self.current_drawdown = 0.0
+        self.halted = False
+
+        # Per-symbol vectors, grown on demand
+        self.index: Dict[str, int] = {}
+        self.qty = np.zeros(0)
+        self.mark_price = np.zeros(0)
+        self.entry = np.zeros(0)
+        self.realized = np.zeros(0)
+        self._corr_col = np.zeros(0, dtype=np.int64)  # Column in the covariance matrix, -1 if untracked
+
+        # Running totals
+        self.gross = 0.0
+        self.net = 0.0
+        self.unrealized = 0.0
+        self.realized_total = 0.0
+
+        # Cached VaR state
+        self.var = 0.0
+        self._cov = np.zeros((0, 0))
+        self._cov_w = np.zeros(0)  # S @ w at the last refresh
+        self._var_sq = 0.0  # w' S w at the last refresh
+        self._next_var = float("-inf")
+
+        for symbol in symbols:
+            self._slot(symbol)
+
+    def _slot(self, symbol: str) -> int:
+        i = self.index.get(symbol)
+        if i is not None:
+            return i
+        i = len(self.index)
+        self.index[symbol] = i
+        grow = lambda a, v=0.0: np.concatenate((a, np.array([v], dtype=a.dtype)))
+        self.qty = grow(self.qty)
+        self.mark_price = grow(self.mark_price)
+        self.entry = grow(self.entry)
+        self.realized = grow(self.realized)
+        col = self.corr_engine.index.get(symbol, -1) if self.corr_engine is not None else -1
+        self._corr_col = grow(self._corr_col, col)
+        self._cov_w = grow(self._cov_w)
+        self._next_var = float("-inf")
+        return i
+
+    @property
+    def positions(self) -> Dict[str, float]:
+        """symbol -> signed base quantity from confirmed fills (open positions only)."""
+        return {s: float(self.qty[i]) for s, i in self.index.items() if self.qty[i]}
+
+    def position(self, symbol: str) -> float:
+        i = self.index.get(symbol)
+        return float(self.qty[i]) if i is not None else 0.0
+
+    @property
+    def equity(self) -> float:
+        return self.capital + self.realized_total + self.unrealized
+
+    # Per-tick marking
+
+    def mark(self, symbol: str, price: float, timestamp: Optional[float] = None):
+        """Mark one symbol to `price`; O(1) unless the VaR refresh is due."""
+        i = self.index.get(symbol)
+        if i is None:
+            return
+        old = self.mark_price[i]
+        self.mark_price[i] = price
+        q = self.qty[i]
+        if q:
+            delta = price - old
+            self.gross += abs(q) * delta
+            self.net += q * delta
+            self.unrealized += q * delta
+            self._update_drawdown()
+        if timestamp is not None and timestamp >= self._next_var:
+            self.refresh_var()
+            self._next_var = timestamp + self.var_interval
+
+    def _update_drawdown(self):
+        equity = self.equity
+        self.current_equity = equity
+        if equity > self.peak_equity:
+            self.peak_equity = equity
+        self.current_drawdown = (self.peak_equity - equity) / self.peak_equity if self.peak_equity > 0 else 0.0
+
+        if self.current_drawdown > self.max_drawdown_pct and not self.halted:
+            # Latched: marking every tick would otherwise flip it on each wiggle around the limit
+            self.halted = True
+            logger.critical(f"MAX DRAWDOWN BREACHED: {self.current_drawdown*100:.2f}% > {self.max_drawdown_pct*100}%")
+
+    def resume(self):
+        """Lift the circuit breaker by hand; drawdown is measured from the current equity from now on."""
+        if self.halted:
+            logger.info(f"Circuit breaker lifted at {self.current_drawdown*100:.2f}% drawdown, trading resumed")
+        self.reset_equity(self.equity)
+
+    def reset_equity(self, equity: float):
+        """Start tracking from `equity` (new account or backtest), clearing the drawdown peak."""
+        self.capital = equity - self.realized_total - self.unrealized
+        self.peak_equity = equity
+        self.current_equity = equity
         self.current_drawdown = 0.0
-        self.peak_equity = 10000.0 # Starting equity placeholder, should be dynamic
-        self.current_equity = 10000.0
+        self.halted = False
 
     def update_pnl(self, current_equity: float):
-        self.current_equity = current_equity
-        self.peak_equity = max(self.peak_equity, current_equity)
-        drawdown = (self.peak_equity - current_equity) / self.peak_equity
-        self.current_drawdown = drawdown
-        
-        if drawdown > self.max_drawdown_pct:
-            logger.critical(f"MAX DRAWDOWN BREACHED: {drawdown*100:.2f}% > {self.max_drawdown_pct*100}%")
-            return False # Halt trading
-        return True
+        """Reconcile with the account's actual equity (fees, funding, external transfers)."""
+        self.capital = current_equity - self.realized_total - self.unrealized
+        self._update_drawdown()
+        return not self.halted
+
+    def refresh_var(self):
+        """Recompute w' S w and S w from current marks and the latest covariance."""
+        if self.corr_engine is None or not self.corr_engine.ready:
+            self.var = self._var_sq = 0.0
+            self._cov = np.zeros((0, 0))
+            return
+        cols = self._corr_col
+        cov = self.corr_engine.covariance_matrix() * (self.var_horizon / self.corr_engine.bucket_seconds)
+        if len(cols) == len(cov) and (cols == np.arange(len(cols))).all():
+            sub = cov  # Same symbol order as the correlation engine
+        else:
+            tracked = cols >= 0
+            sub = np.zeros((len(cols), len(cols)))
+            sub[np.ix_(tracked, tracked)] = cov[np.ix_(cols[tracked], cols[tracked])]
+        w = self.qty * self.mark_price
+        self._cov = sub
+        self._cov_w = sub @ w
+        self._var_sq = max(float(w @ self._cov_w), 0.0)
+        self.var = self.var_z * math.sqrt(self._var_sq)
+
+    # Pre-trade
 
-    def check_trade(self, signal: dict) -> bool:
+    def check_order(self, symbol: str, side: str, amount: float, price: float) -> Optional[str]:
+        """None if the order fits every limit, else the reason it doesn't."""
+        i = self._slot(symbol)
+        q = self.qty[i]
+        dq = amount if side == 'buy' else -amount
+        new = q + dq
+        if abs(new) <= abs(q) and (new >= 0) == (q >= 0):
+            return None  # Reducing risk is always allowed, circuit breaker or not
+        if self.halted:
+            return f"circuit breaker (DD {self.current_drawdown:.2%})"
+
+        if abs(new) * price > self.max_position_size * (1 + 1e-9):
+            return f"position limit {symbol} ({abs(new) * price:,.0f} > {self.max_position_size:,.0f})"
+        gross = self.gross + (abs(new) - abs(q)) * price
+        if gross > self.max_gross_usd:
+            return f"gross limit ({gross:,.0f} > {self.max_gross_usd:,.0f})"
+        net = self.net + dq * price
+        if abs(net) > self.max_net_usd:
+            return f"net limit ({net:,.0f})"
+        if self.max_var_usd > 0 and self._cov.shape[0] > i:
+            # w' S w after changing w_i by d: V + 2 d (S w)_i + d^2 S_ii
+            d = dq * price
+            var_sq = self._var_sq + 2 * d * self._cov_w[i] + d * d * self._cov[i, i]
+            var = self.var_z * math.sqrt(max(var_sq, 0.0))
+            if var > self.max_var_usd and var > self.var:
+                return f"VaR limit ({var:,.0f} > {self.max_var_usd:,.0f})"
+        return None
+
+    def check_trade(self, signal: dict, amount: Optional[float] = None) -> bool:
         """
         Validates if a trade is safe to execute.
+        Without `amount` only the circuit breaker is checked (sizing comes later).
         """
-        # Circuit breaker check
-        if self.current_drawdown > self.max_drawdown_pct:
-            logger.warning(f"Trade rejected: Circuit Breaker Active (DD: {self.current_drawdown:.2%})")
+        if amount is None:
+            if self.halted:
+                logger.warning(f"Trade rejected: Circuit Breaker Active (DD: {self.current_drawdown:.2%})")
+            return not self.halted
+        reason = self.check_order(signal['symbol'], signal['action'], amount, signal['price'])
+        if reason:
+            logger.warning(f"Trade rejected: {reason}")
             return False
-
-        # Limit check
-        price = signal.get('price', 0)
-        # implied amount calc could be here
-        
-        # Simple Logic: Always approve for now if not in drawdown
-        # In real system: check margin, exposure limits
         return True
 
-    def calculate_position_size(self, symbol: str, price: float, volatility: float = 0.01) -> float:
+    def volatility(self, symbol: str) -> Optional[float]:
+        """Return volatility of `symbol` over `vol_horizon` seconds from the CorrelationEngine, None until it is ready."""
+        corr = self.corr_engine
+        if corr is None or not corr.ready or symbol not in corr.index:
+            return None
+        var = corr.covariance(symbol, symbol)
+        return math.sqrt(var * self.vol_horizon / corr.bucket_seconds) if var > 0 else None
+
+    def calculate_position_size(self, symbol: str, price: float, volatility: Optional[float] = None) -> float:
         """
-        Calculate position size based on volatility targeting or fixed fractional.
-        Standard Kelly or simple risk % rule.
+        Volatility-targeted size: max_position_size scaled by vol_target / volatility, capped at 1.
+        `volatility` is the return volatility over `vol_horizon` seconds (daily by default); when
+        omitted it is taken from the CorrelationEngine, and the full size is used until that is ready.
         """
-        # Simple 10% of Max Size for demo, adjusted by volatility
-        # If volatile, reduce size
-        
-        risk_factor = 0.02 / (volatility if volatility > 0 else 0.01) # Target 2% risk
-        risk_factor = min(risk_factor, 1.0) # Cap at 100% of allocation
-        
+        if volatility is None:
+            volatility = self.volatility(symbol)
+        risk_factor = min(self.vol_target / volatility, 1.0) if volatility else 1.0
+
         size_usd = self.max_position_size * risk_factor
         return size_usd / price
+
+    # Fills
+
+    def record_fill(self, symbol: str, side: str, amount: float, price: float):
+        """Apply a confirmed fill to the tracked position."""
+        i = self._slot(symbol)
+        q, entry, mark = self.qty[i], self.entry[i], self.mark_price[i] or price
+        dq = amount if side == 'buy' else -amount
+        new = q + dq
+
+        # Take the symbol out of the totals, update it, put it back
+        self.gross -= abs(q) * mark
+        self.net -= q * mark
+        self.unrealized -= q * (mark - entry)
+        if q == 0 or (q > 0) == (dq > 0):
+            entry = (entry * q + price * dq) / new
+        else:
+            closing = min(abs(dq), abs(q))
+            pnl = closing * (price - entry) * (1.0 if q > 0 else -1.0)
+            self.realized[i] += pnl
+            self.realized_total += pnl
+            if abs(new) < 1e-12:
+                new, entry = 0.0, 0.0
+            elif (new > 0) != (q > 0):
+                entry = price
+        self.qty[i] = new
+        self.entry[i] = entry
+        self.mark_price[i] = mark
+        self.gross += abs(new) * mark
+        self.net += new * mark
+        self.unrealized += new * (mark - entry)
+
+        self._shift_var(i, dq * mark)
+        self._update_drawdown()
+        logger.debug(f"Fill recorded: {side} {amount} {symbol} @ {price} (pos={new})")
+
+    def set_position(self, symbol: str, qty: float, entry: float):
+        """Take the exchange's position as truth (user-data stream, resync); realized PnL arrives via update_pnl."""
+        i = self._slot(symbol)
+        q, mark = self.qty[i], self.mark_price[i] or entry
+        self.gross -= abs(q) * mark
+        self.net -= q * mark
+        self.unrealized -= q * (mark - self.entry[i])
+        self.qty[i] = qty
+        self.entry[i] = entry if qty else 0.0
+        self.mark_price[i] = mark
+        self.gross += abs(qty) * mark
+        self.net += qty * mark
+        self.unrealized += qty * (mark - self.entry[i])
+        self._shift_var(i, (qty - q) * mark)
+        self._update_drawdown()
+
+    def _shift_var(self, i: int, d: float):
+        # Keep the cached S w in step so the next check sees a position change of d dollars
+        if self._cov.shape[0] > i:
+            self._var_sq = max(self._var_sq + 2 * d * self._cov_w[i] + d * d * self._cov[i, i], 0.0)
+            self._cov_w += d * self._cov[:, i]
+            self.var = self.var_z * math.sqrt(self._var_sq)
+
+    def metrics(self) -> Dict:
+        return {
+            "equity": float(self.equity),
+            "peak_equity": float(self.peak_equity),
+            "drawdown_pct": float(self.current_drawdown * 100),
+            "halted": self.halted,
+            "gross_usd": float(self.gross),
+            "net_usd": float(self.net),
+            "unrealized": float(self.unrealized),
+            "realized": float(self.realized_total),
+            "var_usd": float(self.var),
+            "positions": int(np.count_nonzero(self.qty))
+        }
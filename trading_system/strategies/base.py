@@ -1,10 +1,51 @@
+from typing import Iterable, Optional
+
 class BaseStrategy:
-    def __init__(self, name):
+    """
+    Strategies declare what they consume; StrategyRouter only dispatches matching events.
+
+    symbols        None = every symbol, otherwise only these
+    bar_interval   None = run on trades, otherwise on bar close at this interval (seconds)
+    legs           True = multi-leg: runs `analyze_legs` when any of `symbols` (or any symbol) trades
+    needs          extra per-symbol inputs passed to `analyze` as keyword args ('stats', 'hurst';
+                   'book' is the live L2Book or None while it syncs)
+    every_n_ticks  run on every n-th matching trade per symbol
+    min_interval   minimum seconds of tick time between runs per symbol
+    """
+
+    def __init__(self, name, bar_interval=None, symbols: Optional[Iterable[str]] = None, legs=False,
+                 needs: Iterable[str] = (), every_n_ticks=1, min_interval=0.0):
         self.name = name
         self.position = None
+        self.bar_interval = bar_interval
+        self.symbols = list(symbols) if symbols is not None else None
+        self.legs = legs
+        self.needs = tuple(needs)
+        self.every_n_ticks = every_n_ticks
+        self.min_interval = min_interval
     
     def analyze(self, data):
         pass
+
+    def analyze_bars(self, symbol, bars):
+        """Bar-close entry point; `bars` is a BarBuffer of closed OHLCV bars."""
+        return self.analyze(symbol, bars.close)
+
+    def analyze_legs(self, symbol, history):
+        """
+        Multi-leg entry point, called when `symbol` trades. `history` is the
+        engine's PriceHistoryStore, so any leg can be read without copying.
+        Returns one signal or a list of them.
+        """
+        return {'action': 'hold'}
+
+    def on_pair_position(self, key, position):
+        """
+        Called after the engine has acted on one of this strategy's multi-leg
+        signals (or declined it): `position` is what it now holds for pair
+        `key`, +1 long spread, -1 short spread, 0 flat.
+        """
+        pass
     
     def calculate_position_size(self, signal, balance):
         return balance * 0.01
@@ -1,11 +1,12 @@
-import pandas as pd
 import numpy as np
 from .base import BaseStrategy
+from .registry import register_strategy
 
+@register_strategy("liquidity_sweep")
 class LiquiditySweepStrategy(BaseStrategy):
-    def __init__(self):
-        super().__init__("liquidity_sweep")
-        self.lookback_period = 50
+    def __init__(self, lookback_period=50, bar_interval=60, symbols=None):
+        super().__init__("liquidity_sweep", bar_interval=bar_interval, symbols=symbols)
+        self.lookback_period = lookback_period
     
     def analyze(self, symbol, prices):
         # We need High/Low data for sweeps, usually purely close price isn't enough.
@@ -25,12 +26,13 @@ class LiquiditySweepStrategy(BaseStrategy):
         # Since we only receive 'prices' (likely closes), we can simulate a "sweep"
         # by checking if CURRENT price is reversing violently from a recent extreme.
         
-        recent_window = prices.iloc[-self.lookback_period:]
+        values = prices.to_numpy() if hasattr(prices, 'to_numpy') else np.asarray(prices)
+        recent_window = values[-self.lookback_period:]
         recent_high = recent_window.max()
         recent_low = recent_window.min()
         
-        current_price = prices.iloc[-1]
-        prev_price = prices.iloc[-2]
+        current_price = values[-1]
+        prev_price = values[-2]
         
         # Simple Fakeout logic on Close
         # If we were at high, and now rejecting fast
@@ -53,3 +55,31 @@ class LiquiditySweepStrategy(BaseStrategy):
             signal['reason'] = 'liquidity sweep low'
             
         return signal
+
+    def analyze_bars(self, symbol, bars):
+        # True sweep detection on closed OHLC bars:
+        # the last bar trades through the prior range extreme but closes back inside it.
+        if len(bars) < self.lookback_period + 1:
+            return {'action': 'hold', 'reason': 'not enough data'}
+
+        high = bars.high
+        low = bars.low
+        close = bars.close
+
+        range_high = high[-self.lookback_period - 1:-1].max()
+        range_low = low[-self.lookback_period - 1:-1].min()
+
+        current_price = close[-1]
+        signal = {'symbol': symbol, 'price': current_price, 'action': 'hold', 'reason': 'no sweep'}
+
+        if high[-1] > range_high and current_price < range_high:
+            signal['action'] = 'sell'
+            signal['side'] = 'short'
+            signal['reason'] = f'liquidity sweep high ({range_high:.2f})'
+
+        elif low[-1] < range_low and current_price > range_low:
+            signal['action'] = 'buy'
+            signal['side'] = 'long'
+            signal['reason'] = f'liquidity sweep low ({range_low:.2f})'
+
+        return signal
@@ -1,14 +1,16 @@
-import pandas as pd
 import numpy as np
 from .base import BaseStrategy
+from .registry import register_strategy
 from trading_system.core.telemetry import logger
 
+@register_strategy("mean_reversion")
 class MeanReversionStrategy(BaseStrategy):
-    def __init__(self):
-        super().__init__("mean_reversion_pro")
-        self.zscore_entry = 2.0
-        self.zscore_exit = 0.5
-        self.min_periods = 20
+    def __init__(self, zscore_entry=2.0, zscore_exit=0.5, min_periods=20, hurst_max=0.6, symbols=None):
+        super().__init__("mean_reversion_pro", symbols=symbols, needs=("stats", "hurst"))
+        self.zscore_entry = zscore_entry
+        self.zscore_exit = zscore_exit
+        self.min_periods = min_periods
+        self.hurst_max = hurst_max
 
     def calculate_hurst(self, price_series):
         """Calculate Hurst Exponent to determine mean-reverting nature"""
@@ -20,29 +22,35 @@ class MeanReversionStrategy(BaseStrategy):
         except:
             return 0.5
 
-    def analyze(self, symbol, prices):
+    def analyze(self, symbol, prices, stats=None, hurst=None):
         if len(prices) < self.min_periods:
             return {'action': 'hold', 'reason': 'not enough data'}
 
+        # Accept a pandas Series or a NumPy view of the engine's ring buffer
+        values = prices.to_numpy() if hasattr(prices, 'to_numpy') else np.asarray(prices)
+
         # Calculate Z-Score
-        rolling_mean = prices.rolling(window=self.min_periods).mean()
-        rolling_std = prices.rolling(window=self.min_periods).std()
-        zscore = (prices - rolling_mean) / rolling_std
-        
-        current_z = zscore.iloc[-1]
+        if stats is not None and stats.ready and stats.window == self.min_periods:
+            # Streaming stats already updated for this tick by the engine
+            current_z = stats.zscore
+        else:
+            window = values[-self.min_periods:]
+            std = window.std(ddof=1)
+            current_z = (window[-1] - window.mean()) / std if std > 0 else 0.0
         
         # Calculate Hurst Exponent (0-0.5 is mean reverting, 0.5-1 is trending)
-        hurst = self.calculate_hurst(prices.values[-100:]) # Use last 100 candles for hurst
+        if hurst is None:
+            hurst = self.calculate_hurst(values[-100:]) # Use last 100 candles for hurst
         
         signal = {
             'symbol': symbol,
             'zscore': current_z,
             'hurst': hurst,
-            'price': prices.iloc[-1]
+            'price': float(values[-1])
         }
 
         # Filter: Only trade mean reversion if Hurst < 0.6 (allowing slight noise)
-        if hurst > 0.6:
+        if hurst > self.hurst_max:
             signal['action'] = 'hold'
             signal['reason'] = f'trending regime (H={hurst:.2f})'
             return signal
@@ -1,56 +1,127 @@
-import pandas as pd
+from typing import Dict, List, Optional, Tuple
 from .base import BaseStrategy
+from .registry import register_strategy
 from trading_system.market.correlation import CorrelationEngine
+from trading_system.market.pairs import PairState, select_pairs
 
+@register_strategy("pair_trading")
 class PairTradingStrategy(BaseStrategy):
-    def __init__(self, correlation_engine: CorrelationEngine):
-        super().__init__("pair_trading")
+    """
+    Trades the spread log(a) - beta * log(b) of many pairs at once.
+
+    Pairs are either given explicitly (`pairs=[["BTCUSDT", "ETHUSDT"], ...]`)
+    or re-selected every `reselect_seconds` from the most correlated symbols
+    in the CorrelationEngine. Each pair keeps a PairState (time-aligned legs,
+    rolling OLS hedge ratio, O(1) z-score); a trade only touches the pairs
+    containing its symbol. Entries and exits are emitted as one two-leg
+    signal so the engine can size and submit both legs together.
+
+    Positions are the engine's: after a signal the pair waits for
+    `on_pair_position`, which reports whether the legs were filled,
+    rejected or unwound, before it is evaluated again.
+    """
+
+    def __init__(self, correlation_engine: CorrelationEngine, entry_threshold=2.0, exit_threshold=0.0,
+                 pairs: Optional[List[Tuple[str, str]]] = None, max_pairs=10, min_correlation=0.7,
+                 window=300, sample_seconds=1.0, min_samples=60, reselect_seconds=300.0):
+        fixed = [tuple(p) for p in pairs] if pairs else None
+        # Fixed pairs are declared so the router only calls us for their legs
+        symbols = sorted({s for p in fixed for s in p}) if fixed else None
+        super().__init__("pair_trading", symbols=symbols, legs=True)
         self.corr_engine = correlation_engine
-        self.entry_threshold = 2.0
-        self.exit_threshold = 0.0
-        
+        self.entry_threshold = entry_threshold
+        self.exit_threshold = exit_threshold
+        self.max_pairs = max_pairs
+        self.min_correlation = min_correlation
+        self.window = window
+        self.sample_seconds = sample_seconds
+        self.min_samples = min_samples
+        self.reselect_seconds = reselect_seconds
+        self.auto = fixed is None
+
+        self.pairs: Dict[Tuple[str, str], PairState] = {}
+        self.by_symbol: Dict[str, List[PairState]] = {}
+        self.positions: Dict[Tuple[str, str], int] = {}  # +1 long spread, -1 short spread, as the engine holds it
+        self.pending: Dict[Tuple[str, str], int] = {}  # Pairs with a signal the engine hasn't answered yet
+        self._last_select = float("-inf")
+        self.set_pairs(fixed or [])
+
+    def set_pairs(self, pairs: List[Tuple[str, str]]):
+        """Track `pairs`; dropped pairs with an open position are kept until they exit."""
+        wanted = {tuple(p) for p in pairs}
+        for key in list(self.pairs):
+            if key not in wanted and not self.positions.get(key) and key not in self.pending:
+                del self.pairs[key]
+                self.positions.pop(key, None)
+        for a, b in pairs:
+            if (a, b) not in self.pairs:
+                self.pairs[(a, b)] = PairState(a, b, window=self.window, sample_seconds=self.sample_seconds,
+                                               min_samples=self.min_samples)
+        self.by_symbol = {}
+        for state in self.pairs.values():
+            self.by_symbol.setdefault(state.leg_a, []).append(state)
+            self.by_symbol.setdefault(state.leg_b, []).append(state)
+
     def analyze(self, symbol, prices):
-        # This strategy is unique; it doesn't just look at one symbol.
-        # It needs to look at the PAIR.
-        # But the default interface is analyze(symbol, prices).
-        # We will assume 'symbol' is the primary, and we look up its pair in config or correlation matrix.
-        
-        # For demo, lets hardcode BTCUSDT - ETHUSDT pair
-        if symbol not in ['BTCUSDT', 'ETHUSDT']:
-            return {'action': 'hold', 'reason': 'not in pair'}
-            
-        other_symbol = 'ETHUSDT' if symbol == 'BTCUSDT' else 'BTCUSDT'
-        
-        # We need prices for the other symbol.
-        # In a real system, the StrategyManager would pass full context.
-        # Here we will try to access the engine's history if available... 
-        # but the standard signature limits us.
-        
-        # We will skip implementation logic here relying on shared state for now
-        # and treating this as a placeholder for the Architecture "Wow" factor.
-        
-        # In a real run, we would calculate spread = log(P1) - beta * log(P2)
-        # z = (spread - mean(spread)) / std(spread)
-        
-        return {'action': 'hold', 'reason': 'awaiting pair sync'}
-
-    def analyze_pair(self, symbol_a, prices_a, symbol_b, prices_b):
-        # Real logic
-        if len(prices_a) != len(prices_b):
-            min_len = min(len(prices_a), len(prices_b))
-            prices_a = prices_a[-min_len:]
-            prices_b = prices_b[-min_len:]
-            
-        spread = np.log(prices_a) - np.log(prices_b) # Simple log spread (assuming beta=1 for now)
-        
-        zscore = (spread - spread.mean()) / spread.std()
-        current_z = zscore.iloc[-1]
-        
-        if current_z > self.entry_threshold:
-            # Spread is too high, Sell A, Buy B
-            return {'action': 'short_pair', 's1': symbol_a, 's2': symbol_b, 'z': current_z}
-        elif current_z < -self.entry_threshold:
-            # Spread is too low, Buy A, Sell B
-            return {'action': 'long_pair', 's1': symbol_a, 's2': symbol_b, 'z': current_z}
-            
-        return {'action': 'hold'}
+        # Single-symbol interface is not meaningful for a pair; see analyze_legs
+        return {'action': 'hold', 'reason': 'pair strategy'}
+
+    def analyze_legs(self, symbol, history):
+        series = history[symbol]
+        price, ts = series.last_price, float(series.timestamps[-1])
+        if self.auto and ts - self._last_select >= self.reselect_seconds:
+            self._last_select = ts
+            self.set_pairs(select_pairs(self.corr_engine, self.max_pairs, self.min_correlation))
+
+        signals = []
+        for pair in self.by_symbol.get(symbol, ()):
+            if not pair.update(symbol, price, ts) or not pair.ready:
+                continue
+            signal = self._evaluate(pair)
+            if signal:
+                signals.append(signal)
+        return signals
+
+    def on_pair_position(self, key, position):
+        key = tuple(key)
+        self.pending.pop(key, None)
+        if position:
+            self.positions[key] = position
+        else:
+            self.positions.pop(key, None)
+
+    def _evaluate(self, pair: PairState) -> Optional[dict]:
+        if pair.key in self.pending:
+            return None
+        z = pair.zscore
+        position = self.positions.get(pair.key, 0)
+        if position == 0:
+            if z > self.entry_threshold:
+                # Spread is too high: sell A, buy B
+                return self._signal(pair, 'short_pair', -1, -1, z)
+            if z < -self.entry_threshold:
+                # Spread is too low: buy A, sell B
+                return self._signal(pair, 'long_pair', 1, 1, z)
+        elif position * z >= -self.exit_threshold:
+            # Back inside the band: unwind in the opposite direction
+            return self._signal(pair, 'exit_pair', 0, -position, z)
+        return None
+
+    def _signal(self, pair: PairState, action: str, position: int, direction: int, z: float) -> dict:
+        """`direction` +1 buys leg A; leg B is held at beta times A's notional, opposite for beta > 0."""
+        self.pending[pair.key] = position
+        beta = pair.beta
+        side_a = 'buy' if direction > 0 else 'sell'
+        side_b = side_a if beta < 0 else ('sell' if side_a == 'buy' else 'buy')
+        return {
+            'action': action,
+            'symbol': pair.leg_a,
+            'pair': pair.key,
+            'z': z,
+            'beta': beta,
+            'reason': f"spread z={z:.2f} beta={beta:.3f}",
+            'legs': [
+                {'symbol': pair.leg_a, 'side': side_a, 'price': pair.price_a, 'weight': 1.0},
+                {'symbol': pair.leg_b, 'side': side_b, 'price': pair.price_b, 'weight': abs(beta)}
+            ]
+        }
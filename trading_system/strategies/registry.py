@@ -0,0 +1,56 @@
+import importlib
+import inspect
+import json
+from typing import Dict, List, Type
+from trading_system.core.telemetry import logger
+
+# Strategy type name -> class, filled by @register_strategy in each strategy module
+STRATEGY_REGISTRY: Dict[str, Type] = {}
+
+# Modules whose strategies register themselves on import
+BUILTIN_STRATEGY_MODULES = (
+    "trading_system.strategies.mean_reversion",
+    "trading_system.strategies.liquidity_sweep",
+    "trading_system.strategies.pair_trading",
+)
+
+def register_strategy(name: str):
+    def decorator(cls):
+        STRATEGY_REGISTRY[name] = cls
+        return cls
+    return decorator
+
+
+def create_strategy(kind: str, params: dict = None, **resources):
+    """
+    Instantiate a registered strategy. Shared engine objects in `resources`
+    (e.g. correlation_engine) are passed only to constructors that accept them.
+    """
+    cls = STRATEGY_REGISTRY.get(kind)
+    if cls is None:
+        for module in BUILTIN_STRATEGY_MODULES:
+            importlib.import_module(module)
+        cls = STRATEGY_REGISTRY.get(kind)
+    if cls is None:
+        raise ValueError(f"Unknown strategy '{kind}' (have {sorted(STRATEGY_REGISTRY)})")
+    accepted = inspect.signature(cls.__init__).parameters
+    kwargs = {k: v for k, v in resources.items() if k in accepted}
+    kwargs.update(params or {})
+    return cls(**kwargs)
+
+
+def build_strategies(spec: str, **resources) -> List:
+    """
+    Build strategy instances from a config string: either comma-separated type
+    names ("mean_reversion,liquidity_sweep") or a JSON list of
+    {"type": ..., "params": {...}} objects for several configured instances.
+    """
+    spec = spec.strip()
+    if spec.startswith("["):
+        entries = [(e["type"], e.get("params", {})) for e in json.loads(spec)]
+    else:
+        entries = [(name.strip(), {}) for name in spec.split(",") if name.strip()]
+
+    strategies = [create_strategy(kind, params, **resources) for kind, params in entries]
+    logger.debug(f"Built strategies: {[s.name for s in strategies]}")
+    return strategies
@@ -0,0 +1,73 @@
+from typing import Dict, List, Tuple
+from .base import BaseStrategy
+
+class _Route:
+    """Cadence state for one strategy on one symbol."""
+    __slots__ = ("strategy", "ticks", "last_ts")
+
+    def __init__(self, strategy: BaseStrategy):
+        self.strategy = strategy
+        self.ticks = 0
+        self.last_ts = float("-inf")
+
+    def due(self, ts: float) -> bool:
+        s = self.strategy
+        self.ticks += 1
+        if self.ticks < s.every_n_ticks:
+            return False
+        if ts - self.last_ts < s.min_interval:
+            return False
+        self.ticks = 0
+        self.last_ts = ts
+        return True
+
+
+class StrategyRouter:
+    """
+    Dispatch table from market events to the strategies that declared them.
+
+    Routes are resolved once per symbol (wildcard strategies included) and
+    cached, so a trade only touches the strategies subscribed to its symbol
+    and no strategy has to filter symbols itself.
+    """
+
+    def __init__(self, strategies: List[BaseStrategy]):
+        self.strategies = list(strategies)
+        self._tick: Dict[str, List[_Route]] = {}
+        self._legs: Dict[str, List[_Route]] = {}
+        self._bars: Dict[Tuple[str, float], List[BaseStrategy]] = {}
+        # One shared route per multi-leg strategy, whichever leg trades
+        self._leg_routes = [_Route(s) for s in self.strategies if s.legs]
+
+    @staticmethod
+    def _wants(strategy: BaseStrategy, symbol: str) -> bool:
+        return strategy.symbols is None or symbol in strategy.symbols
+
+    @property
+    def bar_intervals(self) -> List[float]:
+        return sorted({s.bar_interval for s in self.strategies if s.bar_interval is not None and not s.legs})
+
+    def _resolve(self, symbol: str):
+        self._tick[symbol] = [_Route(s) for s in self.strategies
+                              if s.bar_interval is None and not s.legs and self._wants(s, symbol)]
+        self._legs[symbol] = [r for r in self._leg_routes if self._wants(r.strategy, symbol)]
+
+    def on_tick(self, symbol: str, ts: float) -> Tuple[List[BaseStrategy], List[BaseStrategy]]:
+        """(single-symbol strategies, multi-leg strategies) due on this trade."""
+        routes = self._tick.get(symbol)
+        if routes is None:
+            self._resolve(symbol)
+            routes = self._tick[symbol]
+        legs = self._legs[symbol]
+        if not routes and not legs:
+            return [], []
+        return [r.strategy for r in routes if r.due(ts)], [r.strategy for r in legs if r.due(ts)]
+
+    def on_bar(self, symbol: str, interval: float) -> List[BaseStrategy]:
+        key = (symbol, interval)
+        strategies = self._bars.get(key)
+        if strategies is None:
+            strategies = [s for s in self.strategies
+                          if s.bar_interval == interval and not s.legs and self._wants(s, symbol)]
+            self._bars[key] = strategies
+        return strategies